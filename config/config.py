@@ -1,6 +1,8 @@
+import copy
 import os
 
-from typing import Dict, Any, Literal
+from contextlib import contextmanager
+from typing import Dict, Any, Literal, Optional
 from dotenv import load_dotenv
 
 # load environment variables
@@ -27,17 +29,89 @@ def get_domain(env: str = None):
 
 class Config:
 
+    _snapshot: Optional['Config'] = None
+    _frozen: bool = False
+
     def __init__(self):
         # browser configuration (default to chromium for Playwright)
         self.BROWSER: BrowserType = os.getenv('BROWSER', 'chromium')  # type: ignore
         self.HEADLESS: bool = os.getenv('HEADLESS', 'False').lower() == 'true'
+        # named launch profile from config/launch_profiles.py
+        self.LAUNCH_PROFILE: str = os.getenv('LAUNCH_PROFILE', 'default')
         
         # wait time configuration
         self.DEFAULT_TIMEOUT: int = int(os.getenv('DEFAULT_TIMEOUT', '20'))
         self.POLL_FREQUENCY: float = float(os.getenv('POLL_FREQUENCY', '0.5'))
         self.RETRY_TIMES: int = int(os.getenv('RETRY_TIMES', '3'))
         self.RETRY_DELAY: int = int(os.getenv('RETRY_DELAY', '2'))
-        
+
+        # adaptive timeout configuration (opt-in, learned from historical wait times per locator)
+        self.ADAPTIVE_TIMEOUTS: bool = os.getenv('ADAPTIVE_TIMEOUTS', 'False').lower() == 'true'
+        self.TIMING_HISTORY_PATH: str = os.getenv('TIMING_HISTORY_PATH', '.timing_history/locator_timings.json')
+        self.ADAPTIVE_TIMEOUT_PERCENTILE: float = float(os.getenv('ADAPTIVE_TIMEOUT_PERCENTILE', '95'))
+        self.ADAPTIVE_TIMEOUT_MARGIN: float = float(os.getenv('ADAPTIVE_TIMEOUT_MARGIN', '2.0'))
+        self.ADAPTIVE_TIMEOUT_MIN_SAMPLES: int = int(os.getenv('ADAPTIVE_TIMEOUT_MIN_SAMPLES', '5'))
+
+        # locator profiling configuration (wait time, match count, timeouts, absent results and retries per locator)
+        self.LOCATOR_PROFILE: bool = os.getenv('LOCATOR_PROFILE', 'False').lower() == 'true'
+        self.LOCATOR_PROFILE_PATH: str = os.getenv('LOCATOR_PROFILE_PATH', 'reports/locator_profile')
+        self.LOCATOR_PROFILE_SLOW_THRESHOLD: float = float(os.getenv('LOCATOR_PROFILE_SLOW_THRESHOLD', '1.0'))
+
+        # run history configuration (SQLite database of scenario results, disabled when empty)
+        self.RUN_HISTORY_DB: str = os.getenv('RUN_HISTORY_DB', '')
+
+        # harness profiling configuration (Python vs Playwright vs browser time per step)
+        self.HARNESS_PROFILE: bool = os.getenv('HARNESS_PROFILE', 'False').lower() == 'true'
+        self.HARNESS_PROFILE_PATH: str = os.getenv('HARNESS_PROFILE_PATH', 'reports/harness_profile')
+        self.HARNESS_PROFILE_DUMP_DIR: str = os.getenv('HARNESS_PROFILE_DUMP_DIR', '')
+
+        # network accounting configuration (per-scenario requests/bytes against a stored baseline)
+        self.NETWORK_ACCOUNTING: bool = os.getenv('NETWORK_ACCOUNTING', 'False').lower() == 'true'
+        self.NETWORK_BASELINE_PATH: str = os.getenv('NETWORK_BASELINE_PATH', 'network_baseline.json')
+        self.NETWORK_TOLERANCE_REQUESTS: float = float(os.getenv('NETWORK_TOLERANCE_REQUESTS', '0.2'))
+        self.NETWORK_TOLERANCE_BYTES: float = float(os.getenv('NETWORK_TOLERANCE_BYTES', '0.2'))
+
+        # step duration budget configuration: 'warn' reports breaches, 'fail' aborts the scenario
+        self.STEP_BUDGET_MODE: str = os.getenv('STEP_BUDGET_MODE', 'warn').lower()
+
+        # precondition seeding configuration: 'http' seeding API, 'local' (offline) or a backend added with
+        # register_seed_backend(); seeded steps are skipped when none is set
+        self.SEED_API_URL: str = os.getenv('SEED_API_URL', '')
+        self.SEED_API_TOKEN: str = os.getenv('SEED_API_TOKEN', '')
+        self.SEED_BACKEND: str = os.getenv('SEED_BACKEND', 'http' if self.SEED_API_URL else '')
+
+        # browser server configuration (connect to `python -m utils.browser_server` instead of launching)
+        self.BROWSER_SERVER: bool = os.getenv('BROWSER_SERVER', 'False').lower() == 'true'
+        self.BROWSER_SERVER_STATE: str = os.getenv('BROWSER_SERVER_STATE', '.browser_server/state.json')
+
+        # soak configuration: When/Then steps repeated N times, failing on memory growth per iteration
+        self.SOAK_ITERATIONS: int = int(os.getenv('SOAK_ITERATIONS', '0'))
+        self.SOAK_WARMUP_ITERATIONS: int = int(os.getenv('SOAK_WARMUP_ITERATIONS', '2'))
+        self.SOAK_MAX_HEAP_GROWTH: float = float(os.getenv('SOAK_MAX_HEAP_GROWTH', '262144'))  # bytes
+        self.SOAK_MAX_NODE_GROWTH: float = float(os.getenv('SOAK_MAX_NODE_GROWTH', '10'))
+        self.SOAK_MAX_LISTENER_GROWTH: float = float(os.getenv('SOAK_MAX_LISTENER_GROWTH', '2'))
+
+        # streaming report directory (per-worker JSONL shards merged into a static HTML report, disabled when empty)
+        self.STREAM_REPORT_DIR: str = os.getenv('STREAM_REPORT_DIR', '')
+
+        # live per-worker progress view (set by --live-progress, workers send step events to the controller)
+        self.LIVE_PROGRESS: bool = os.getenv('LIVE_PROGRESS', 'False').lower() == 'true'
+
+        # parsed feature file cache (shared by xdist workers and consecutive runs)
+        self.FEATURE_CACHE: bool = os.getenv('FEATURE_CACHE', 'True').lower() == 'true'
+        self.FEATURE_CACHE_DIR: str = os.getenv('FEATURE_CACHE_DIR', '.feature_cache')
+
+        # startup profiling configuration (import, configure and collection time per process)
+        self.STARTUP_PROFILE: bool = os.getenv('STARTUP_PROFILE', 'False').lower() == 'true'
+        self.STARTUP_PROFILE_PATH: str = os.getenv('STARTUP_PROFILE_PATH', 'reports/startup_profile')
+
+        # visual snapshot configuration (baselines stored per device and browser)
+        self.VISUAL_BASELINE_DIR: str = os.getenv('VISUAL_BASELINE_DIR', 'visual_baselines')
+        self.VISUAL_DIFF_PATH: str = os.getenv('VISUAL_DIFF_PATH', 'reports/visual_diffs')
+        self.VISUAL_THRESHOLD: float = float(os.getenv('VISUAL_THRESHOLD', '0.1'))
+        self.VISUAL_MAX_DIFF_RATIO: float = float(os.getenv('VISUAL_MAX_DIFF_RATIO', '0.001'))
+        self.VISUAL_UPDATE_BASELINES: bool = os.getenv('VISUAL_UPDATE_BASELINES', 'False').lower() == 'true'
+
         # environment configuration
         self.ENV: EnvType = os.getenv('ENV', 'staging')  # type: ignore
         
@@ -51,12 +125,54 @@ class Config:
         self.BASE_PATH: str = os.getenv('BASE_PATH', default_path)
         
         # device configuration
-        self.DEVICE_TYPE: str = 'desktop'  # default device type
+        self.DEVICE_TYPE: str = os.getenv('DEVICE_TYPE', 'desktop')  # default device type
         
         # log configuration
         self.LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
         self.SCREENSHOT_PATH: str = os.getenv('SCREENSHOT_PATH', 'screenshots')
     
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(f"Config snapshot is read-only, cannot set {name}")
+        super().__setattr__(name, value)
+
+    @classmethod
+    def snapshot(cls) -> 'Config':
+        """
+        Get the configuration shared by the whole worker, resolved once and read-only afterwards.
+
+        pytest_configure exports CLI options to the environment before the first call, so the
+        precedence is CLI option > environment / .env > default.
+        """
+        if cls._snapshot is None:
+            instance = cls()
+            instance._frozen = True
+            cls._snapshot = instance
+        return cls._snapshot
+
+    @classmethod
+    def reset_snapshot(cls):
+        cls._snapshot = None
+
+    def replace(self, **overrides) -> 'Config':
+        """Read-only copy of this config with some attributes replaced."""
+        instance = copy.copy(self)
+        for name, value in overrides.items():
+            object.__setattr__(instance, name, value)
+        object.__setattr__(instance, '_frozen', True)
+        return instance
+
+    @classmethod
+    @contextmanager
+    def overridden(cls, **overrides):
+        """Swap the worker's snapshot for a copy with ``overrides`` (e.g. a per-test BASE_PATH) while the block runs."""
+        previous = cls.snapshot()
+        cls._snapshot = previous.replace(**overrides)
+        try:
+            yield cls._snapshot
+        finally:
+            cls._snapshot = previous
+
     @property
     def BASE_URL(self) -> str:
         protocol = 'https://'
@@ -83,10 +199,25 @@ class Config:
         return {
             'browser': instance.BROWSER,
             'headless': instance.HEADLESS,
+            'launch_profile': instance.LAUNCH_PROFILE,
             'timeout': instance.DEFAULT_TIMEOUT,
             'poll_frequency': instance.POLL_FREQUENCY,
             'retry_times': instance.RETRY_TIMES,
             'retry_delay': instance.RETRY_DELAY,
+            'adaptive_timeouts': instance.ADAPTIVE_TIMEOUTS,
+            'locator_profile': instance.LOCATOR_PROFILE,
+            'run_history_db': instance.RUN_HISTORY_DB,
+            'harness_profile': instance.HARNESS_PROFILE,
+            'network_accounting': instance.NETWORK_ACCOUNTING,
+            'step_budget_mode': instance.STEP_BUDGET_MODE,
+            'seed_backend': instance.SEED_BACKEND,
+            'visual_baseline_dir': instance.VISUAL_BASELINE_DIR,
+            'startup_profile': instance.STARTUP_PROFILE,
+            'feature_cache': instance.FEATURE_CACHE,
+            'stream_report_dir': instance.STREAM_REPORT_DIR,
+            'live_progress': instance.LIVE_PROGRESS,
+            'soak_iterations': instance.SOAK_ITERATIONS,
+            'browser_server': instance.BROWSER_SERVER,
             'env': instance.ENV,
             'base_url': instance.BASE_URL,
             'domain': get_domain(instance.ENV),
@@ -1,8 +1,65 @@
+import importlib
+from typing import Dict, Type
+
 from .base_device import BaseDevice
-from .iphone_17promax import IPhone17ProMax
-from .iphone17 import IPhone17
-from .ipad_pro import IPadPro
-from .pixel_9pro import Pixel9Pro
+
+# Device classes are imported on first use; third-party packages can add devices through the
+# DEVICE_ENTRY_POINT_GROUP entry point group (name = device type, value = "module:Class")
+DEVICE_ENTRY_POINT_GROUP = "playwright_bdd_e2e.devices"
+
+DEVICE_REGISTRY: Dict[str, str] = {
+    "desktop": "config.devices.base_device:BaseDevice",
+    "iphone17promax": "config.devices.iphone_17promax:IPhone17ProMax",
+    "iphone17": "config.devices.iphone17:IPhone17",
+    "ipadpro": "config.devices.ipad_pro:IPadPro",
+    "pixel9pro": "config.devices.pixel_9pro:Pixel9Pro",
+}
+
+_entry_points_loaded = False
+
+
+def _load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    from importlib.metadata import entry_points
+    for entry_point in entry_points(group=DEVICE_ENTRY_POINT_GROUP):
+        DEVICE_REGISTRY.setdefault(entry_point.name.lower(), entry_point.value)
+
+
+def _import_class(target: str) -> Type[BaseDevice]:
+    module_name, class_name = target.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def register_device(device_type: str, target: str):
+    """Register a device class by import path, e.g. register_device("galaxys25", "my_devices:GalaxyS25")."""
+    DEVICE_REGISTRY[device_type.lower()] = target
+
+
+def available_devices():
+    _load_entry_points()
+    return sorted(DEVICE_REGISTRY)
+
+
+def get_device_class(device_type: str) -> Type[BaseDevice]:
+    target = DEVICE_REGISTRY.get(device_type.lower())
+    if target is None:
+        _load_entry_points()
+        target = DEVICE_REGISTRY.get(device_type.lower())
+    if target is None:
+        raise ValueError(f"Unsupported device type: {device_type}")
+    return _import_class(target)
+
+
+def __getattr__(name):
+    # Keeps `from config.devices import IPhone17` working without importing every device up front
+    for target in DEVICE_REGISTRY.values():
+        if target.endswith(f":{name}"):
+            return _import_class(target)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseDevice",
@@ -10,4 +67,7 @@ __all__ = [
     "IPhone17",
     "IPadPro",
     "Pixel9Pro",
+    "get_device_class",
+    "register_device",
+    "available_devices",
 ]
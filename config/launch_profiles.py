@@ -0,0 +1,42 @@
+# Named browser launch profiles, selected with --launch-profile or LAUNCH_PROFILE.
+# Top-level keys apply to every engine, per-engine keys are passed to BrowserType.launch() as-is.
+# Compare profiles with `python -m utils.launch_benchmark`.
+# The headless shell and the 'chromium' channel used below need Playwright 1.49+.
+LAUNCH_PROFILES = {
+    # Playwright defaults, as before profiles existed
+    "default": {},
+    # Cheapest startup: always headless (chromium-headless-shell for Chromium), no extensions, no GPU,
+    # and no timer throttling of background pages
+    "fast-headless": {
+        "headless": True,
+        "chromium": {
+            "args": [
+                "--disable-extensions",
+                "--disable-gpu",
+                "--disable-background-timer-throttling",
+                "--disable-backgrounding-occluded-windows",
+                "--disable-renderer-backgrounding",
+            ],
+        },
+        "firefox": {
+            "firefox_user_prefs": {
+                "layers.acceleration.disabled": True,
+                "dom.min_background_timeout_value": 0,
+            },
+        },
+    },
+    # Closest to a real user's browser: full Chromium (new headless mode) instead of the headless shell
+    "faithful": {
+        "chromium": {"channel": "chromium"},
+    },
+}
+
+
+def launch_options(profile: str, engine: str, headless: bool) -> dict:
+    """Keyword arguments for ``BrowserType.launch()`` of ``engine`` under the named profile."""
+    if profile not in LAUNCH_PROFILES:
+        raise ValueError(f"Unsupported launch profile: {profile}. Expected one of {', '.join(LAUNCH_PROFILES)}")
+    settings = LAUNCH_PROFILES[profile]
+    options = {"headless": settings.get("headless", headless)}
+    options.update(settings.get(engine, {}))
+    return options
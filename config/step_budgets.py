@@ -0,0 +1,5 @@
+# Step duration budgets in seconds, keyed by the step text as written in the feature file.
+# Scenario-level budgets are declared with tags instead, e.g. @max_duration_8s or @max_duration_1500ms.
+# Empty by default: add a step only after measuring it, e.g.
+#     "I open the Food Ordering company page": 15,
+STEP_BUDGETS = {}
@@ -5,11 +5,66 @@ import subprocess
 from datetime import datetime
 import traceback
 
+# Start of the project imports below, reported by --startup-profile
+CONFTEST_IMPORT_START = time.time()
+
 import pytest
 from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
 
-from config.config import Config
-from config.devices import BaseDevice, IPhone17ProMax, IPhone17, IPadPro, Pixel9Pro
+from config.config import Config, get_domain
+from config.launch_profiles import LAUNCH_PROFILES, launch_options
+from config.step_budgets import STEP_BUDGETS
+from config.devices import get_device_class
+from utils.branches import BRANCH_PARAM, branch_ids, branch_matrix, is_branch_scenario, load_branch_paths
+from utils.engines import ENGINE_PARAM, engine_group, engine_summary, parse_browsers
+from utils.step_budget import StepBudgetExceededError, step_budget_watchdog
+from utils.step_retry import pop_retry_events, set_scenario_tags
+from utils.stress import STRESS_PARAM, stress_summary
+# Opt-in feature modules (profilers, reports, soak, impact analysis, watch mode) are imported
+# by the hooks and fixtures that use them, once their option is enabled
+
+CONFTEST_IMPORT_END = time.time()
+
+
+def active_startup_profiler():
+    if not Config.snapshot().STARTUP_PROFILE:
+        return None
+    from utils.startup_profile import get_startup_profiler
+    return get_startup_profiler(Config.snapshot())
+
+
+def active_harness_profiler():
+    if not Config.snapshot().HARNESS_PROFILE:
+        return None
+    from utils.harness_profiler import get_harness_profiler
+    return get_harness_profiler(Config.snapshot())
+
+
+def active_progress_server():
+    if not Config.snapshot().LIVE_PROGRESS:
+        return None
+    from utils.live_progress import progress_server
+    return progress_server()
+
+
+def active_progress_emitter(config):
+    if not Config.snapshot().LIVE_PROGRESS:
+        return None
+    from utils.live_progress import get_progress_emitter
+    return get_progress_emitter(config)
+
+
+def active_stream_report():
+    if not Config.snapshot().STREAM_REPORT_DIR:
+        return None
+    from utils.stream_report import get_stream_report
+    return get_stream_report(Config.snapshot())
+
+
+def active_watch_session():
+    # Only `python -m utils.watch` imports utils.watch, so a plain run never loads it
+    watch = sys.modules.get('utils.watch')
+    return watch.active_session() if watch else None
 
 
 def pytest_configure(config):
@@ -19,51 +74,280 @@ def pytest_configure(config):
     env = config.getoption("--env")
     if env:
         os.environ['ENV'] = env
+    # Visual baselines and reports are keyed by device and browser
+    os.environ['DEVICE_TYPE'] = config.getoption("--device")
+    engines = parse_browsers(config.getoption("--browser"))
+    os.environ['BROWSER'] = engines[0]
+    if len(engines) > 1 and config.getoption("dist", "no") == "load":
+        # Each engine is split into xdist_groups (see pytest_generate_tests), so a worker stays on one engine
+        config.option.dist = "loadgroup"
+        config.option.loadgroup = True
+    if config.getoption("--update-visual-baselines"):
+        os.environ['VISUAL_UPDATE_BASELINES'] = 'true'
+
+    if config.getoption("--adaptive-timeouts"):
+        os.environ['ADAPTIVE_TIMEOUTS'] = 'true'
+    if config.getoption("--profile-locators"):
+        os.environ['LOCATOR_PROFILE'] = 'true'
+    history_db = config.getoption("--history-db")
+    if history_db:
+        os.environ['RUN_HISTORY_DB'] = history_db
+    if config.getoption("--profile-harness"):
+        os.environ['HARNESS_PROFILE'] = 'true'
+    harness_dump_dir = config.getoption("--profile-harness-dump")
+    if harness_dump_dir:
+        os.environ['HARNESS_PROFILE'] = 'true'
+        os.environ['HARNESS_PROFILE_DUMP_DIR'] = harness_dump_dir
+    if config.getoption("--network-accounting") or config.getoption("--update-network-baseline"):
+        os.environ['NETWORK_ACCOUNTING'] = 'true'
+    step_budget_mode = config.getoption("--step-budget-mode")
+    if step_budget_mode:
+        os.environ['STEP_BUDGET_MODE'] = step_budget_mode
+    if config.getoption("--startup-profile"):
+        os.environ['STARTUP_PROFILE'] = 'true'
+    if config.getoption("--browser-server"):
+        os.environ['BROWSER_SERVER'] = 'true'
+    launch_profile = config.getoption("--launch-profile")
+    if launch_profile:
+        os.environ['LAUNCH_PROFILE'] = launch_profile
+    stream_report_dir = config.getoption("--stream-report")
+    if stream_report_dir:
+        os.environ['STREAM_REPORT_DIR'] = stream_report_dir
+        if not hasattr(config, "workerinput"):
+            from utils.stream_report import clear_shards
+            clear_shards(stream_report_dir)
+    soak_iterations = config.getoption("--soak")
+    if soak_iterations:
+        os.environ['SOAK_ITERATIONS'] = str(soak_iterations)
+    if config.getoption("--no-feature-cache"):
+        os.environ['FEATURE_CACHE'] = 'false'
+    if config.getoption("--live-progress"):
+        os.environ['LIVE_PROGRESS'] = 'true'
+
+    # Resolve the worker's config snapshot now that CLI options are exported (CLI > env > default)
+    Config.reset_snapshot()
+    startup_profiler = active_startup_profiler()
+    if startup_profiler:
+        startup_profiler.mark("conftest_import_start", CONFTEST_IMPORT_START)
+        startup_profiler.mark("conftest_import_end", CONFTEST_IMPORT_END)
+    if Config.snapshot().FEATURE_CACHE:
+        from utils.feature_cache import install_feature_cache
+        # Must be installed before collection imports the step modules that call scenarios()
+        feature_cache = install_feature_cache(Config.snapshot().FEATURE_CACHE_DIR)
+        if os.environ.get("PYTEST_XDIST_WORKER") is None:
+            feature_cache.prune()
+    step_budget_watchdog.configure(Config.snapshot().STEP_BUDGET_MODE, STEP_BUDGETS)
+    # Installs the Playwright call instrumentation when harness profiling is enabled
+    active_harness_profiler()
+    # Set on the controller before xdist starts workers, so all workers share one run id;
+    # a new id per session, so watch-mode reruns are separate runs
+    if Config.snapshot().RUN_HISTORY_DB and not hasattr(config, "workerinput"):
+        from utils.run_history import new_run_id
+        os.environ['RUN_HISTORY_ID'] = new_run_id()
+    if Config.snapshot().LIVE_PROGRESS and not hasattr(config, "workerinput"):
+        from utils.live_progress import start_progress_server
+        # Expected durations for the ETA come from the run history database when there is one
+        start_progress_server(config, config.getoption("--progress-log"), Config.snapshot().RUN_HISTORY_DB or '.run_history/history.db')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # xdist controller: tell each worker where to send its live progress events
+    server = active_progress_server()
+    if server:
+        from utils.live_progress import PORT_KEY
+        node.workerinput[PORT_KEY] = server.port
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    server = active_progress_server()
+    if server:
+        server.record("collected", count=len(ids))
 
 
 def pytest_addoption(parser):
-    config = Config()
+    # Defaults read the same variables as Config, without building one before the CLI is parsed
     parser.addoption("--headless", action="store_true", default=False,
                     help="Run tests in headless mode")
-    parser.addoption("--env", action="store", default=config.ENV,
+    parser.addoption("--env", action="store", default=os.getenv('ENV', 'staging'),
                     help=f"Environment: {', '.join(['dev', 'staging', 'prod'])}")
-    parser.addoption("--browser", action="store", default=config.BROWSER,
-                    help=f"Browser: {', '.join(['chromium', 'firefox', 'webkit'])}")
-    parser.addoption("--device", action="store", default=config.DEVICE_TYPE,
+    parser.addoption("--browser", action="store", default=os.getenv('BROWSER', 'chromium'),
+                    help=f"Browser: {', '.join(['chromium', 'firefox', 'webkit'])}, a comma-separated list or 'all'")
+    parser.addoption("--device", action="store", default=os.getenv('DEVICE_TYPE', 'desktop'),
                     help="Device type: desktop, iphone17promax, iphone17, ipadpro, pixel9pro")
+    parser.addoption("--adaptive-timeouts", action="store_true", default=False,
+                    help="Derive element wait timeouts from historical per-locator latency")
+    parser.addoption("--profile-locators", action="store_true", default=False,
+                    help="Profile locator wait time, match count, timeouts, absent results and retries")
+    parser.addoption("--changed-since", action="store", default=None, metavar="GIT_REV",
+                    help="Only run scenarios affected by files changed since the given git revision")
+    parser.addoption("--history-db", action="store", default=None, metavar="PATH",
+                    help="Record scenario results into a local SQLite run history database")
+    parser.addoption("--profile-harness", action="store_true", default=False,
+                    help="Split each step's time into harness Python, Playwright round trips and browser waiting")
+    parser.addoption("--profile-harness-dump", action="store", default=None, metavar="DIR",
+                    help="With harness profiling, also write cProfile (.prof) dumps of the slowest steps to DIR")
+    parser.addoption("--network-accounting", action="store_true", default=False,
+                    help="Tally requests, bytes and third-party domains per scenario and compare with the baseline")
+    parser.addoption("--update-network-baseline", action="store_true", default=False,
+                    help="Write this run's per-scenario network totals into the network baseline file")
+    parser.addoption("--step-budget-mode", action="store", default=None, choices=["warn", "fail"],
+                    help="How to handle @max_duration_<n>s tags and STEP_BUDGETS breaches (default: warn)")
+    parser.addoption("--update-visual-baselines", action="store_true", default=False,
+                    help="Overwrite visual snapshot baselines for the selected device and browser")
+    parser.addoption("--launch-profile", action="store", default=None, choices=list(LAUNCH_PROFILES),
+                    help="Browser launch profile from config/launch_profiles.py (default: LAUNCH_PROFILE or 'default')")
+    parser.addoption("--browser-server", action="store_true", default=False,
+                    help="Connect to browser servers started with `python -m utils.browser_server start`, "
+                         "falling back to a local launch when none is healthy")
+    parser.addoption("--no-feature-cache", action="store_true", default=False,
+                    help="Parse feature files on every run instead of using the on-disk parsed feature cache")
+    parser.addoption("--startup-profile", action="store_true", default=False,
+                    help="Report interpreter startup, conftest import, configure and collection time")
+    parser.addoption("--branches", action="store", default=None, metavar="PATH[,PATH...]",
+                    help="Run the order page scenarios once per branch path (BASE_PATH) and report a per-branch matrix")
+    parser.addoption("--branches-file", action="store", default=None, metavar="FILE",
+                    help="File with one branch path per line, combined with --branches")
+    parser.addoption("--live-progress", action="store_true", default=False,
+                    help="Show a live per-worker view of the current scenario and step instead of the step output")
+    parser.addoption("--progress-log", action="store", default="reports/progress.jsonl", metavar="PATH",
+                    help="Where --live-progress writes its event stream (replay with `python -m utils.live_progress replay`)")
+    parser.addoption("--soak", action="store", type=int, default=0, metavar="N",
+                    help="After each passing scenario, repeat its When/Then steps N times in the same page and "
+                         "fail on JS heap, DOM node or event listener growth (Chromium only)")
+    parser.addoption("--stream-report", action="store", default=None, metavar="DIR",
+                    help="Append each result to per-worker shards in DIR as it arrives and merge them into DIR/index.html")
+    parser.addoption("--stress", action="store", type=int, default=0, metavar="N",
+                    help="Run each selected scenario N times (spread over xdist workers with -n) "
+                         "and report pass rate, duration spread and failing steps")
 
 
-def get_device_class(device_type: str) -> BaseDevice:
-    devices = {
-        "desktop": BaseDevice,
-        "iphone17promax": IPhone17ProMax,
-        "iphone17": IPhone17,
-        "ipadpro": IPadPro,
-        "pixel9pro": Pixel9Pro
-    }
-    device_class = devices.get(device_type.lower())
-    if not device_class:
-        raise ValueError(f"Unsupported device type: {device_type}")
-    return device_class()
+def pytest_generate_tests(metafunc):
+    iterations = metafunc.config.getoption("--stress")
+    # Only BDD scenarios are repeated, and only they or tests asking for a browser run per engine
+    is_scenario = getattr(metafunc.function, "__scenario__", None) is not None
+    if iterations > 0 and STRESS_PARAM in metafunc.fixturenames and is_scenario:
+        metafunc.parametrize(STRESS_PARAM, range(iterations), ids=lambda i: f"stress-{i}")
+    engines = parse_browsers(metafunc.config.getoption("--browser"))
+    uses_browser = is_scenario or 'browser' in metafunc.fixturenames
+    if len(engines) > 1 and ENGINE_PARAM in metafunc.fixturenames and uses_browser:
+        # Collection order is the same on every worker, so the round-robin index gives the same groups
+        index = getattr(metafunc.config, 'engine_group_index', 0)
+        metafunc.config.engine_group_index = index + 1
+        workers = len(metafunc.config.getoption("tx", None) or [])
+        metafunc.parametrize(ENGINE_PARAM, [
+            pytest.param(engine, id=engine, marks=pytest.mark.xdist_group(engine_group(engine, index, workers, len(engines))))
+            for engine in engines
+        ])
+    branch_paths = load_branch_paths(metafunc.config.getoption("--branches"), metafunc.config.getoption("--branches-file"))
+    if branch_paths and BRANCH_PARAM in metafunc.fixturenames and is_branch_scenario(metafunc.function):
+        metafunc.parametrize(BRANCH_PARAM, branch_paths, ids=branch_ids(branch_paths))
+
+
+@pytest.fixture(autouse=True)
+def stress_iteration(request):
+    # Overridden by direct parametrization in pytest_generate_tests when --stress is set
+    return getattr(request, "param", None)
+
+
+@pytest.fixture(autouse=True)
+def browser_engine(request):
+    # Overridden by direct parametrization in pytest_generate_tests when --browser lists several engines
+    return getattr(request, "param", None) or parse_browsers(request.config.getoption("--browser"))[0]
+
+
+@pytest.fixture(autouse=True)
+def branch_path(request):
+    # Overridden by direct parametrization in pytest_generate_tests when --branches is set;
+    # page objects and url.BASE_URL read the overridden BASE_PATH from the config snapshot
+    path = getattr(request, "param", None)
+    if path is None:
+        yield None
+        return
+    with Config.overridden(BASE_PATH=path):
+        yield path
+
+
+SKIP_UNSEEDED = "No seed backend configured: set SEED_BACKEND=local, or SEED_API_URL for the http backend"
+
+
+def pytest_collection_modifyitems(session, config, items):
+    if not Config.snapshot().SEED_BACKEND:
+        # Skipped before setup, so no browser is launched for them
+        for item in items:
+            if item.get_closest_marker("seeding"):
+                item.add_marker(pytest.mark.skip(reason=SKIP_UNSEEDED))
+    changed_since = config.getoption("--changed-since")
+    if not changed_since:
+        return
+    from utils.impact import select_items
+    selected, deselected, reason = select_items(items, str(config.rootpath), changed_since)
+    print(f"\n\033[36mImpact analysis:\033[0m {reason}; selected {len(selected)}, deselected {len(deselected)}")
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_sessionstart(session):
+    # Checked here rather than in pytest_configure, where an error would skip pytest-bdd's own configure
+    if Config.snapshot().SOAK_ITERATIONS:
+        from utils.soak import check_soak_iterations
+        try:
+            check_soak_iterations(Config.snapshot().SOAK_ITERATIONS, Config.snapshot().SOAK_WARMUP_ITERATIONS)
+        except ValueError as exc:
+            pytest.exit(str(exc), returncode=pytest.ExitCode.USAGE_ERROR)
+    startup_profiler = active_startup_profiler()
+    if startup_profiler:
+        startup_profiler.mark("session_start")
+
+
+def pytest_collectstart(collector):
+    startup_profiler = active_startup_profiler()
+    if startup_profiler and isinstance(collector, pytest.Module):
+        startup_profiler.start_collector(collector.nodeid)
+
+
+def pytest_collectreport(report):
+    startup_profiler = active_startup_profiler()
+    if startup_profiler:
+        startup_profiler.end_collector(report.nodeid)
+
+
+def pytest_collection_finish(session):
+    startup_profiler = active_startup_profiler()
+    if startup_profiler:
+        startup_profiler.mark("collection_finish")
+    server = active_progress_server()
+    if server:
+        server.record("collected", count=len(session.items))
+
+
+def pytest_runtest_logstart(nodeid, location):
+    startup_profiler = active_startup_profiler()
+    if startup_profiler:
+        startup_profiler.mark("first_test")
 
 
 @pytest.fixture(scope="session")
 def device(request):
+    # Device classes are loaded from the registry on demand (see config/devices/__init__.py)
     device_type = request.config.getoption("--device")
-    return get_device_class(device_type)
+    return get_device_class(device_type)()
 
 
 @pytest.fixture(scope="session")
 def playwright():
+    watch_session = active_watch_session()
+    if watch_session:
+        # Watch mode keeps the Playwright driver alive between reruns
+        yield watch_session.playwright
+        return
     with sync_playwright() as p:
         yield p
 
 
-@pytest.fixture(scope="function")
-def browser(request, device, playwright):
-    browser_type = request.config.getoption("--browser")
-    headless = request.config.getoption("--headless")
-    
+def launch_browser(playwright, browser_type: str, headless: bool) -> Browser:
     # Map browser names to Playwright browser types
     browser_map = {
         'chrome': 'chromium',
@@ -74,16 +358,60 @@ def browser(request, device, playwright):
     }
     
     playwright_browser_type = browser_map.get(browser_type.lower(), browser_type.lower())
+
+    config = Config.snapshot()
+    if config.BROWSER_SERVER and playwright_browser_type in ('chromium', 'firefox', 'webkit'):
+        from utils.browser_server import connect_browser_server
+        browser_instance = connect_browser_server(
+            playwright, playwright_browser_type, headless, config.BROWSER_SERVER_STATE, config.LAUNCH_PROFILE
+        )
+        if browser_instance:
+            return browser_instance
+        print(f"\033[33mNo healthy {playwright_browser_type} browser server, launching locally\033[0m")
     
     # Launch browser
+    options = launch_options(config.LAUNCH_PROFILE, playwright_browser_type, headless)
     if playwright_browser_type == 'chromium':
-        browser_instance = playwright.chromium.launch(headless=headless)
+        browser_instance = playwright.chromium.launch(**options)
     elif playwright_browser_type == 'firefox':
-        browser_instance = playwright.firefox.launch(headless=headless)
+        browser_instance = playwright.firefox.launch(**options)
     elif playwright_browser_type == 'webkit':
-        browser_instance = playwright.webkit.launch(headless=headless)
+        browser_instance = playwright.webkit.launch(**options)
     else:
         raise ValueError(f"Unsupported browser type: {browser_type}")
+    return browser_instance
+
+
+@pytest.fixture(scope="session")
+def shared_browsers(playwright):
+    # One browser per engine and worker, launched on first use; each test still gets its own context
+    browsers = {}
+    yield browsers
+    for browser_instance in browsers.values():
+        browser_instance.close()
+
+
+@pytest.fixture(scope="function")
+def browser(request, device, playwright, browser_engine):
+    browser_type = browser_engine
+    headless = request.config.getoption("--headless")
+    watch_session = active_watch_session()
+    if watch_session:
+        yield watch_session.get_browser(
+            browser_type, headless, lambda: launch_browser(playwright, browser_type, headless)
+        )
+        return
+
+    # Stress and branch fan-out open many short contexts, so they share one browser per engine and worker
+    fanned_out = hasattr(request.node, 'callspec') and BRANCH_PARAM in request.node.callspec.params
+    if request.config.getoption("--stress") or fanned_out:
+        shared_browsers = request.getfixturevalue("shared_browsers")
+        if browser_type not in shared_browsers:
+            shared_browsers[browser_type] = launch_browser(playwright, browser_type, headless)
+        yield shared_browsers[browser_type]
+        return
+
+    browser_instance = launch_browser(playwright, browser_type, headless)
     
     yield browser_instance
     
@@ -103,22 +431,46 @@ def page(browser, device, request):
     page_instance = context.new_page()
     
     # Set default timeout from config
-    config = Config()
+    config = Config.snapshot()
     page_instance.set_default_timeout(config.DEFAULT_TIMEOUT * 1000)
+
+    if config.NETWORK_ACCOUNTING:
+        from utils.network_accounting import NetworkAccountant
+        request.node.network_accountant = NetworkAccountant(page_instance, get_domain(config.ENV)).start()
     
     yield page_instance
     
     context.close()
 
 
-@pytest.fixture(scope="session")
-def test_config():
-    return Config()
+@pytest.fixture(scope="function")
+def precondition_seeder(page, playwright):
+    # Seeds state through the configured backend and injects it into the page's context
+    if not Config.snapshot().SEED_BACKEND:
+        # A seeded Given step must not pass without creating its state
+        pytest.skip(SKIP_UNSEEDED)
+    from utils.precondition_seeding import PreconditionSeeder, create_seed_backend
+    backend = create_seed_backend(Config.snapshot(), playwright)
+    yield PreconditionSeeder(page.context, backend)
+    backend.close()
 
 
-@pytest.fixture(scope="session")
-def base_url(test_config):
-    return test_config.BASE_URL
+@pytest.fixture(scope="function")
+def test_config(branch_path):
+    # Per test, so it is the snapshot with the --branches BASE_PATH override applied
+    return Config.snapshot()
+
+
+@pytest.fixture(scope="function")
+def base_url(branch_path):
+    return Config.snapshot().BASE_URL
+
+
+def artifact_name(item) -> str:
+    # Test file, scenario and parameter ids (engine, stress iteration, branch) plus the rerun attempt,
+    # so parametrized runs and reruns do not overwrite each other's screenshots
+    name = f"{item.nodeid.rsplit('/', 1)[-1]}_attempt{getattr(item, 'execution_count', 1)}"
+    return ''.join(c if c.isalnum() else '_' for c in name)
 
 
 def get_test_info(item):
@@ -141,7 +493,7 @@ def get_test_info(item):
         "feature_file": feature_file or "unknown",
         "scenario_name": scenario_name or item.name,
         "env": item.config.getoption("--env"),
-        "browser": item.config.getoption("--browser"),
+        "browser": item.funcargs.get(ENGINE_PARAM) or item.config.getoption("--browser"),
         "device": item.config.getoption("--device")
     }
 
@@ -150,6 +502,10 @@ def get_test_info(item):
 def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
+
+    engine = item.callspec.params.get(ENGINE_PARAM) if hasattr(item, 'callspec') else None
+    if engine and (ENGINE_PARAM, engine) not in report.user_properties:
+        report.user_properties.append((ENGINE_PARAM, engine))
     
     if report.when == 'call':
         start_time = getattr(report, 'start_time', datetime.now())
@@ -159,14 +515,12 @@ def pytest_runtest_makereport(item, call):
         screenshot_path = None
         
         if report.failed and hasattr(item, 'funcargs') and 'page' in item.funcargs:
-            scenario_name = test_info['scenario_name']
-            clean_name = ''.join(c if c.isalnum() else '_' for c in scenario_name)
-            config = Config()
+            config = Config.snapshot()
             
             # Create screenshot directory if it doesn't exist
             os.makedirs(config.SCREENSHOT_PATH, exist_ok=True)
             
-            screenshot_path = f"{config.SCREENSHOT_PATH}/{clean_name}.png"
+            screenshot_path = f"{config.SCREENSHOT_PATH}/{artifact_name(item)}.png"
             page = item.funcargs['page']
             page.screenshot(path=screenshot_path)
 
@@ -177,8 +531,175 @@ def pytest_runtest_makereport(item, call):
             if main_feature:
                 tags.append(main_feature)
 
+        record_run_history(item, report, test_info, tags)
+
+        failed_step = getattr(item, 'failed_step', None)
+        if report.failed and failed_step:
+            report.user_properties.append(("failed_step", failed_step))
+        if hasattr(item, 'callspec') and STRESS_PARAM in item.callspec.params:
+            report.user_properties.append((STRESS_PARAM, item.callspec.params[STRESS_PARAM]))
+        if hasattr(item, 'callspec') and BRANCH_PARAM in item.callspec.params:
+            report.user_properties.append((BRANCH_PARAM, item.callspec.params[BRANCH_PARAM]))
+            report.user_properties.append(("scenario", test_info['scenario_name']))
+
+        network_tally = getattr(item, 'network_tally', None)
+        if network_tally:
+            from utils.network_accounting import get_network_baseline
+            regressions = get_network_baseline(Config.snapshot()).compare(item.nodeid, network_tally)
+            report.user_properties.append(("network", network_tally.to_dict()))
+            report.user_properties.append(("network_regressions", regressions))
+            report.sections.append(("Network", network_tally.format(regressions)))
+
+        soak_result = getattr(item, 'soak_result', None)
+        if soak_result:
+            report.user_properties.append(("soak_slopes", soak_result.slopes))
+            report.sections.append(("Soak", soak_result.format()))
+
+        budget_breaches = getattr(item, 'budget_breaches', [])
+        if budget_breaches:
+            report.user_properties.append(("budget_breaches", [breach.describe() for breach in budget_breaches]))
+            report.sections.append(("Duration budgets", "\n".join(breach.describe() for breach in budget_breaches)))
+
+        retry_events = pop_retry_events()
+        if retry_events:
+            report.user_properties.append(("step_retries", retry_events))
+            report.sections.append(("Step retries", "\n".join(
+                f"{event['step']}: attempt {event['attempt']} failed ({event['cause']}): {event['error']}"
+                for event in retry_events
+            )))
+
+        stream_report = active_stream_report()
+        if stream_report:
+            stream_report.append(stream_report_entry(item, report, test_info, tags, [screenshot_path]))
+    elif report.when == 'setup' and not report.passed:
+        if report.failed:
+            record_run_history(item, report, get_test_info(item), [])
+        stream_report = active_stream_report()
+        if stream_report:
+            stream_report.append(stream_report_entry(item, report, get_test_info(item), [], []))
+
+
+def record_run_history(item, report, test_info, tags):
+    if not Config.snapshot().RUN_HISTORY_DB:
+        return
+    from utils.run_history import get_run_history
+    run_history = get_run_history(Config.snapshot())
+    if run_history:
+        run_history.record(
+            item.nodeid, 'error' if report.when == 'setup' else report.outcome, report.duration,
+            attempt=getattr(item, 'execution_count', 1),
+            feature=test_info['feature_file'],
+            scenario=test_info['scenario_name'],
+            browser=test_info['browser'],
+            device=test_info['device'],
+            env=test_info['env'],
+            tags=tags,
+        )
+
+
+def stream_report_entry(item, report, test_info, tags, artifacts):
+    return {
+        "nodeid": item.nodeid,
+        "feature": test_info['feature_file'],
+        "scenario": test_info['scenario_name'],
+        "outcome": 'error' if report.when == 'setup' and report.failed else report.outcome,
+        "duration": report.duration,
+        "env": test_info['env'],
+        "browser": test_info['browser'],
+        "device": test_info['device'],
+        "tags": list(dict.fromkeys(tags + sorted(
+            marker.name for marker in item.iter_markers() if marker.name not in ('parametrize', 'usefixtures', 'xdist_group')
+        ))),
+        "steps": getattr(item, 'step_timings', []),
+        "artifacts": artifacts + getattr(item, 'artifacts', []),
+        "error": report.longreprtext if report.failed else '',
+        "attempt": getattr(item, 'execution_count', 1),
+        "worker": os.environ.get("PYTEST_XDIST_WORKER", "main"),
+    }
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_logreport(report):
+    # Runs on the controller for reports forwarded by xdist workers, and in-process without xdist
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        return
+    server = active_progress_server()
+    if server:
+        # The live view is paused around the terminal reporter's output (see TerminalGuard)
+        if report.when == 'call' or (report.when == 'setup' and not report.passed):
+            server.record("result", w=getattr(report, "worker_id", "main"), n=report.nodeid, o=report.outcome)
+    properties = dict(report.user_properties)
+    if report.when == 'call' and STRESS_PARAM in properties:
+        stress_summary.add(report.nodeid, report.passed, report.duration, properties.get("failed_step", ""))
+    if report.when == 'call' and "network" in properties:
+        from utils.network_accounting import network_summary
+        network_summary.add(report.nodeid, properties["network"], properties.get("network_regressions", []))
+    if report.when == 'call' and BRANCH_PARAM in properties:
+        branch_matrix.add(properties[BRANCH_PARAM], properties["scenario"], report.passed, report.duration)
+    # Setup failures (e.g. the engine failed to launch) have no call report
+    if ENGINE_PARAM in properties and (report.when == 'call' or (report.when == 'setup' and not report.passed)):
+        engine_summary.add(properties[ENGINE_PARAM], report.nodeid, report.outcome, report.duration)
+
+
+def pytest_bdd_before_scenario(request, feature, scenario):
+    # Reset per attempt, since rerunfailures reuses the item
+    request.node.step_timings = []
+    request.node.artifacts = []
+    request.node.passed_steps = 0
+    set_scenario_tags(scenario.tags)
+    step_budget_watchdog.start_scenario(scenario.tags)
+    if Config.snapshot().LOCATOR_PROFILE:
+        from utils.locator_profiler import get_locator_profiler
+        get_locator_profiler(Config.snapshot()).start_scenario()
+    emitter = active_progress_emitter(request.config)
+    if emitter:
+        emitter.emit("scenario", n=request.node.nodeid)
+
+
+def pytest_bdd_after_scenario(request, feature, scenario):
+    # Runs before the call report is built, while the page is still open
+    network_accountant = getattr(request.node, 'network_accountant', None)
+    if network_accountant:
+        request.node.network_tally = network_accountant.finish()
+
+    config = Config.snapshot()
+    # Only a scenario whose steps all passed is soaked, so a soak error never hides the original failure
+    # (step lookup errors and budget failures raised after a step do not go through pytest_bdd_step_error)
+    passed = getattr(request.node, 'passed_steps', 0) == len(scenario.steps)
+    if config.SOAK_ITERATIONS and 'page' in request.fixturenames and passed:
+        # The scenario duration budget covers one pass; soak iterations keep only the per-step budgets
+        step_budget_watchdog.start_scenario(())
+        from utils.soak import run_soak
+        soak_result = run_soak(
+            request, scenario, request.getfixturevalue('page'), config.SOAK_ITERATIONS, config.SOAK_WARMUP_ITERATIONS,
+            {
+                'JSHeapUsedSize': config.SOAK_MAX_HEAP_GROWTH,
+                'Nodes': config.SOAK_MAX_NODE_GROWTH,
+                'JSEventListeners': config.SOAK_MAX_LISTENER_GROWTH,
+            },
+        )
+        if soak_result is None:
+            print(f"\n\033[33mSoak skipped for '{scenario.name}': memory metrics need Chromium (CDP)\033[0m")
+            return
+        request.node.soak_result = soak_result
+        if soak_result.breaches:
+            raise AssertionError(f"Memory growth over {soak_result.iterations} soak iterations: " + "; ".join(soak_result.breaches))
+
 
 def pytest_bdd_before_step(request, feature, scenario, step, step_func):
+    # Started first so hook printing below is attributed to harness time
+    harness_profiler = active_harness_profiler()
+    if harness_profiler:
+        harness_profiler.start_step(f"{step.type.upper()} {step.name}")
+    step_budget_watchdog.start_step(step.name, capture=lambda: take_budget_screenshot(request, step))
+    request.node.step_started = time.perf_counter()
+
+    # The live progress view replaces the per-step output, which interleaves across workers
+    emitter = active_progress_emitter(request.config)
+    if emitter:
+        emitter.emit("step", s=f"{step.type.upper()} {step.name}")
+        return
+
     if not hasattr(request.node, 'feature_printed'):
         feature_file = os.path.basename(feature.filename)
         print(f"\n\033[36m{'─' * 70}\033[0m")
@@ -205,8 +726,89 @@ def pytest_bdd_before_step(request, feature, scenario, step, step_func):
     print(f"{color}{step.type.upper()}\033[0m \033[97m{step.name}\033[0m")
 
 
+def pytest_bdd_before_step_call(request, feature, scenario, step, step_func, step_func_args):
+    # In fail mode, Playwright calls outside BaseAction also stop at the remaining budget
+    page = step_func_args.get('page')
+    if page is not None and step_budget_watchdog.mode == 'fail' and step_budget_watchdog.active:
+        page.set_default_timeout(step_budget_watchdog.remaining() * 1000)
+        request.node.budget_page = page
+
+
+def record_step_timing(request, step, status: str, ended=None):
+    # Step timings for the streaming report
+    started = getattr(request.node, 'step_started', None)
+    if started is None or not Config.snapshot().STREAM_REPORT_DIR:
+        return
+    timings = getattr(request.node, 'step_timings', [])
+    duration = (ended or time.perf_counter()) - started
+    timings.append({"name": f"{step.type.upper()} {step.name}", "status": status, "duration": duration})
+    request.node.step_timings = timings
+
+
+def take_budget_screenshot(request, step, page=None):
+    # Called at the breach by BaseAction waits (see StepBudgetWatchdog.split), otherwise at step end
+    page = page or getattr(request.node, 'budget_page', None)
+    page = page or (request.getfixturevalue('page') if 'page' in request.fixturenames else None)
+    if page is None:
+        return
+    config = Config.snapshot()
+    os.makedirs(config.SCREENSHOT_PATH, exist_ok=True)
+    step_name = ''.join(c if c.isalnum() else '_' for c in step.name)
+    budget_screenshot = f"{config.SCREENSHOT_PATH}/budget_{artifact_name(request.node)}_{step_name}.png"
+    page.screenshot(path=budget_screenshot)
+    request.node.artifacts = getattr(request.node, 'artifacts', []) + [budget_screenshot]
+
+
+def finish_step_budget(request, step):
+    captured = step_budget_watchdog.captured
+    breaches = step_budget_watchdog.end_step()
+    page = getattr(request.node, 'budget_page', None)
+    if page is not None:
+        page.set_default_timeout(Config.snapshot().DEFAULT_TIMEOUT * 1000)
+        request.node.budget_page = None
+    if not breaches:
+        return []
+    request.node.budget_breaches = getattr(request.node, 'budget_breaches', []) + breaches
+    if not captured:
+        take_budget_screenshot(request, step, page)
+    for breach in breaches:
+        print(f"\033[31m⏱ {breach.describe()}\033[0m")
+    return breaches
+
+
+def pytest_bdd_after_step(request, feature, scenario, step, step_func, step_func_args):
+    harness_profiler = active_harness_profiler()
+    if harness_profiler:
+        harness_profiler.end_step()
+    ended = time.perf_counter()
+
+    breaches = finish_step_budget(request, step)
+    failed = bool(breaches) and step_budget_watchdog.mode == 'fail'
+    record_step_timing(request, step, "failed" if failed else "passed", ended)
+    if failed:
+        # pytest_bdd_step_error does not run for errors raised here, so record the failing step too
+        request.node.failed_step = f"{step.type.upper()} {step.name}"
+        emitter = active_progress_emitter(request.config)
+        if emitter:
+            emitter.emit("step_error", s=request.node.failed_step)
+        raise StepBudgetExceededError("; ".join(breach.describe() for breach in breaches))
+    request.node.passed_steps = getattr(request.node, 'passed_steps', 0) + 1
+
+
 def pytest_bdd_step_error(request, feature, scenario, step, step_func, exception):
     """When a step fails, display detailed error information"""
+    harness_profiler = active_harness_profiler()
+    if harness_profiler:
+        harness_profiler.end_step()
+    record_step_timing(request, step, "failed")
+    finish_step_budget(request, step)
+    request.node.failed_step = f"{step.type.upper()} {step.name}"
+
+    emitter = active_progress_emitter(request.config)
+    if emitter:
+        emitter.emit("step_error", s=request.node.failed_step)
+        return
+
     print(f"\n\033[31m{'!' * 70}\033[0m")
     print(f"\033[31m❌ Step execution failed\033[0m")
     print(f"\033[31mStep:\033[0m \033[97m{step.type.upper()} {step.name}\033[0m")
@@ -216,11 +818,81 @@ def pytest_bdd_step_error(request, feature, scenario, step, step_func, exception
     traceback.print_exc()
 
 
+def print_report_section(title: str, body: str):
+    print(f"\n\033[36m{'─' * 70}\033[0m")
+    print(f"\033[36m{title}\033[0m")
+    print(body)
+
+
 def pytest_sessionfinish(session, exitstatus):
-    if os.environ.get("CI") or os.environ.get("GITHUB_ACTIONS"):
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+    config = Config.snapshot()
+    if config.LIVE_PROGRESS:
+        from utils.live_progress import stop_progress_server
+        # Stopped first so the report sections below are not overdrawn by the live view
+        stop_progress_server()
+
+    if config.ADAPTIVE_TIMEOUTS:
+        from utils.locator_timing import get_timing_store
+        timing_store = get_timing_store(config)
+        timing_store.save_shard(worker_id or "main")
+        if worker_id is None:
+            timing_store.merge_shards()
+
+    if config.RUN_HISTORY_DB:
+        from utils.run_history import get_run_history
+        get_run_history(config).flush()
+
+    if worker_id is None and stress_summary.results:
+        print_report_section("Stress summary", stress_summary.format_report())
+
+    if worker_id is None and branch_matrix.cells:
+        print_report_section("Branch matrix (result and mean duration per scenario)", branch_matrix.format_report())
+
+    if worker_id is None and engine_summary.results:
+        print_report_section("Results per browser engine", engine_summary.format_report())
+
+    if worker_id is None and config.NETWORK_ACCOUNTING:
+        from utils.network_accounting import get_network_baseline, network_summary
+        if network_summary.totals:
+            print_report_section("Network accounting", network_summary.format_report())
+            if session.config.getoption("--update-network-baseline"):
+                get_network_baseline(config).update(network_summary.totals)
+
+    if config.LOCATOR_PROFILE:
+        from utils.locator_profiler import get_locator_profiler
+        locator_profiler = get_locator_profiler(config)
+        locator_profiler.dump(worker_id or "main")
+        if worker_id is None:
+            locator_profiler.merge_dumps()
+            print_report_section("Locator profile (sorted by p95 call time)", locator_profiler.format_report())
+
+    harness_profiler = active_harness_profiler()
+    if harness_profiler:
+        harness_profiler.dump(worker_id or "main")
+        if worker_id is None:
+            harness_profiler.merge_dumps()
+            print_report_section("Harness profile (per step)", harness_profiler.format_report())
+
+    if config.STREAM_REPORT_DIR:
+        from utils.stream_report import close_stream_report, merge_report
+        close_stream_report()
+    if worker_id is None and config.STREAM_REPORT_DIR:
+        report_path = merge_report(Config.snapshot().STREAM_REPORT_DIR)
+        if report_path:
+            print_report_section("Streaming report", report_path)
+
+    startup_profiler = active_startup_profiler()
+    if startup_profiler:
+        startup_profiler.dump(worker_id or "main")
+        if worker_id is None:
+            startup_profiler.merge_dumps()
+            print_report_section("Startup profile (per process)", startup_profiler.format_report())
+
+    # The watch session and the browser server own their browsers, so they must not be killed here
+    if os.environ.get("CI") or os.environ.get("GITHUB_ACTIONS") or active_watch_session() or config.BROWSER_SERVER:
         return
     
-    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
     if worker_id is None:
         try:
             subprocess.run(["pkill", "-f", "ms-playwright.*chromium.*remote-debugging"], check=False, timeout=5)
@@ -0,0 +1,24 @@
+Feature: Precondition Seeding - Given steps that create their state through the seeding backend
+  As a test author
+  I want state-only Given steps to be created through the seeding backend
+  So that scenarios start from that state without replaying the UI
+
+  @successful_cart_seeding @seeding
+  Scenario: Seed a cart into the browser session
+    Given I have items in my cart
+    Then the seeded cart should be available in the browser session
+
+  @successful_scheduled_delivery_seeding @seeding
+  Scenario: Seed a cart with a confirmed scheduled delivery time
+    Given I have confirmed the scheduled delivery time
+    Then the seeded cart should be available in the browser session
+
+  @successful_completed_order_seeding @seeding
+  Scenario: Seed a completed order into the browser session
+    Given I have a confirmed order displayed on the order confirmation page
+    Then the seeded order should be available in the browser session
+
+  @successful_3ds_order_seeding @seeding
+  Scenario: Seed an order that passed 3D Secure authentication
+    Given I have completed 3D Secure authentication successfully
+    Then the seeded order should be available in the browser session
@@ -1,16 +1,27 @@
+import os
 import time
-from typing import Union
+from typing import Callable, List, Sequence, Tuple, Union
 
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError, Locator
 from config.config import Config
 from pages.base_actions.base_utils import BaseUtils
+from pages.base_actions.network_watcher import ApiResponseTiming, NetworkWatcher, UrlPattern
+from utils.locator_profiler import CALL_ABSENT, CALL_OK, CALL_TIMEOUT, base_selector, get_locator_profiler
+from utils.locator_timing import get_timing_store, selector_key
+from utils.step_budget import step_budget_watchdog
+from utils.step_retry import cap_attempt_timeout
+
+# (x, y, width, height) relative to the snapshot
+Region = Tuple[float, float, float, float]
 
 
 class BaseAction:
     def __init__(self, page: Page):
         self.page = page
-        self.config = Config()
+        self.config = Config.snapshot()
         self.utils = BaseUtils()
+        self.timing_store = get_timing_store(self.config)
+        self.locator_profiler = get_locator_profiler(self.config)
         
     def wait_for_page_loaded(self):
         # Wait for DOM to be ready first
@@ -31,11 +42,99 @@ class BaseAction:
         Returns:
             Playwright Locator object
         """
+        start = time.perf_counter()
         if isinstance(locator, Locator):
-            return locator
+            resolved_locator = locator
+        elif isinstance(locator, str):
+            resolved_locator = self.page.locator(locator)
+        else:
+            raise TypeError(f"Unsupported locator type: {type(locator)}. Expected Locator or str.")
+        if self.locator_profiler is not None:
+            self.locator_profiler.record_build(
+                self._locator_key(locator), selector_key(resolved_locator), time.perf_counter() - start
+            )
+        return resolved_locator
+
+    def _locator_key(self, locator: Union[Locator, str]) -> str:
+        # Prefer the locator attribute name (e.g. OrderPageLocators.RESTAURANT_HEADING) over the raw selector
         if isinstance(locator, str):
-            return self.page.locator(locator)
-        raise TypeError(f"Unsupported locator type: {type(locator)}. Expected Locator or str.")
+            return locator
+        for holder in vars(self).values():
+            if type(holder).__name__.endswith('Locators'):
+                for name, value in vars(holder).items():
+                    if value is locator:
+                        return f"{type(holder).__name__}.{name}"
+        return selector_key(locator)
+
+    def _adaptive_call(self, locator: Union[Locator, str], action: str, timeout: float, call, probe=False):
+        """
+        Run a Playwright call that takes a timeout, using the adaptive timeout when enabled.
+
+        With ``ADAPTIVE_TIMEOUTS`` on, the timeout is derived from the recorded history of
+        ``locator``/``action`` (never longer than ``timeout``) and successful durations are recorded.
+        With ``LOCATOR_PROFILE`` on, call time, timeouts and match count are sent to the profiler.
+        Timeouts of a ``probe`` (a check where a missing element is an expected answer) are
+        profiled as absent rather than as timeouts.
+        In step budget ``fail`` mode the timeout is also capped to the remaining step budget,
+        and inside a ``retry_step`` step to the per-attempt timeout. In ``warn`` mode a wait that
+        outlasts the budget pauses at the deadline to take the breach screenshot, then continues.
+
+        Args:
+            locator: Locator the call waits on, used as the history key
+            action: Wait state or action name, e.g. 'visible' or 'click'
+            timeout: Timeout in seconds used when there is no usable history
+            call: Callable receiving the timeout in milliseconds
+            probe: Whether a timeout is an expected negative result
+
+        Returns:
+            The return value of ``call``
+        """
+        timeout = step_budget_watchdog.cap(cap_attempt_timeout(timeout))
+        if self.timing_store is None and self.locator_profiler is None:
+            return self._call_until_breach(call, timeout)
+        locator_key = self._locator_key(locator)
+        timing_key = f"{locator_key}:{action}"
+        if self.timing_store is not None:
+            timeout = self.timing_store.timeout_for(timing_key, timeout)
+        start = time.perf_counter()
+        try:
+            result = self._call_until_breach(call, timeout)
+        except PlaywrightTimeoutError:
+            self._profile_call(locator, locator_key, time.perf_counter() - start, CALL_ABSENT if probe else CALL_TIMEOUT)
+            raise
+        elapsed = time.perf_counter() - start
+        if self.timing_store is not None:
+            self.timing_store.record(timing_key, elapsed)
+        self._profile_call(locator, locator_key, elapsed)
+        return result
+
+    def _call_until_breach(self, call, timeout: float):
+        # Warn mode: stop at the budget deadline to screenshot the page at the breach, then wait out the rest
+        before_deadline = step_budget_watchdog.split(timeout)
+        if before_deadline is None:
+            return call(timeout * 1000)
+        try:
+            return call(before_deadline * 1000)
+        except PlaywrightTimeoutError:
+            step_budget_watchdog.capture_breach()
+            return call((timeout - before_deadline) * 1000)
+
+    def _profile_call(self, locator: Union[Locator, str], locator_key: str, seconds: float, outcome=CALL_OK):
+        if self.locator_profiler is None:
+            return
+        selector = locator if isinstance(locator, str) else selector_key(locator)
+        # Count what the selector matches without '.first'/'.nth()' so disambiguated locators are visible too
+        matches = self.page.locator(base_selector(selector)).count()
+        self.locator_profiler.record_call(locator_key, selector, seconds, matches=matches, outcome=outcome)
+
+    def _wait_for(self, locator: Union[Locator, str], state: str, timeout=None, probe=False) -> Locator:
+        resolved_locator = self._resolve_locator(locator)
+        if timeout is None:
+            timeout = self.config.DEFAULT_TIMEOUT
+        self._adaptive_call(
+            locator, state, timeout, lambda ms: resolved_locator.wait_for(state=state, timeout=ms), probe=probe
+        )
+        return resolved_locator
 
 
     def open_url(self, url=None, path=None):
@@ -53,17 +152,14 @@ class BaseAction:
             
         # Use 'domcontentloaded' instead of 'networkidle' to avoid hanging on dynamic sites
         # 'networkidle' can wait indefinitely for sites
-        self.page.goto(target_url, wait_until='domcontentloaded', timeout=self.config.DEFAULT_TIMEOUT * 1000)
+        self.page.goto(target_url, wait_until='domcontentloaded', timeout=cap_attempt_timeout(self.config.DEFAULT_TIMEOUT) * 1000)
 
     def find_element(self, locator: Union[Locator, str]):
-        resolved_locator = self._resolve_locator(locator)
-        resolved_locator.wait_for(state='attached', timeout=self.config.DEFAULT_TIMEOUT * 1000)
-        return resolved_locator
+        return self._wait_for(locator, 'attached')
 
     def is_element_visible(self, locator: Union[Locator, str]):
         try:
-            resolved_locator = self._resolve_locator(locator)
-            resolved_locator.wait_for(state='visible', timeout=self.config.DEFAULT_TIMEOUT * 1000)
+            self._wait_for(locator, 'visible', probe=True)
             return True
         except PlaywrightTimeoutError:
             return False
@@ -78,7 +174,7 @@ class BaseAction:
         - Enabled
         """
         resolved_locator = self._resolve_locator(locator)
-        resolved_locator.click(timeout=self.config.DEFAULT_TIMEOUT * 1000)
+        self._adaptive_call(locator, 'click', self.config.DEFAULT_TIMEOUT, lambda ms: resolved_locator.click(timeout=ms))
 
     def click_if_exists(self, locator: Union[Locator, str]):
         if self.is_element_visible(locator):
@@ -130,15 +226,13 @@ class BaseAction:
 
     def wait_for_element_visible(self, locator: Union[Locator, str]):
         try:
-            resolved_locator = self._resolve_locator(locator)
-            resolved_locator.wait_for(state='visible', timeout=self.config.DEFAULT_TIMEOUT * 1000)
+            self._wait_for(locator, 'visible')
         except PlaywrightTimeoutError:
             raise PlaywrightTimeoutError(f"Element not found or not visible: {locator}")
 
     def wait_for_element_clickable(self, locator: Union[Locator, str], timeout=10):
         try:
-            resolved_locator = self._resolve_locator(locator)
-            resolved_locator.wait_for(state='visible', timeout=timeout * 1000)
+            resolved_locator = self._wait_for(locator, 'visible', timeout, probe=True)
             # Check if element is enabled (not disabled)
             is_disabled = resolved_locator.get_attribute('disabled')
             if is_disabled is not None:
@@ -149,9 +243,8 @@ class BaseAction:
 
     def wait_for_element_not_clickable(self, locator: Union[Locator, str], timeout=5):
         try:
-            resolved_locator = self._resolve_locator(locator)
             # Wait for element to be disabled or hidden
-            resolved_locator.wait_for(state='hidden', timeout=timeout * 1000)
+            self._wait_for(locator, 'hidden', timeout, probe=True)
             return True
         except PlaywrightTimeoutError:
             # Check if element is disabled
@@ -183,8 +276,7 @@ class BaseAction:
     def verify_element_not_clickable(self, locator: Union[Locator, str], timeout=10):
         # First check if element exists
         try:
-            resolved_locator = self._resolve_locator(locator)
-            resolved_locator.wait_for(state='attached', timeout=timeout * 1000)
+            self._wait_for(locator, 'attached', timeout)
         except PlaywrightTimeoutError:
             raise AssertionError(f"Element not found: {locator}")
         
@@ -203,8 +295,7 @@ class BaseAction:
         return True
 
     def wait_for_element_present(self, locator: Union[Locator, str], timeout=3):
-        resolved_locator = self._resolve_locator(locator)
-        resolved_locator.wait_for(state='attached', timeout=timeout * 1000)
+        self._wait_for(locator, 'attached', timeout)
         return True
 
     def verify_element_text(self, locator: Union[Locator, str], expected_text: str):
@@ -229,16 +320,14 @@ class BaseAction:
 
     def wait_for_element_disappears(self, locator: Union[Locator, str], timeout=10):
         try:
-            resolved_locator = self._resolve_locator(locator)
-            resolved_locator.wait_for(state='hidden', timeout=timeout * 1000)
+            self._wait_for(locator, 'hidden', timeout)
             return True
         except PlaywrightTimeoutError:
             raise AssertionError(f"Element does not disappear in {timeout} seconds: {locator}")
 
     def wait_for_element_text_contains(self, locator: Union[Locator, str], expected_text: str, timeout=10):
         try:
-            resolved_locator = self._resolve_locator(locator)
-            resolved_locator.wait_for(state='visible', timeout=timeout * 1000)
+            resolved_locator = self._wait_for(locator, 'visible', timeout)
             
             # Wait for text to appear
             end_time = timeout
@@ -261,8 +350,7 @@ class BaseAction:
 
     def wait_for_element_text_not_contains(self, locator: Union[Locator, str], unexpected_text: str, timeout=10):
         try:
-            resolved_locator = self._resolve_locator(locator)
-            resolved_locator.wait_for(state='visible', timeout=timeout * 1000)
+            resolved_locator = self._wait_for(locator, 'visible', timeout)
             
             # Wait for text to disappear
             end_time = timeout
@@ -285,13 +373,12 @@ class BaseAction:
 
     def refresh_page(self):
         # Use 'domcontentloaded' instead of 'networkidle' to avoid hanging on dynamic sites
-        self.page.reload(wait_until='domcontentloaded', timeout=self.config.DEFAULT_TIMEOUT * 1000)
+        self.page.reload(wait_until='domcontentloaded', timeout=cap_attempt_timeout(self.config.DEFAULT_TIMEOUT) * 1000)
 
     def refresh_and_wait_for_element(self, locator: Union[Locator, str], timeout=10):
         # Use 'domcontentloaded' instead of 'networkidle' to avoid hanging on dynamic sites
-        self.page.reload(wait_until='domcontentloaded', timeout=self.config.DEFAULT_TIMEOUT * 1000)
-        resolved_locator = self._resolve_locator(locator)
-        resolved_locator.wait_for(state='visible', timeout=timeout * 1000)
+        self.page.reload(wait_until='domcontentloaded', timeout=cap_attempt_timeout(self.config.DEFAULT_TIMEOUT) * 1000)
+        self._wait_for(locator, 'visible', timeout)
 
     def wait_for_element_has_value(self, locator: Union[Locator, str], timeout=10):
         # First ensure the element exists and is visible
@@ -315,10 +402,116 @@ class BaseAction:
 
     def go_back(self, wait_until='domcontentloaded', timeout=None):
         if timeout is None:
-            timeout = self.config.DEFAULT_TIMEOUT * 1000
+            timeout = cap_attempt_timeout(self.config.DEFAULT_TIMEOUT) * 1000
         self.page.go_back(wait_until=wait_until, timeout=timeout)
 
     def go_forward(self, wait_until='domcontentloaded', timeout=None):
         if timeout is None:
-            timeout = self.config.DEFAULT_TIMEOUT * 1000
+            timeout = cap_attempt_timeout(self.config.DEFAULT_TIMEOUT) * 1000
         self.page.go_forward(wait_until=wait_until, timeout=timeout)
+
+    def watch_requests(self, *patterns: UrlPattern) -> NetworkWatcher:
+        """
+        Start tracking requests matching ``patterns`` (glob strings or compiled regexes).
+
+        Call this before the action that triggers the requests. The returned watcher can be
+        used as a context manager so its listeners are removed afterwards.
+        """
+        return NetworkWatcher(self.page, patterns).start()
+
+    def expect_api_response(self, pattern: UrlPattern, action: Callable[[], object], timeout=None) -> ApiResponseTiming:
+        """
+        Run ``action`` and wait for the first response whose URL matches ``pattern``.
+
+        Returns:
+            Timing of the matching response (status and backend duration in milliseconds)
+        """
+        if timeout is None:
+            timeout = self.config.DEFAULT_TIMEOUT
+        with self.watch_requests(pattern) as watcher:
+            action()
+            return watcher.wait_for_response(timeout)[0]
+
+    def wait_for_network_quiet(self, watcher: NetworkWatcher, quiet_ms=500, timeout=None,
+                               min_responses=0) -> List[ApiResponseTiming]:
+        """
+        Wait for ``min_responses`` matching responses and until the watched requests have settled,
+        then stop the watcher.
+
+        Unlike ``networkidle`` this only considers the watched patterns, so unrelated
+        analytics or polling traffic does not delay the step. With the default ``min_responses=0``
+        a pattern that matches nothing only costs the quiet window, so follow it with a DOM wait;
+        pass ``min_responses=1`` once the patterns are confirmed against the site's traffic.
+
+        Returns:
+            Timings of all matching requests completed since the watcher started
+        """
+        if timeout is None:
+            timeout = self.config.DEFAULT_TIMEOUT
+        try:
+            if min_responses:
+                watcher.wait_for_response(timeout, min_responses)
+            timings = watcher.wait_for_quiet(quiet_ms, timeout)
+            if not timings:
+                print(f"\033[33mNo request matched {watcher.patterns}, relying on the DOM wait\033[0m")
+            return timings
+        finally:
+            watcher.stop()
+
+    def assert_visual_snapshot(self, name: str, locator: Union[Locator, str, None] = None,
+                               masks: Sequence[Union[Locator, str, Region]] = (), threshold=None, max_diff_ratio=None):
+        """
+        Compare a screenshot with the stored baseline for the current device and browser.
+
+        The screenshot is cropped to ``locator`` when given, otherwise the viewport is used. A missing
+        baseline (or ``--update-visual-baselines``) writes the baseline instead of comparing.
+
+        Args:
+            name: Snapshot name, used as the baseline file name
+            locator: Element to crop the snapshot to
+            masks: Locators or (x, y, width, height) regions with dynamic content to ignore
+            threshold: Perceptual tolerance per pixel (0-1), default VISUAL_THRESHOLD
+            max_diff_ratio: Share of differing pixels allowed, default VISUAL_MAX_DIFF_RATIO
+        """
+        # numpy/Pillow are only needed by visual checks, so load them on first use
+        from utils.visual_diff import baseline_path, compare_images, load_rgb
+
+        threshold = self.config.VISUAL_THRESHOLD if threshold is None else threshold
+        max_diff_ratio = self.config.VISUAL_MAX_DIFF_RATIO if max_diff_ratio is None else max_diff_ratio
+        target = self._wait_for(locator, 'visible') if locator is not None else None
+        origin = target.bounding_box() if target is not None else {'x': 0, 'y': 0}
+        mask_locators = [self._resolve_locator(mask) for mask in masks if isinstance(mask, (Locator, str))]
+        regions = [mask for mask in masks if isinstance(mask, tuple)]
+        for mask_locator in mask_locators:
+            box = mask_locator.bounding_box()
+            if box:
+                regions.append((box['x'] - origin['x'], box['y'] - origin['y'], box['width'], box['height']))
+
+        options = {'animations': 'disabled', 'caret': 'hide', 'mask': mask_locators}
+        snapshot = target.screenshot(**options) if target is not None else self.page.screenshot(**options)
+
+        # The engine comes from the page, since one session can run several engines (--browser=all)
+        engine = self.page.context.browser.browser_type.name
+        path = baseline_path(self.config.VISUAL_BASELINE_DIR, self.config.DEVICE_TYPE, engine, name)
+        if self.config.VISUAL_UPDATE_BASELINES or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(snapshot)
+            print(f"\033[33mVisual baseline written:\033[0m {path}")
+            return
+
+        result = compare_images(load_rgb(path), load_rgb(snapshot), threshold=threshold, masks=regions)
+        if result.diff_ratio <= max_diff_ratio:
+            return
+        diff_dir = os.path.join(self.config.VISUAL_DIFF_PATH, self.config.DEVICE_TYPE.lower(), engine)
+        os.makedirs(diff_dir, exist_ok=True)
+        with open(os.path.join(diff_dir, f"{name}_actual.png"), 'wb') as f:
+            f.write(snapshot)
+        if result.diff_image is not None:
+            result.diff_image.save(os.path.join(diff_dir, f"{name}_diff.png"))
+        if result.size_mismatch:
+            raise AssertionError(f"Visual snapshot '{name}' size changed from baseline {result.width}x{result.height}; see {diff_dir}")
+        raise AssertionError(
+            f"Visual snapshot '{name}' differs from baseline: {result.diff_pixels} pixels "
+            f"({result.diff_ratio:.2%} > {max_diff_ratio:.2%}); see {diff_dir}"
+        )
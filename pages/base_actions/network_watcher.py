@@ -0,0 +1,132 @@
+import fnmatch
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Sequence, Union
+
+from playwright.sync_api import Page, Request, Response, TimeoutError as PlaywrightTimeoutError
+
+UrlPattern = Union[str, Pattern[str]]
+
+
+@dataclass
+class ApiResponseTiming:
+    url: str
+    method: str
+    status: Optional[int]
+    duration_ms: float
+    failed: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and self.status is not None and self.status < 400
+
+    def describe(self) -> str:
+        outcome = 'failed' if self.failed else self.status
+        return f"{self.method} {self.url} -> {outcome} in {self.duration_ms:.0f} ms"
+
+
+class NetworkWatcher:
+    """
+    Tracks requests whose URL matches the given patterns (glob strings or compiled regexes).
+
+    Listeners are attached on ``start()``, so create the watcher before the action that triggers
+    the requests. Playwright only dispatches events while it is waiting, which is why the wait
+    loops below poll with ``page.wait_for_timeout`` instead of ``time.sleep``.
+    """
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, page: Page, patterns: Sequence[UrlPattern]):
+        self.page = page
+        self.patterns = list(patterns)
+        self.timings: List[ApiResponseTiming] = []
+        self._in_flight: Dict[Request, float] = {}
+        self._statuses: Dict[Request, int] = {}
+        self._last_activity = time.perf_counter()
+        self._listening = False
+
+    def __enter__(self) -> 'NetworkWatcher':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def matches(self, url: str) -> bool:
+        for pattern in self.patterns:
+            if isinstance(pattern, str):
+                if fnmatch.fnmatchcase(url, pattern):
+                    return True
+            elif pattern.search(url):
+                return True
+        return False
+
+    def start(self) -> 'NetworkWatcher':
+        if not self._listening:
+            self.page.on('request', self._on_request)
+            self.page.on('response', self._on_response)
+            self.page.on('requestfinished', self._on_request_finished)
+            self.page.on('requestfailed', self._on_request_failed)
+            self._listening = True
+        return self
+
+    def stop(self):
+        if self._listening:
+            self.page.remove_listener('request', self._on_request)
+            self.page.remove_listener('response', self._on_response)
+            self.page.remove_listener('requestfinished', self._on_request_finished)
+            self.page.remove_listener('requestfailed', self._on_request_failed)
+            self._listening = False
+
+    def _on_request(self, request: Request):
+        if self.matches(request.url):
+            self._in_flight[request] = time.perf_counter()
+            self._last_activity = time.perf_counter()
+
+    def _on_response(self, response: Response):
+        if response.request in self._in_flight:
+            self._statuses[response.request] = response.status
+
+    def _complete(self, request: Request, failed: bool):
+        started = self._in_flight.pop(request, None)
+        if started is None:
+            return
+        self._last_activity = time.perf_counter()
+        # Prefer the browser-side timing; fall back to wall clock when it is unavailable
+        response_end = (request.timing or {}).get('responseEnd', -1)
+        duration_ms = response_end if response_end >= 0 else (self._last_activity - started) * 1000
+        self.timings.append(ApiResponseTiming(
+            url=request.url,
+            method=request.method,
+            status=self._statuses.pop(request, None),
+            duration_ms=round(duration_ms, 1),
+            failed=failed,
+        ))
+
+    def _on_request_finished(self, request: Request):
+        self._complete(request, failed=False)
+
+    def _on_request_failed(self, request: Request):
+        self._complete(request, failed=True)
+
+    def wait_for_response(self, timeout: float, count: int = 1) -> List[ApiResponseTiming]:
+        """Wait until ``count`` matching requests have completed and return their timings."""
+        deadline = time.perf_counter() + timeout
+        while len(self.timings) < count:
+            if time.perf_counter() > deadline:
+                raise PlaywrightTimeoutError(
+                    f"No response matching {self.patterns} received in {timeout} seconds"
+                )
+            self.page.wait_for_timeout(self.POLL_INTERVAL_MS)
+        return list(self.timings)
+
+    def wait_for_quiet(self, quiet_ms: int, timeout: float) -> List[ApiResponseTiming]:
+        """Wait until no matching request is in flight and none started for ``quiet_ms``."""
+        deadline = time.perf_counter() + timeout
+        while self._in_flight or (time.perf_counter() - self._last_activity) * 1000 < quiet_ms:
+            if time.perf_counter() > deadline:
+                raise PlaywrightTimeoutError(
+                    f"Requests matching {self.patterns} did not settle in {timeout} seconds "
+                    f"({len(self._in_flight)} still in flight)"
+                )
+            self.page.wait_for_timeout(self.POLL_INTERVAL_MS)
+        return list(self.timings)
@@ -1,8 +1,11 @@
+from typing import List
+
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 
 from pages.base_actions.base_action import BaseAction
+from pages.base_actions.network_watcher import ApiResponseTiming
 from locators.order_page_locators import OrderPageLocators
-from url import BASE_URL
+from url import ADDRESS_AUTOCOMPLETE_API_PATTERNS, ADDRESS_CONFIRM_API_PATTERNS
 
 
 class OrderPage(BaseAction):
@@ -11,7 +14,7 @@ class OrderPage(BaseAction):
         self.order_locators = OrderPageLocators(page)
     
     def open(self):
-        self.open_url(url=BASE_URL)
+        self.open_url(url=self.config.BASE_URL)
         self.wait_for_page_loaded()
     
     def wait_for_page_loaded(self):
@@ -95,9 +98,13 @@ class OrderPage(BaseAction):
         self.click_element(self.order_locators.ADDRESS_PICKER_TRIGGER)
         self.wait_for_element_visible(self.order_locators.ADDRESS_PICKER_MODAL)
     
-    def input_postal_code(self, postal_code: str):
+    def input_postal_code(self, postal_code: str) -> List[ApiResponseTiming]:
         self.wait_for_element_visible(self.order_locators.ADDRESS_SEARCH_INPUT)
-        self.send_keys_to_element(self.order_locators.ADDRESS_SEARCH_INPUT, postal_code)
+        # Start watching before typing so the autocomplete requests are not missed
+        with self.watch_requests(*ADDRESS_AUTOCOMPLETE_API_PATTERNS) as watcher:
+            self.send_keys_to_element(self.order_locators.ADDRESS_SEARCH_INPUT, postal_code)
+            # Followed by wait_for_postal_code_results(), which waits for the suggestions in the DOM
+            return self.wait_for_network_quiet(watcher)
     
     def wait_for_postal_code_results(self):
         self.wait_for_element_visible(self.order_locators.ADDRESS_SUGGESTION_ITEMS)
@@ -116,10 +123,13 @@ class OrderPage(BaseAction):
             raise AssertionError("No address suggestions are available to read.")
         return suggestions.first.inner_text().strip()
     
-    def confirm_selected_address(self):
+    def confirm_selected_address(self) -> List[ApiResponseTiming]:
         self.wait_for_element_clickable(self.order_locators.ADDRESS_CONFIRM_BUTTON)
-        self.click_element(self.order_locators.ADDRESS_CONFIRM_BUTTON)
+        with self.watch_requests(*ADDRESS_CONFIRM_API_PATTERNS) as watcher:
+            self.click_element(self.order_locators.ADDRESS_CONFIRM_BUTTON)
+            timings = self.wait_for_network_quiet(watcher)
         self.wait_for_element_disappears(self.order_locators.ADDRESS_PICKER_MODAL)
+        return timings
     
     def get_current_delivery_address(self):
         return self.get_element_text(self.order_locators.DELIVERY_ADDRESS_TEXT)
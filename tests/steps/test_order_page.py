@@ -2,6 +2,7 @@ import pytest
 from pytest_bdd import given, scenarios, when, then, parsers  # type: ignore
 
 from pages.order_page import OrderPage
+from utils.step_retry import retry_step
 
 
 scenarios("../../features/order_page.feature")
@@ -17,6 +18,7 @@ def order_context():
 
 # Scenario: Open Food Ordering company page @successful_order_page_load @order_page
 @given("I open the Food Ordering company page")
+@retry_step()
 def open_food_ordering_page(page):
     order_page = OrderPage(page)
     order_page.open()
@@ -42,6 +44,7 @@ def verify_order_page_content(page):
 
 # Scenario: Select delivery option from Delivery/Takeout switcher @successful_delivery_selection @order_page
 @given("I have opened the Food Ordering page")
+@retry_step()
 def have_opened_food_ordering_page(page):
     order_page = OrderPage(page)
     order_page.open()
@@ -61,6 +64,7 @@ def verify_switcher_allows_selection(page):
 
 
 @when(parsers.parse('I select "{option}"'))
+@retry_step()
 def select_service_type(page, option: str):
     order_page = OrderPage(page)
     order_page.select_service_type(option)
@@ -83,6 +87,7 @@ def verify_delivery_prompt_not_visible(page):
 
 # Scenario: Input postal code and confirm delivery address @successful_postal_code_confirmation @order_page
 @given(parsers.parse('I have selected "{option}" option'))
+@retry_step()
 def have_selected_service_option(page, option: str):
     order_page = OrderPage(page)
     order_page.open()
@@ -99,7 +104,7 @@ def click_edit_button_at_address_picker(page):
 @when(parsers.parse('I input postal code "{postal_code}" at address picker'))
 def input_postal_code_at_address_picker(page, postal_code: str, order_context):
     order_page = OrderPage(page)
-    order_page.input_postal_code(postal_code)
+    order_context["address_search_api_timings"] = order_page.input_postal_code(postal_code)
     order_page.wait_for_postal_code_results()
     order_context["postal_code"] = postal_code
     order_context["suggestion_text"] = order_page.get_first_address_suggestion_text()
@@ -107,6 +112,8 @@ def input_postal_code_at_address_picker(page, postal_code: str, order_context):
 
 @then("the system should use the postal code to locate the place")
 def verify_postal_code_lookup_success(order_context):
+    failed_calls = [timing.describe() for timing in order_context["address_search_api_timings"] if not timing.ok]
+    assert not failed_calls, f"Address search API calls failed: {failed_calls}"
     suggestion_text = order_context.get("suggestion_text", "")
     assert order_context["postal_code"] in suggestion_text, "Postal code did not return any matching suggestion."
 
@@ -117,11 +124,13 @@ def select_searched_address_and_confirm(page, order_context):
     # Use the current first suggestion for selection to ensure we click the same node text
     order_context["selected_address_text"] = order_page.get_first_address_suggestion_text()
     order_page.select_first_address_suggestion()
-    order_page.confirm_selected_address()
+    order_context["address_confirm_api_timings"] = order_page.confirm_selected_address()
 
 
 @then("I should be able to successfully select and confirm the address")
 def verify_address_confirmed(page, order_context):
+    failed_calls = [timing.describe() for timing in order_context["address_confirm_api_timings"] if not timing.ok]
+    assert not failed_calls, f"Address confirmation API calls failed: {failed_calls}"
     order_page = OrderPage(page)
     current_address = order_page.get_current_delivery_address()
     order_context["confirmed_address"] = current_address
@@ -0,0 +1,70 @@
+from pytest_bdd import given, scenarios, then  # type: ignore
+
+from pages.order_page import OrderPage
+
+
+scenarios("../../features/precondition_seeding.feature")
+
+
+# Default order used when a Given step only needs "an order" to exist
+SEED_ITEMS = [{'name': 'Classic Burger', 'quantity': 1}]
+SEED_ADDRESS = '100 Main Street, Taipei'
+SEED_SCHEDULED_AT = '+3d 19:30'
+SEED_PAYMENT = {'method': 'card', 'card_number': '4242424242424242'}
+
+
+def open_seeded_page(page, state):
+    # Seeded sessions may point at a specific page (e.g. the confirmation page); default to the order page
+    if state.start_url:
+        page.goto(state.start_url)
+        page.wait_for_load_state("domcontentloaded")
+    else:
+        OrderPage(page).open()
+
+
+def assert_session_injected(page, state):
+    assert state.cookies or state.local_storage, "The seed backend returned no session to inject into the browser."
+    cookie_names = {cookie['name'] for cookie in page.context.cookies()}
+    missing_cookies = [cookie['name'] for cookie in state.cookies if cookie['name'] not in cookie_names]
+    assert not missing_cookies, f"Seeded cookies are missing from the browser context: {missing_cookies}"
+    missing_keys = page.evaluate(
+        "keys => keys.filter(key => window.localStorage.getItem(key) === null)", list(state.local_storage)
+    )
+    assert not missing_keys, f"Seeded localStorage keys are missing from the page: {missing_keys}"
+
+
+# Scenario: Seed a cart into the browser session @successful_cart_seeding @seeding
+@given("I have items in my cart", target_fixture="seeded_state")
+def seed_items_in_cart(page, precondition_seeder):
+    state = precondition_seeder.seed_cart(SEED_ITEMS)
+    open_seeded_page(page, state)
+    return state
+
+
+@then("the seeded cart should be available in the browser session")
+def verify_seeded_cart(page, seeded_state):
+    assert seeded_state.data.get('cart_id'), "The seed backend did not return a cart id."
+    assert_session_injected(page, seeded_state)
+
+
+# Scenario: Seed a cart with a confirmed scheduled delivery time @successful_scheduled_delivery_seeding @seeding
+@given("I have confirmed the scheduled delivery time", target_fixture="seeded_state")
+def seed_scheduled_delivery(page, precondition_seeder):
+    state = precondition_seeder.seed_scheduled_delivery(SEED_ITEMS, SEED_ADDRESS, SEED_SCHEDULED_AT)
+    open_seeded_page(page, state)
+    return state
+
+
+# Scenario: Seed a completed order into the browser session @successful_completed_order_seeding @seeding
+@given("I have completed 3D Secure authentication successfully", target_fixture="seeded_state")
+@given("I have a confirmed order displayed on the order confirmation page", target_fixture="seeded_state")
+def seed_completed_order(page, precondition_seeder):
+    state = precondition_seeder.seed_completed_order(SEED_ITEMS, SEED_ADDRESS, SEED_SCHEDULED_AT, SEED_PAYMENT)
+    open_seeded_page(page, state)
+    return state
+
+
+@then("the seeded order should be available in the browser session")
+def verify_seeded_order(page, seeded_state):
+    assert seeded_state.data.get('order_id'), "The seed backend did not return an order id."
+    assert_session_injected(page, seeded_state)
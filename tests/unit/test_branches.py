@@ -0,0 +1,21 @@
+from utils.branches import BranchMatrix, branch_ids, load_branch_paths
+
+
+def test_repeated_scenario_results_are_aggregated():
+    matrix = BranchMatrix()
+    matrix.add('/order/acme/north', 'add_item', True, 1.0)
+    matrix.add('/order/acme/north', 'add_item', False, 3.0)
+    matrix.add('/order/acme/north', 'checkout', True, 2.0)
+
+    cell = matrix.cells['/order/acme/north']['add_item']
+    assert (cell.runs, cell.passed, cell.duration) == (2, 1, 4.0)
+    report = matrix.format_report()
+    assert '1/2  2.0s' in report
+    assert 'ok  2.0s' in report
+    assert report.rstrip().endswith('2/3')
+
+
+def test_branch_ids_are_unique_and_short():
+    paths = load_branch_paths('/order/acme/north?language=en, /order/other/north', None)
+
+    assert branch_ids(paths) == ['north', 'north-1']
@@ -0,0 +1,66 @@
+import io
+
+from utils.live_progress import ProgressServer, ProgressView
+
+
+def test_view_tracks_workers_from_events():
+    view = ProgressView()
+    view.started = 100.0
+    for event in [
+        {'e': 'collected', 'w': 'main', 't': 100.0, 'count': 3},
+        {'e': 'scenario', 'w': 'gw0', 't': 101.0, 'n': 'tests/steps/test_order.py::test_add_item'},
+        {'e': 'step', 'w': 'gw0', 't': 102.0, 's': 'WHEN I add an item'},
+        {'e': 'scenario', 'w': 'gw1', 't': 101.0, 'n': 'tests/steps/test_order.py::test_checkout'},
+        {'e': 'step_error', 'w': 'gw1', 't': 103.0, 's': 'THEN I see the total'},
+        {'e': 'result', 'w': 'gw1', 't': 104.0, 'n': 'tests/steps/test_order.py::test_checkout', 'o': 'failed'},
+    ]:
+        view.apply(event)
+
+    lines = view.render(105.0).splitlines()
+
+    assert lines[0] == "1/3 done  1 failed  elapsed 5s"
+    assert lines[1].split() == ['gw0', '4.0s', 'test_add_item', 'WHEN', 'I', 'add', 'an', 'item']
+    assert lines[2].split() == ['gw1', 'idle', '(1', 'done)']
+
+
+def test_view_estimates_remaining_time_from_history():
+    view = ProgressView({'a::test_one': 10.0, 'a::test_two': 30.0})
+    view.apply({'e': 'collected', 'w': 'main', 't': 0.0, 'count': 3})
+    view.apply({'e': 'scenario', 'w': 'gw0', 't': 0.0, 'n': 'a::test_one'})
+
+    # 6s left on test_one, plus two not started tests at the 20s mean, over one worker
+    assert view.render(4.0).splitlines()[0].endswith("ETA 46s")
+    assert '/~10s' in view.render(4.0)
+
+
+def make_server(tmp_path, line_width):
+    server = ProgressServer(str(tmp_path / 'progress.jsonl'))
+    server.out = io.StringIO()
+    server.interactive = True
+    server.line_width = lambda: line_width
+    return server
+
+
+def test_view_is_drawn_below_an_unfinished_line_and_erased_back_to_it(tmp_path):
+    server = make_server(tmp_path, line_width=12)
+    server.record('collected', count=2)
+
+    server.draw()
+    with server.paused():
+        server.record('result', n='a::test_one', o='passed')
+    server.stop()
+
+    # Starts on a new line, then moves up over the view and back to column 12 of pytest's line
+    assert server.out.getvalue() == "\n0/2 done  0 failed  elapsed 0s\n\033[1F\033[J\033[1A\033[12C"
+
+
+def test_paused_view_is_not_redrawn(tmp_path):
+    server = make_server(tmp_path, line_width=0)
+
+    with server.paused():
+        server.draw()
+    assert server.out.getvalue() == ''
+    server.draw()
+    server.stop()
+
+    assert server.out.getvalue().startswith('0/? done')
@@ -0,0 +1,48 @@
+import json
+
+from utils.precondition_seeding import LocalSeedBackend, PreconditionSeeder
+
+
+class RecordingContext:
+    """Stands in for a BrowserContext, recording what the seeder injects."""
+
+    def __init__(self):
+        self.cookies = []
+        self.init_scripts = []
+
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+
+def make_seeder():
+    context = RecordingContext()
+    return context, PreconditionSeeder(context, LocalSeedBackend('https://staging.inline.app/order/acme?language=en'))
+
+
+def test_local_cart_is_injected_as_cookie_and_local_storage():
+    context, seeder = make_seeder()
+
+    state = seeder.seed_cart([{'name': 'Classic Burger', 'quantity': 1}])
+
+    assert context.cookies == [{'name': 'seed_cart_id', 'value': state.data['cart_id'], 'url': 'https://staging.inline.app'}]
+    assert len(context.init_scripts) == 1
+    assert 'seed.cart' in context.init_scripts[0]
+    assert json.loads(state.local_storage['seed.cart'])['items'] == [{'name': 'Classic Burger', 'quantity': 1}]
+
+
+def test_local_completed_order_carries_the_whole_session():
+    context, seeder = make_seeder()
+
+    state = seeder.seed_completed_order(
+        [{'name': 'Classic Burger', 'quantity': 1}], '100 Main Street', '+3d 19:30',
+        {'method': 'card', 'card_number': '4242424242424242'},
+    )
+
+    assert [cookie['name'] for cookie in context.cookies] == ['seed_cart_id', 'seed_order_id']
+    assert set(state.local_storage) == {'seed.cart', 'seed.delivery', 'seed.order'}
+    order = json.loads(state.local_storage['seed.order'])
+    assert (order['id'], order['cart_id']) == (state.data['order_id'], state.data['cart_id'])
+    assert '4242' not in context.init_scripts[0]
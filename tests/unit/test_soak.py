@@ -0,0 +1,18 @@
+import pytest
+
+from utils.soak import check_soak_iterations, least_squares_slope
+
+
+def test_slope_is_growth_per_iteration():
+    assert least_squares_slope([100, 110, 120, 130]) == pytest.approx(10.0)
+    assert least_squares_slope([5, 5, 5]) == 0.0
+
+
+@pytest.mark.parametrize('iterations', [1, 2, 3])
+def test_soak_too_short_for_a_trend_is_rejected(iterations):
+    with pytest.raises(ValueError, match="at least 4 iterations"):
+        check_soak_iterations(iterations, warmup=2)
+
+
+def test_soak_with_two_trend_samples_is_accepted():
+    check_soak_iterations(4, warmup=2)
@@ -0,0 +1,59 @@
+import json
+import os
+
+from utils.stream_report import StreamReportWriter, clear_shards, merge_report
+
+
+def make_entry(nodeid, outcome, duration, **fields):
+    entry = {
+        "nodeid": nodeid,
+        "feature": "order_page.feature",
+        "scenario": nodeid.rsplit('::', 1)[-1],
+        "outcome": outcome,
+        "duration": duration,
+        "env": "staging",
+        "browser": "chromium",
+        "device": "desktop",
+        "tags": [],
+        "steps": [],
+        "artifacts": [],
+        "error": "",
+        "attempt": 1,
+    }
+    entry.update(fields)
+    return entry
+
+
+def test_merge_report_streams_every_shard(tmp_path):
+    output_dir = str(tmp_path / 'report')
+    screenshot = tmp_path / 'screenshots' / 'test_checkout_attempt1.png'
+    first, second = StreamReportWriter(output_dir, 'gw0'), StreamReportWriter(output_dir, 'gw1')
+    first.append(make_entry('a.py::test_add_item', 'passed', 1.5, worker='gw0'))
+    second.append(make_entry('a.py::test_checkout', 'failed', 2.0, worker='gw1', artifacts=[str(screenshot)],
+                             error='AssertionError: <total> mismatch'))
+    second.append(make_entry('a.py::test_login', 'passed', 0.5, worker='gw1'))
+    first.close()
+    second.close()
+
+    html_path = merge_report(output_dir)
+
+    with open(os.path.join(output_dir, 'results.jsonl'), encoding='utf-8') as file:
+        results = [json.loads(line) for line in file]
+    assert [entry['nodeid'] for entry in results] == ['a.py::test_add_item', 'a.py::test_checkout', 'a.py::test_login']
+    assert results[1]['artifacts'] == [os.path.join('..', 'screenshots', 'test_checkout_attempt1.png')]
+    with open(html_path, encoding='utf-8') as file:
+        page = file.read()
+    assert '<b>3 results</b>: 1 failed, 2 passed · 4.0s total test time' in page
+    assert 'AssertionError: &lt;total&gt; mismatch' in page
+    assert '<img loading="lazy" src="../screenshots/test_checkout_attempt1.png"' in page
+
+
+def test_cleared_shards_leave_nothing_to_merge(tmp_path):
+    output_dir = str(tmp_path)
+    writer = StreamReportWriter(output_dir, 'main')
+    writer.append(make_entry('a.py::test_add_item', 'passed', 1.0))
+    writer.close()
+
+    clear_shards(output_dir)
+
+    assert merge_report(output_dir) is None
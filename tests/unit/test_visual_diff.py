@@ -0,0 +1,63 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from utils.visual_diff import compare_images, load_rgb
+
+
+def make_snapshot(height=300, width=400):
+    # Horizontal gradient, so rows are not all the same colour
+    row = np.linspace(0, 255, width, dtype=np.uint8)
+    return np.repeat(np.stack([row, row[::-1], np.full(width, 128, dtype=np.uint8)], axis=1)[None], height, axis=0)
+
+
+def test_identical_images_have_no_diff():
+    expected = make_snapshot()
+
+    result = compare_images(expected, expected.copy(), chunk_rows=64)
+
+    assert result.diff_pixels == 0
+    assert result.diff_ratio == 0.0
+    assert result.compared_pixels == 300 * 400
+    assert result.diff_image is None
+
+
+def test_changed_region_of_100_pixels_is_counted_and_drawn():
+    expected = make_snapshot()
+    actual = expected.copy()
+    actual[150:160, 200:210] = (255, 0, 255)
+
+    result = compare_images(expected, actual, chunk_rows=64)
+
+    assert result.diff_pixels == 100
+    assert result.diff_ratio == 100 / (300 * 400)
+    diff = np.asarray(result.diff_image)
+    assert (diff[150:160, 200:210] == (255, 0, 0)).all()
+    assert not (diff[:150] == (255, 0, 0)).all(axis=2).any()
+
+
+def test_masked_region_is_ignored():
+    expected = make_snapshot()
+    actual = expected.copy()
+    actual[150:160, 200:210] = (255, 0, 255)
+
+    result = compare_images(expected, actual, masks=[(195, 145, 20, 20)], chunk_rows=64)
+
+    assert result.diff_pixels == 0
+    assert result.compared_pixels == 300 * 400 - 20 * 20
+    assert result.diff_image is None
+
+
+def test_size_mismatch_counts_as_fully_different():
+    result = compare_images(make_snapshot(300, 400), make_snapshot(200, 400))
+
+    assert result.size_mismatch
+    assert result.diff_ratio == 1.0
+
+
+def test_load_rgb_composites_alpha_over_white():
+    buffer = io.BytesIO()
+    Image.new('RGBA', (2, 2), (0, 0, 0, 0)).save(buffer, format='PNG')
+
+    assert (load_rgb(buffer.getvalue()) == 255).all()
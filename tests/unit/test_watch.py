@@ -0,0 +1,45 @@
+import runpy
+import sys
+import warnings
+
+import pytest
+
+import utils.watch as watch
+
+
+def test_active_session_is_set_during_a_watch_run(monkeypatch):
+    sessions = []
+
+    def run_pytest(args):
+        sessions.append(watch.active_session())
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(watch.WatchSession, "start", lambda self: None)
+    monkeypatch.setattr(watch.WatchSession, "stop", lambda self: None)
+    monkeypatch.setattr(watch, "run_pytest", run_pytest)
+    monkeypatch.setattr(sys, "argv", ["utils.watch"])
+
+    # Same entry point as `python -m utils.watch`
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        with pytest.raises(SystemExit) as exit_info:
+            runpy.run_module("utils.watch", run_name="__main__")
+
+    assert exit_info.value.code == 0
+    assert sessions and sessions[0] is not None
+    assert watch.active_session() is None
+
+
+def test_purge_keeps_the_watch_modules(monkeypatch, tmp_path):
+    root = str(tmp_path)
+    project_module = type(sys)("project_module")
+    project_module.__file__ = str(tmp_path / "project_module.py")
+    main_module = type(sys)("__main__")
+    main_module.__file__ = str(tmp_path / "utils" / "watch.py")
+    monkeypatch.setitem(sys.modules, "project_module", project_module)
+    monkeypatch.setitem(sys.modules, "__main__", main_module)
+
+    watch.purge_project_modules(root)
+
+    assert "project_module" not in sys.modules
+    assert sys.modules["__main__"] is main_module
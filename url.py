@@ -1,9 +1,11 @@
+import re
+
 from config.config import Config
 
 
 ########## URL Path Settings ##########
-config = Config()
-BASE_URL = config.BASE_URL
+# BASE_URL and the URLs built from it are resolved on first access from the worker's config
+# snapshot (see __getattr__ below), so importing this module does not read the environment
 ###############################
 
 
@@ -15,5 +17,24 @@ ADDRESS_AND_DATE_PICKER_FRAGMENT = "#address-and-date-picker"
 
 
 ########## URL Settings ##########
-ADDRESS_AND_DATE_PICKER_URL = f"{BASE_URL}{ADDRESS_AND_DATE_PICKER_FRAGMENT}"
-###############################
\ No newline at end of file
+LAZY_URLS = {
+    "BASE_URL": lambda: Config.snapshot().BASE_URL,
+    "ADDRESS_AND_DATE_PICKER_URL": lambda: f"{Config.snapshot().BASE_URL}{ADDRESS_AND_DATE_PICKER_FRAGMENT}",
+}
+
+
+def __getattr__(name):
+    if name in LAZY_URLS:
+        return LAZY_URLS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+###############################
+
+
+
+########## API Patterns ##########
+# Requests the address picker waits on (glob strings or compiled regexes, matched against the full URL).
+# Not yet checked against recorded traffic: the waits do not require a match and the page objects
+# follow them with a DOM wait, so a pattern that matches nothing only loses the API timings.
+ADDRESS_AUTOCOMPLETE_API_PATTERNS = (re.compile(r"autocomplet", re.IGNORECASE), "**/place/**")
+ADDRESS_CONFIRM_API_PATTERNS = (re.compile(r"geocode|/addresses?(/|\?|$)", re.IGNORECASE),)
+###############################
@@ -0,0 +1,78 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+BRANCH_PARAM = "branch_path"
+# Feature files whose scenarios are fanned out over the branches
+BRANCH_FEATURES = ("order_page.feature",)
+
+
+def load_branch_paths(branches: Optional[str], branches_file: Optional[str]) -> List[str]:
+    """Branch paths from ``--branches`` (comma-separated) and ``--branches-file`` (one per line, # comments)."""
+    paths = [path.strip() for path in (branches or '').split(',')]
+    if branches_file:
+        with open(branches_file, encoding='utf-8') as file:
+            paths.extend(line.split('#', 1)[0].strip() for line in file)
+    unique = []
+    for path in paths:
+        if path and path not in unique:
+            unique.append(path)
+    return unique
+
+
+def branch_ids(paths: List[str]) -> List[str]:
+    """Short, unique test ids: the last path segment without the query string."""
+    ids = []
+    for path in paths:
+        segment = path.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1] or path
+        branch_id = re.sub(r'[^\w.:-]+', '_', segment)
+        if branch_id in ids:
+            branch_id = f"{branch_id}-{len(ids)}"
+        ids.append(branch_id)
+    return ids
+
+
+def is_branch_scenario(function) -> bool:
+    scenario = getattr(function, "__scenario__", None)
+    return scenario is not None and os.path.basename(scenario.feature.filename) in BRANCH_FEATURES
+
+
+@dataclass
+class BranchCell:
+    runs: int = 0
+    passed: int = 0
+    duration: float = 0.0
+
+    def format(self) -> str:
+        # Stress iterations and Scenario Outline examples of one scenario share a cell
+        result = ('ok' if self.passed else 'FAIL') if self.runs == 1 else f"{self.passed}/{self.runs}"
+        return f"{result} {self.duration / self.runs:>4.1f}s"
+
+
+class BranchMatrix:
+    """Pass count and mean duration of every branch x scenario pair, aggregated on the controller."""
+
+    def __init__(self):
+        self.cells: Dict[str, Dict[str, BranchCell]] = {}
+
+    def add(self, branch: str, scenario: str, passed: bool, duration: float):
+        cell = self.cells.setdefault(branch, {}).setdefault(scenario, BranchCell())
+        cell.runs += 1
+        cell.passed += passed
+        cell.duration += duration
+
+    def format_report(self) -> str:
+        scenarios = sorted({scenario for row in self.cells.values() for scenario in row})
+        lines = [f"S{index}: {scenario}" for index, scenario in enumerate(scenarios, 1)]
+        header = f"{'Branch':<48} " + " ".join(f"{f'S{index}':>11}" for index in range(1, len(scenarios) + 1))
+        lines += ["", header + f" {'Passed':>7}"]
+        for branch, row in sorted(self.cells.items()):
+            cells = [f"{'-':>11}" if scenario not in row else row[scenario].format().rjust(11) for scenario in scenarios]
+            passed = sum(cell.passed for cell in row.values())
+            runs = sum(cell.runs for cell in row.values())
+            lines.append(f"{branch[-48:]:<48} " + " ".join(cells) + f" {f'{passed}/{runs}':>7}")
+        return "\n".join(lines)
+
+
+branch_matrix = BranchMatrix()
@@ -0,0 +1,197 @@
+"""
+Long-lived Playwright browser servers, one per engine, that test runs connect to instead of launching.
+
+Usage:
+    python -m utils.browser_server start [--browsers chromium,firefox,webkit] [--headless] [--launch-profile NAME]
+    python -m utils.browser_server status
+    python -m utils.browser_server stop
+"""
+import argparse
+import json
+import os
+import secrets
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from playwright.sync_api import Browser, Error as PlaywrightError, Playwright
+
+from config.launch_profiles import LAUNCH_PROFILES, launch_options
+
+ENGINES = ('chromium', 'firefox', 'webkit')
+DEFAULT_STATE_PATH = '.browser_server/state.json'
+STARTUP_TIMEOUT = 30.0
+CONNECT_TIMEOUT_MS = 5000
+CONNECT_ATTEMPTS = 2
+
+
+def load_state(state_path: str) -> Dict[str, dict]:
+    try:
+        with open(state_path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state_path: str, state: Dict[str, dict]):
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(state, file, indent=2)
+    os.replace(temp_path, state_path)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def endpoint_reachable(ws_endpoint: str, timeout: float = 1.0) -> bool:
+    parsed = urlparse(ws_endpoint)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def server_healthy(entry: dict) -> bool:
+    return _process_alive(entry['pid']) and endpoint_reachable(entry['ws_endpoint'])
+
+
+def server_launch_options(profile: str, engine: str, headless: bool) -> dict:
+    """The launch profile's options in the camelCase form of Playwright's launchServer() config."""
+    return {
+        ''.join(part.capitalize() if index else part for index, part in enumerate(name.split('_'))): value
+        for name, value in launch_options(profile, engine, headless).items()
+    }
+
+
+def start_server(engine: str, headless: bool, state_dir: str, launch_profile: str = 'default') -> dict:
+    """Start ``playwright launch-server`` for ``engine`` in its own session and wait until it accepts connections."""
+    port = _free_port()
+    ws_path = f"/{secrets.token_hex(8)}"
+    config_path = os.path.join(state_dir, f"{engine}.config.json")
+    server_config = server_launch_options(launch_profile, engine, headless)
+    server_config.update(host='127.0.0.1', port=port, wsPath=ws_path)
+    with open(config_path, 'w', encoding='utf-8') as file:
+        json.dump(server_config, file)
+    log = open(os.path.join(state_dir, f"{engine}.log"), 'ab')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'playwright', 'launch-server', '--browser', engine, '--config', config_path],
+        stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, start_new_session=True,
+    )
+    log.close()
+    # Record the headless mode the profile actually launches with, e.g. fast-headless forces it
+    entry = {'pid': process.pid, 'ws_endpoint': f"ws://127.0.0.1:{port}{ws_path}", 'headless': server_config['headless'],
+             'launch_profile': launch_profile, 'started_at': time.time()}
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{engine} browser server exited with code {process.returncode}; see {state_dir}/{engine}.log")
+        if endpoint_reachable(entry['ws_endpoint'], timeout=0.2):
+            return entry
+        time.sleep(0.2)
+    stop_process(process.pid)
+    raise RuntimeError(f"{engine} browser server did not start within {STARTUP_TIMEOUT:.0f}s")
+
+
+def stop_process(pid: int):
+    try:
+        # The server runs in its own session, so this also stops the browser it launched
+        os.killpg(pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def server_matches(entry: dict, engine: str, headless: bool, launch_profile: str) -> bool:
+    """Whether ``entry`` was started with the profile and the headless mode that ``headless`` resolves to under it."""
+    if entry.get('launch_profile', 'default') != launch_profile:
+        return False
+    return entry['headless'] == launch_options(launch_profile, engine, headless)['headless']
+
+
+def connect_browser_server(playwright: Playwright, engine: str, headless: bool, state_path: str,
+                           launch_profile: str = 'default') -> Optional[Browser]:
+    """
+    Connect to the running browser server for ``engine``.
+
+    Returns None (so the caller launches locally) when no healthy server is running, when it was
+    started with a different headless mode or launch profile, or when connecting still fails after
+    a reconnect.
+    """
+    entry = load_state(state_path).get(engine)
+    if entry is None or not server_matches(entry, engine, headless, launch_profile) or not server_healthy(entry):
+        return None
+    for attempt in range(1, CONNECT_ATTEMPTS + 1):
+        try:
+            return getattr(playwright, engine).connect(entry['ws_endpoint'], timeout=CONNECT_TIMEOUT_MS)
+        except PlaywrightError as exc:
+            print(f"\033[33mBrowser server connect failed ({engine}, attempt {attempt}): {exc}\033[0m")
+            time.sleep(0.5)
+    return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Manage long-lived Playwright browser servers')
+    parser.add_argument('--state', default=os.getenv('BROWSER_SERVER_STATE') or DEFAULT_STATE_PATH)
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    start = subcommands.add_parser('start', help='Start one browser server per engine')
+    start.add_argument('--browsers', default='chromium', help=f"Comma-separated engines: {', '.join(ENGINES)}")
+    start.add_argument('--headless', action='store_true')
+    start.add_argument('--launch-profile', default=os.getenv('LAUNCH_PROFILE') or 'default', choices=list(LAUNCH_PROFILES),
+                       help='Browser launch profile from config/launch_profiles.py')
+    subcommands.add_parser('status', help='Show the running browser servers')
+    subcommands.add_parser('stop', help='Stop all browser servers')
+    args = parser.parse_args(argv)
+
+    state = load_state(args.state)
+    state_dir = os.path.dirname(args.state) or '.'
+    if args.command == 'start':
+        os.makedirs(state_dir, exist_ok=True)
+        for engine in [name.strip().lower() for name in args.browsers.split(',') if name.strip()]:
+            if engine not in ENGINES:
+                parser.error(f"Unsupported browser: {engine}")
+            entry = state.get(engine)
+            if entry and server_healthy(entry) and server_matches(entry, engine, args.headless, args.launch_profile):
+                print(f"{engine:<9} already running  {entry['ws_endpoint']}")
+                continue
+            if entry:
+                stop_process(entry['pid'])
+            state[engine] = start_server(engine, args.headless, state_dir, args.launch_profile)
+            save_state(args.state, state)
+            print(f"{engine:<9} started          {state[engine]['ws_endpoint']}")
+    elif args.command == 'status':
+        if not state:
+            print("No browser servers running")
+        for engine, entry in state.items():
+            health = 'healthy' if server_healthy(entry) else 'unreachable'
+            mode = 'headless' if entry['headless'] else 'headed'
+            profile = entry.get('launch_profile', 'default')
+            print(f"{engine:<9} {health:<12} {mode:<9} {profile:<14} pid={entry['pid']}  {entry['ws_endpoint']}")
+    else:
+        for engine, entry in state.items():
+            stop_process(entry['pid'])
+            print(f"{engine:<9} stopped")
+        if os.path.exists(args.state):
+            os.remove(args.state)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
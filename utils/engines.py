@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+ENGINE_PARAM = "browser_engine"
+ENGINES = ('chromium', 'firefox', 'webkit')
+# chrome/safari map to chromium/webkit, as in launch_browser
+ENGINE_ALIASES = {'chrome': 'chromium', 'safari': 'webkit'}
+
+
+def parse_browsers(value: str) -> List[str]:
+    """Engines selected by ``--browser``: one name, a comma-separated list or 'all'."""
+    if value.strip().lower() == 'all':
+        return list(ENGINES)
+    engines = []
+    for name in value.split(','):
+        engine = ENGINE_ALIASES.get(name.strip().lower(), name.strip().lower())
+        if engine not in ENGINES:
+            raise ValueError(f"Unsupported browser type: {name.strip()}")
+        if engine not in engines:
+            engines.append(engine)
+    return engines
+
+
+def engine_group(engine: str, index: int, workers: int, engine_count: int) -> str:
+    """
+    xdist_group of the ``index``-th multi-engine test: tests are dealt round-robin over shards of
+    each engine, one shard per worker of that engine's share, so an engine is not pinned to one worker.
+    """
+    shards = max(-(-workers // engine_count), 1)
+    return f"{engine}-{index % shards}"
+
+
+@dataclass
+class EngineResult:
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+    failures: List[str] = field(default_factory=list)
+
+
+class EngineSummary:
+    """Per-engine outcome of a multi-engine run, aggregated from (possibly xdist-forwarded) reports."""
+
+    def __init__(self):
+        self.results: Dict[str, EngineResult] = {}
+
+    def add(self, engine: str, nodeid: str, outcome: str, duration: float):
+        result = self.results.setdefault(engine, EngineResult())
+        result.duration += duration
+        if outcome == 'passed':
+            result.passed += 1
+        elif outcome == 'skipped':
+            result.skipped += 1
+        else:
+            result.failed += 1
+            result.failures.append(nodeid)
+
+    def format_report(self) -> str:
+        lines = [f"{'Engine':<10} {'Passed':>6} {'Failed':>6} {'Skipped':>7} {'Time s':>8}"]
+        for engine in sorted(self.results, key=lambda name: ENGINES.index(name) if name in ENGINES else len(ENGINES)):
+            result = self.results[engine]
+            lines.append(f"{engine:<10} {result.passed:>6} {result.failed:>6} {result.skipped:>7} {result.duration:>8.1f}")
+        for engine, result in self.results.items():
+            for nodeid in result.failures:
+                lines.append(f"  {engine} failed: {nodeid}")
+        return "\n".join(lines)
+
+
+engine_summary = EngineSummary()
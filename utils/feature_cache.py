@@ -0,0 +1,103 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from importlib.metadata import version
+
+from pytest_bdd import feature as bdd_feature
+from pytest_bdd import scenario as bdd_scenario
+from pytest_bdd.parser import Feature, parse_feature
+
+# Bump when the cached format changes; the pytest-bdd version is part of the key as well
+CACHE_FORMAT = 1
+PYTEST_BDD_VERSION = version("pytest-bdd")
+MAX_AGE_DAYS = 30
+
+
+class FeatureCache:
+    """
+    On-disk cache of parsed feature files, keyed by a hash of the file content.
+
+    The key also covers the paths stored in the parsed Feature, the encoding and the pytest-bdd
+    version, so any change to the file (or to the parser) yields a new entry. Entries are written
+    atomically, so xdist workers can share the cache directory.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def cache_key(self, base_path: str, filename: str, encoding: str, content: bytes) -> str:
+        digest = hashlib.sha256(content)
+        abs_filename = os.path.abspath(os.path.join(base_path, filename))
+        rel_filename = os.path.join(os.path.basename(base_path), filename)
+        digest.update(f"\0{abs_filename}\0{rel_filename}\0{encoding}\0{PYTEST_BDD_VERSION}\0{CACHE_FORMAT}".encode())
+        return digest.hexdigest()
+
+    def load(self, base_path: str, filename: str, encoding: str = "utf-8") -> Feature:
+        with open(os.path.join(base_path, filename), 'rb') as file:
+            content = file.read()
+        path = os.path.join(self.cache_dir, f"{self.cache_key(base_path, filename, encoding, content)}.pickle")
+        try:
+            with open(path, 'rb') as file:
+                feature = pickle.load(file)
+            self.hits += 1
+            # Recently used entries survive prune()
+            os.utime(path)
+            return feature
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass
+        self.misses += 1
+        feature = parse_feature(base_path, filename, encoding=encoding)
+        self._write(path, feature)
+        return feature
+
+    def _write(self, path: str, feature: Feature):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(feature, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except OSError:
+            # A read-only checkout still collects, just without caching
+            pass
+
+    def prune(self, max_age_days: float = MAX_AGE_DAYS):
+        cutoff = time.time() - max_age_days * 86400
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def install_feature_cache(cache_dir: str) -> FeatureCache:
+    """
+    Route pytest-bdd's feature loading through a FeatureCache.
+
+    pytest-bdd 6.x parses in ``pytest_bdd.feature.get_feature``; ``pytest_bdd.scenario`` imports it
+    by name, so both references are replaced. The in-memory ``features`` dict is kept as before.
+    """
+    cache = FeatureCache(cache_dir)
+
+    def get_feature(base_path: str, filename: str, encoding: str = "utf-8") -> Feature:
+        __tracebackhide__ = True
+        full_name = os.path.abspath(os.path.join(base_path, filename))
+        feature = bdd_feature.features.get(full_name)
+        if not feature:
+            feature = cache.load(base_path, filename, encoding=encoding)
+            bdd_feature.features[full_name] = feature
+        return feature
+
+    bdd_feature.get_feature = get_feature
+    bdd_scenario.get_feature = get_feature
+    return cache
@@ -0,0 +1,162 @@
+import cProfile
+import functools
+import glob
+import heapq
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from playwright import sync_api
+
+# Sync API classes whose public methods are timed as Playwright calls
+INSTRUMENTED_CLASSES = (
+    'Page', 'Frame', 'Locator', 'FrameLocator', 'ElementHandle', 'BrowserContext',
+    'Keyboard', 'Mouse', 'Touchscreen', 'Request', 'Response', 'APIRequestContext',
+)
+
+
+@dataclass
+class StepTiming:
+    step: str
+    total: float
+    call_durations: List[float] = field(default_factory=list)
+
+
+class HarnessProfiler:
+    """
+    Splits each BDD step's wall time into harness Python, Playwright round trips and browser waiting.
+
+    Every public method of the Playwright sync API classes is wrapped to time the call. Time
+    outside those calls is harness Python (page-object construction, config, hooks, printing).
+    Each call is split into one protocol round trip, estimated as the 5th percentile of all
+    call durations in the session, and in-browser waiting for the remainder.
+    """
+
+    def __init__(self, output_dir: str, dump_dir: str = '', dump_count: int = 5):
+        self.output_dir = output_dir
+        self.dump_dir = dump_dir
+        self.dump_count = dump_count
+        self.steps: List[StepTiming] = []
+        self._originals: List[Tuple[type, str, object]] = []
+        self._depth = 0
+        self._current: Optional[StepTiming] = None
+        self._step_start = 0.0
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._slowest: List[Tuple[float, int, str, cProfile.Profile]] = []
+
+    def install(self):
+        for class_name in INSTRUMENTED_CLASSES:
+            cls = getattr(sync_api, class_name, None)
+            if cls is None:
+                continue
+            for name, attribute in list(vars(cls).items()):
+                if not name.startswith('_') and callable(attribute):
+                    self._originals.append((cls, name, attribute))
+                    setattr(cls, name, self._wrap(attribute))
+
+    def uninstall(self):
+        for cls, name, attribute in self._originals:
+            setattr(cls, name, attribute)
+        self._originals.clear()
+
+    def _wrap(self, method):
+        profiler = self
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if profiler._current is None or profiler._depth:
+                return method(*args, **kwargs)
+            profiler._depth += 1
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler._depth -= 1
+                if profiler._current is not None:
+                    profiler._current.call_durations.append(time.perf_counter() - start)
+        return wrapper
+
+    def start_step(self, step: str):
+        self._current = StepTiming(step=step, total=0.0)
+        if self.dump_dir:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._step_start = time.perf_counter()
+
+    def end_step(self):
+        if self._current is None:
+            return
+        self._current.total = time.perf_counter() - self._step_start
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            entry = (self._current.total, len(self.steps), self._current.step, self._cprofile)
+            if len(self._slowest) < self.dump_count:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+            self._cprofile = None
+        self.steps.append(self._current)
+        self._current = None
+
+    def dump(self, worker_id: str):
+        if self.steps:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"harness_profile.{worker_id}.json")
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump([asdict(step) for step in self.steps], file)
+        if self._slowest:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            for total, index, step, profile in sorted(self._slowest, reverse=True):
+                slug = re.sub(r'[^A-Za-z0-9]+', '_', step)[:60].strip('_')
+                # pstats format: open with snakeviz, or convert with flameprof/gprof2dot
+                profile.dump_stats(os.path.join(self.dump_dir, f"{worker_id}_{index:04d}_{total:.2f}s_{slug}.prof"))
+
+    def merge_dumps(self):
+        steps = []
+        for path in glob.glob(os.path.join(glob.escape(self.output_dir), 'harness_profile.*.json')):
+            with open(path, encoding='utf-8') as file:
+                steps.extend(StepTiming(**raw) for raw in json.load(file))
+            os.remove(path)
+        self.steps = steps
+
+    def format_report(self) -> str:
+        durations = sorted(d for step in self.steps for d in step.call_durations)
+        round_trip = durations[len(durations) * 5 // 100] if durations else 0.0
+        totals: Dict[str, List[float]] = {}
+        for step in self.steps:
+            protocol = sum(min(d, round_trip) for d in step.call_durations)
+            playwright_time = sum(step.call_durations)
+            row = totals.setdefault(step.step, [0, 0.0, 0.0, 0.0, 0.0, 0])
+            row[0] += 1
+            row[1] += step.total
+            row[2] += max(step.total - playwright_time, 0.0)
+            row[3] += protocol
+            row[4] += playwright_time - protocol
+            row[5] += len(step.call_durations)
+        lines = [
+            f"Estimated Playwright round trip: {round_trip * 1000:.2f} ms",
+            f"{'Step':<60} {'Runs':>4} {'Total s':>8} {'Python s':>8} {'Protocol s':>10} {'Browser s':>9} {'Calls':>6}",
+        ]
+        for step, (runs, total, python, protocol, browser, calls) in sorted(
+                totals.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(
+                f"{step[:60]:<60} {runs:>4} {total:>8.2f} {python:>8.2f} {protocol:>10.2f} {browser:>9.2f} {calls:>6}"
+            )
+        return '\n'.join(lines)
+
+
+_profiler: Optional[HarnessProfiler] = None
+
+
+def get_harness_profiler(config) -> Optional[HarnessProfiler]:
+    """Return the process-wide harness profiler (installed on first use), or None when disabled."""
+    global _profiler
+    if not config.HARNESS_PROFILE:
+        return None
+    if _profiler is None:
+        _profiler = HarnessProfiler(config.HARNESS_PROFILE_PATH, config.HARNESS_PROFILE_DUMP_DIR)
+        _profiler.install()
+    return _profiler
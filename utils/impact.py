@@ -0,0 +1,192 @@
+"""
+Test impact analysis: map step modules to the files they depend on and select affected tests.
+
+Usage:
+    python -m utils.impact <git-rev> [--root PATH]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.step_checker import parse_step_module
+
+# Changes to these paths (relative to the root) always run the whole suite
+SHARED_INFRASTRUCTURE = ('config/', 'pytest.ini', 'requirements.txt', '.env')
+
+
+def _module_file(root: str, module_name: str) -> Optional[str]:
+    base = os.path.join(root, *module_name.split('.'))
+    for candidate in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _local_imports(root: str, path: str) -> Set[str]:
+    with open(path, encoding='utf-8') as file:
+        tree = ast.parse(file.read(), filename=path)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ''
+            if node.level:
+                package = os.path.dirname(path)
+                for _ in range(node.level - 1):
+                    package = os.path.dirname(package)
+                prefix = os.path.relpath(package, root).replace(os.sep, '.')
+                module = f"{prefix}.{module}" if module else prefix
+            names.append(module)
+            # 'from package import module' imports a submodule, not just a name
+            names.extend(f"{module}.{alias.name}" for alias in node.names)
+    files = set()
+    for name in names:
+        parts = name.split('.')
+        # Importing a.b.c also executes a/__init__.py and a/b/__init__.py
+        for index in range(1, len(parts) + 1):
+            module_file = _module_file(root, '.'.join(parts[:index]))
+            if module_file:
+                files.add(module_file)
+    return files
+
+
+def dependency_closure(root: str, path: str, cache: Dict[str, Set[str]]) -> Set[str]:
+    seen = {path}
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        if current not in cache:
+            cache[current] = _local_imports(root, current)
+        for dependency in cache[current] - seen:
+            seen.add(dependency)
+            pending.append(dependency)
+    return seen
+
+
+def build_dependency_map(root: str) -> Tuple[Dict[str, Set[str]], Set[str]]:
+    """
+    Build the dependency map of the test suite.
+
+    A conftest.py below the root only applies to the tests under its directory, so it and its
+    imports are added to those step modules instead of being shared by every test.
+
+    Returns:
+        A mapping of each step module to the Python files and feature files it depends on,
+        and the set of files every test depends on (the root conftest.py and its imports)
+    """
+    root = os.path.abspath(root)
+    cache: Dict[str, Set[str]] = {}
+    dependency_map: Dict[str, Set[str]] = {}
+    shared: Set[str] = set()
+    nested_conftests: List[str] = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = [d for d in subdirectories if not d.startswith('.') and d not in ('venv', '__pycache__')]
+        for name in files:
+            path = os.path.join(directory, name)
+            if name == 'conftest.py':
+                if directory == root:
+                    shared |= dependency_closure(root, path, cache)
+                else:
+                    nested_conftests.append(path)
+            elif name.startswith('test_') and name.endswith('.py'):
+                dependencies = dependency_closure(root, path, cache)
+                dependencies.update(parse_step_module(path).features)
+                dependency_map[path] = dependencies
+    for conftest in nested_conftests:
+        scope = os.path.dirname(conftest) + os.sep
+        closure = dependency_closure(root, conftest, cache)
+        for path, dependencies in dependency_map.items():
+            if path.startswith(scope):
+                dependencies |= closure
+    return dependency_map, shared
+
+
+def changed_files(root: str, rev: str) -> Optional[Set[str]]:
+    """Files changed since ``rev`` (committed, staged, unstaged and untracked), or None if git fails."""
+    commands = (
+        ['git', 'diff', '--name-only', rev],
+        ['git', 'ls-files', '--others', '--exclude-standard'],
+    )
+    files = set()
+    try:
+        for command in commands:
+            output = subprocess.run(command, cwd=root, capture_output=True, text=True, check=True, timeout=30).stdout
+            files.update(os.path.join(root, line) for line in output.splitlines() if line)
+    except (subprocess.SubprocessError, OSError):
+        return None
+    return {os.path.normpath(path) for path in files}
+
+
+def affects_everything(root: str, changed: Iterable[str], shared: Set[str]) -> bool:
+    for path in changed:
+        relative = os.path.relpath(path, root).replace(os.sep, '/')
+        if path in shared or relative.startswith(SHARED_INFRASTRUCTURE):
+            return True
+    return False
+
+
+def select_items(items: List, root: str, rev: str) -> Tuple[List, List, str]:
+    """
+    Split collected pytest items into selected and deselected ones for ``--changed-since``.
+
+    Step modules are selected when any Python file they import changes. When only a feature
+    file changes, just the scenarios from that feature are selected.
+
+    Returns:
+        (selected, deselected, reason)
+    """
+    root = os.path.abspath(root)
+    changed = changed_files(root, rev)
+    if changed is None:
+        return items, [], f"could not diff against {rev}, running everything"
+    dependency_map, shared = build_dependency_map(root)
+    if affects_everything(root, changed, shared):
+        return items, [], "shared infrastructure changed, running everything"
+
+    selected, deselected = [], []
+    for item in items:
+        module_path = os.path.normpath(str(item.path))
+        dependencies = dependency_map.get(module_path)
+        if dependencies is None:
+            selected.append(item)
+            continue
+        python_changes = {path for path in changed & dependencies if path.endswith('.py')}
+        scenario = getattr(getattr(item, 'function', None), '__scenario__', None)
+        feature_file = os.path.normpath(scenario.feature.filename) if scenario else None
+        if python_changes or (feature_file in changed if feature_file else changed & dependencies):
+            selected.append(item)
+        else:
+            deselected.append(item)
+    return selected, deselected, f"{len(changed)} file(s) changed since {rev}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='List step modules affected by changes since a git revision')
+    parser.add_argument('rev', help='Git revision to diff against, e.g. origin/main')
+    parser.add_argument('--root', default=os.getcwd(), help='Project root (default: current directory)')
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    changed = changed_files(root, args.rev)
+    if changed is None:
+        print(f"Could not diff against {args.rev}; run everything.")
+        return 0
+    dependency_map, shared = build_dependency_map(root)
+    if affects_everything(root, changed, shared):
+        print("Shared infrastructure changed; run everything.")
+        return 0
+    for module_path, dependencies in sorted(dependency_map.items()):
+        hits = sorted(changed & dependencies)
+        if hits:
+            print(os.path.relpath(module_path, root))
+            for hit in hits:
+                print(f"    {os.path.relpath(hit, root)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Benchmark browser launch profiles: cold launch, first context and first navigation per engine.
+
+Each profile's screenshot of the benchmark page is compared with the 'faithful' profile, so the
+cheapest profile that still renders the same can be picked.
+
+Usage:
+    python -m utils.launch_benchmark [--browsers chromium,firefox,webkit] [--profiles fast-headless,faithful] [--runs 5]
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+
+from config.launch_profiles import LAUNCH_PROFILES, launch_options
+
+REFERENCE_PROFILE = 'faithful'
+VIEWPORT = {'width': 1280, 'height': 800}
+
+# Static stand-in for a restaurant page: web font fallback, flex/grid layout, shadows and a transition
+BENCHMARK_PAGE = b"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Launch benchmark</title>
+<style>
+  body { font-family: system-ui, sans-serif; margin: 0; background: #fafafa; }
+  header { display: flex; justify-content: space-between; padding: 24px; background: #222; color: #fff; }
+  main { display: grid; grid-template-columns: repeat(3, 1fr); gap: 16px; padding: 24px; }
+  .card { background: #fff; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,.15); padding: 16px;
+          transition: transform .2s; }
+  .card h2 { margin: 0 0 8px; font-size: 18px; }
+  .price { color: #c0392b; font-weight: 700; }
+</style></head>
+<body><header><h1>Benchmark Bistro</h1><button>Delivery</button></header>
+<main>""" + b"".join(
+    b'<div class="card"><h2>Dish %d</h2><p>Seasonal ingredients, slow cooked.</p><span class="price">$%d.50</span></div>'
+    % (index, 8 + index) for index in range(12)
+) + b"</main></body></html>"
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(BENCHMARK_PAGE)))
+        self.end_headers()
+        self.wfile.write(BENCHMARK_PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@dataclass
+class BenchmarkResult:
+    engine: str
+    profile: str
+    launch: List[float] = field(default_factory=list)
+    context: List[float] = field(default_factory=list)
+    navigation: List[float] = field(default_factory=list)
+    screenshot: Optional[bytes] = None
+    render_diff: Optional[float] = None
+    error: str = ''
+
+
+def measure(playwright, engine: str, profile: str, url: str, runs: int, headless: bool) -> BenchmarkResult:
+    result = BenchmarkResult(engine, profile)
+    options = launch_options(profile, engine, headless)
+    for run in range(runs):
+        try:
+            start = time.perf_counter()
+            browser = getattr(playwright, engine).launch(**options)
+            launched = time.perf_counter()
+            context = browser.new_context(viewport=VIEWPORT)
+            page = context.new_page()
+            context_ready = time.perf_counter()
+            page.goto(url, wait_until='load')
+            navigated = time.perf_counter()
+            if run == 0:
+                result.screenshot = page.screenshot(animations='disabled')
+            browser.close()
+        except PlaywrightError as exc:
+            result.error = str(exc).splitlines()[0]
+            return result
+        result.launch.append(launched - start)
+        result.context.append(context_ready - launched)
+        result.navigation.append(navigated - context_ready)
+    return result
+
+
+def compare_with_reference(results: List[BenchmarkResult]):
+    # numpy/Pillow are only needed for the rendering comparison
+    from utils.visual_diff import compare_images, load_rgb
+
+    references = {result.engine: result for result in results if result.profile == REFERENCE_PROFILE}
+    for result in results:
+        reference = references.get(result.engine)
+        if reference is None or not reference.screenshot or not result.screenshot:
+            continue
+        result.render_diff = compare_images(
+            load_rgb(reference.screenshot), load_rgb(result.screenshot), render_diff=False
+        ).diff_ratio
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    lines = [
+        f"{'Engine':<9} {'Profile':<14} {'Launch ms':>10} {'(1st run)':>10} {'Context ms':>11} "
+        f"{'Navigate ms':>12} {'Total ms':>9} {'Render diff':>12}"
+    ]
+    for result in results:
+        if result.error:
+            lines.append(f"{result.engine:<9} {result.profile:<14} error: {result.error}")
+            continue
+        launch = statistics.median(result.launch) * 1000
+        context = statistics.median(result.context) * 1000
+        navigation = statistics.median(result.navigation) * 1000
+        render_diff = '-' if result.render_diff is None else f"{result.render_diff:.2%}"
+        lines.append(
+            f"{result.engine:<9} {result.profile:<14} {launch:>10.0f} {result.launch[0] * 1000:>10.0f} "
+            f"{context:>11.0f} {navigation:>12.0f} {launch + context + navigation:>9.0f} {render_diff:>12}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark browser launch profiles per engine')
+    parser.add_argument('--browsers', default='chromium,firefox,webkit')
+    parser.add_argument('--profiles', default=','.join(LAUNCH_PROFILES))
+    parser.add_argument('--runs', type=int, default=3, help='Launches per engine and profile (median is reported)')
+    parser.add_argument('--headed', action='store_true', help='Launch headed where the profile allows it')
+    args = parser.parse_args(argv)
+
+    engines = [name.strip() for name in args.browsers.split(',') if name.strip()]
+    profiles = [name.strip() for name in args.profiles.split(',') if name.strip()]
+    unknown = [profile for profile in profiles if profile not in LAUNCH_PROFILES]
+    if unknown:
+        parser.error(f"Unknown launch profile(s): {', '.join(unknown)}")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    results: List[BenchmarkResult] = []
+    try:
+        with sync_playwright() as playwright:
+            for engine in engines:
+                for profile in profiles:
+                    print(f"Measuring {engine} / {profile} ...", file=sys.stderr)
+                    results.append(measure(playwright, engine, profile, url, args.runs, not args.headed))
+    finally:
+        server.shutdown()
+
+    compare_with_reference(results)
+    print(format_table(results))
+    print(f"\nRender diff: share of pixels differing from the '{REFERENCE_PROFILE}' profile on the same engine.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
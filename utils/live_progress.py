@@ -0,0 +1,341 @@
+"""
+Live per-worker progress view for xdist runs, fed by step events that workers send over UDP.
+
+Usage:
+    pytest -n 4 --live-progress
+    python -m utils.live_progress replay reports/progress.jsonl [--speed 10]
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import pytest
+
+from utils.run_history import connect, query_slowest
+
+PORT_KEY = "live_progress_port"
+RENDER_INTERVAL = 0.5
+HISTORY_RUNS = 10
+
+
+class ProgressEmitter:
+    """Worker side: fire-and-forget UDP datagrams, so a slow or missing controller never blocks a step."""
+
+    def __init__(self, port: int, worker: str):
+        self.address = ('127.0.0.1', port)
+        self.worker = worker
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+
+    def emit(self, event: str, **fields):
+        fields.update(e=event, w=self.worker, t=time.time())
+        try:
+            self.sock.sendto(json.dumps(fields, separators=(',', ':')).encode(), self.address)
+        except OSError:
+            pass
+
+
+@dataclass
+class WorkerStatus:
+    nodeid: str = ''
+    step: str = ''
+    started: float = 0.0
+    done: int = 0
+    failed: int = 0
+
+
+class ProgressView:
+    """Per-worker state built from events, rendered as a block of lines redrawn in place."""
+
+    def __init__(self, expected: Optional[Dict[str, float]] = None):
+        self.expected = expected or {}
+        self.workers: Dict[str, WorkerStatus] = {}
+        self.total = 0
+        self.started = time.time()
+        self.finished = set()
+
+    def apply(self, event: dict):
+        kind = event['e']
+        if kind == 'collected':
+            self.total = max(self.total, event['count'])
+            return
+        status = self.workers.setdefault(event['w'], WorkerStatus())
+        if kind == 'scenario':
+            status.nodeid, status.step, status.started = event['n'], '', event['t']
+        elif kind == 'step':
+            status.step = event['s']
+        elif kind == 'step_error':
+            status.step = f"FAILED: {event['s']}"
+        elif kind == 'result':
+            self.finished.add(event['n'])
+            status.done += 1
+            status.failed += event['o'] == 'failed'
+            if status.nodeid == event['n']:
+                status.nodeid = status.step = ''
+
+    def _expected(self, nodeid: str) -> float:
+        if nodeid in self.expected:
+            return self.expected[nodeid]
+        return sum(self.expected.values()) / len(self.expected) if self.expected else 0.0
+
+    def render(self, now: float) -> str:
+        done = len(self.finished)
+        failed = sum(status.failed for status in self.workers.values())
+        busy = [status for status in self.workers.values() if status.nodeid]
+        eta = ''
+        if self.total and self.expected:
+            remaining = sum(max(self._expected(status.nodeid) - (now - status.started), 0) for status in busy)
+            remaining += self._expected('') * max(self.total - done - len(busy), 0)
+            eta = f"  ETA {remaining / max(len(self.workers), 1):.0f}s"
+        lines = [f"{done}/{self.total or '?'} done  {failed} failed  elapsed {now - self.started:.0f}s{eta}"]
+        for worker, status in sorted(self.workers.items()):
+            if not status.nodeid:
+                lines.append(f"  {worker:<6} idle ({status.done} done)")
+                continue
+            elapsed = now - status.started
+            expected = self._expected(status.nodeid)
+            estimate = f"/~{expected:.0f}s" if expected else ''
+            scenario = status.nodeid.rsplit('::', 1)[-1]
+            lines.append(f"  {worker:<6} {elapsed:>5.1f}s{estimate:<6} {scenario[:50]:<50} {status.step[:60]}")
+        return "\n".join(lines)
+
+
+class ProgressServer:
+    """
+    Controller side: receives worker events, appends them to a JSONL log and redraws the view.
+
+    Rendering writes to the real terminal (sys.__stdout__), bypassing pytest capture. While
+    ``paused()`` the view is erased and not redrawn, so pytest's own progress output is printed in
+    the right place (see TerminalGuard); the next tick redraws it underneath. ``line_width`` reports
+    the width of pytest's unfinished line, so the view starts below it and the cursor is put back
+    at its end when the view is erased.
+    """
+
+    def __init__(self, log_path: str, history_db: str = ''):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.settimeout(RENDER_INTERVAL / 2)
+        self.port = self.sock.getsockname()[1]
+        os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+        self.log = open(log_path, 'w', encoding='utf-8')
+        self.view = ProgressView(load_expected_durations(history_db))
+        self.out = sys.__stdout__
+        self.interactive = self.out.isatty()
+        self.line_width: Callable[[], int] = lambda: 0
+        self._drawn_lines = 0
+        self._column = 0
+        self._paused = False
+        # Reentrant: results are recorded from hooks that run while the view is paused
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='live-progress', daemon=True)
+
+    def start(self) -> 'ProgressServer':
+        self._thread.start()
+        return self
+
+    def record(self, event: str, **fields):
+        """Add an event that originates on the controller (collection count, test results)."""
+        fields.update(e=event, t=time.time())
+        fields.setdefault('w', 'main')
+        self._handle(fields)
+
+    def _handle(self, event: dict):
+        with self._lock:
+            self.log.write(json.dumps(event, separators=(',', ':')) + "\n")
+            self.view.apply(event)
+
+    def _run(self):
+        last_render = 0.0
+        while not self._stopped.is_set():
+            try:
+                payload, _ = self.sock.recvfrom(65536)
+                self._handle(json.loads(payload))
+            except socket.timeout:
+                pass
+            except (OSError, ValueError):
+                continue
+            if time.time() - last_render >= RENDER_INTERVAL:
+                last_render = time.time()
+                self.draw()
+
+    def _erase(self) -> str:
+        # Caller holds the lock; moves back to the end of the line pytest left unfinished, if any
+        if not self._drawn_lines:
+            return ''
+        resume = f"\033[1A\033[{self._column}C" if self._column else ''
+        erase = f"\033[{self._drawn_lines}F\033[J{resume}"
+        self._drawn_lines = 0
+        return erase
+
+    def clear(self):
+        with self._lock:
+            erase = self._erase()
+            if erase:
+                self.out.write(erase)
+                self.out.flush()
+
+    @contextmanager
+    def paused(self):
+        """Erase the view and hold off redraws while the block writes to the terminal."""
+        with self._lock:
+            self.clear()
+            self._paused = True
+            try:
+                yield
+            finally:
+                self._paused = False
+
+    def draw(self):
+        with self._lock:
+            self.log.flush()
+            if not self.interactive or self._paused:
+                return
+            text = self.view.render(time.time())
+            erase = self._erase()
+            self._column = self.line_width()
+            # Never draw behind pytest's unfinished line (e.g. progress dots), start on the next one
+            newline = "\n" if self._column else ''
+            self.out.write(f"{erase}{newline}{text}\n")
+            self.out.flush()
+            self._drawn_lines = text.count("\n") + 1
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self.clear()
+        self.sock.close()
+        self.log.close()
+
+
+class TerminalGuard:
+    """
+    Pytest plugin registered on the controller with the server: pauses the view while the terminal
+    reporter writes a test's progress, so the reporter and the draw thread never interleave.
+    """
+
+    def __init__(self, server: ProgressServer, config):
+        self.server = server
+        self.config = config
+        server.line_width = self.line_width
+
+    def _writer(self):
+        # The reporter registers itself in its own pytest_configure, so it is looked up on use
+        reporter = self.config.pluginmanager.get_plugin('terminalreporter')
+        return getattr(reporter, '_tw', None)
+
+    def line_width(self) -> int:
+        writer = self._writer()
+        return writer.width_of_current_line if writer else 0
+
+    def _paused(self):
+        with self.server.paused():
+            yield
+            writer = self._writer()
+            if writer:
+                writer.flush()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_logstart(self):
+        yield from self._paused()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_logreport(self):
+        yield from self._paused()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_logfinish(self):
+        yield from self._paused()
+
+
+def load_expected_durations(history_db: str) -> Dict[str, float]:
+    """Median duration per scenario over the recent runs in the run history database, if there is one."""
+    if not history_db or not os.path.exists(history_db):
+        return {}
+    connection = connect(history_db)
+    try:
+        return {nodeid: median for nodeid, _, median, _ in query_slowest(connection, HISTORY_RUNS, sys.maxsize)}
+    finally:
+        connection.close()
+
+
+_emitter: Optional[ProgressEmitter] = None
+_server: Optional[ProgressServer] = None
+
+
+def start_progress_server(config, log_path: str, history_db: str = '') -> ProgressServer:
+    global _server
+    _server = ProgressServer(log_path, history_db)
+    config.pluginmanager.register(TerminalGuard(_server, config), 'live-progress-guard')
+    return _server.start()
+
+
+def progress_server() -> Optional[ProgressServer]:
+    return _server
+
+
+def stop_progress_server():
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
+
+
+def get_progress_emitter(config) -> Optional[ProgressEmitter]:
+    """
+    Return the process-wide emitter, or None when the live view is off.
+
+    xdist workers get the controller's port through ``workerinput``; without xdist the
+    emitter sends to the server in the same process.
+    """
+    global _emitter
+    if _emitter is None:
+        workerinput = getattr(config, 'workerinput', None)
+        if workerinput is not None and PORT_KEY in workerinput:
+            _emitter = ProgressEmitter(workerinput[PORT_KEY], workerinput.get('workerid', 'worker'))
+        elif workerinput is None and _server is not None:
+            _emitter = ProgressEmitter(_server.port, 'main')
+    return _emitter
+
+
+def replay(path: str, speed: float):
+    with open(path, encoding='utf-8') as file:
+        events = [json.loads(line) for line in file if line.strip()]
+    if not events:
+        return
+    view = ProgressView()
+    view.started = events[0]['t']
+    drawn_lines = 0
+    previous = events[0]['t']
+    for event in events:
+        time.sleep(max(event['t'] - previous, 0) / speed)
+        previous = event['t']
+        view.apply(event)
+        text = view.render(event['t'])
+        prefix = f"\033[{drawn_lines}F\033[J" if drawn_lines else ''
+        sys.stdout.write(f"{prefix}{text}\n")
+        sys.stdout.flush()
+        drawn_lines = text.count("\n") + 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Replay a live progress event log')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    replay_parser = subcommands.add_parser('replay', help='Re-render the per-worker view from a progress log')
+    replay_parser.add_argument('path')
+    replay_parser.add_argument('--speed', type=float, default=1.0, help='Playback speed multiplier')
+    args = parser.parse_args(argv)
+    replay(args.path, args.speed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import glob
+import json
+import math
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Set
+
+NTH_SEPARATOR = ' >> nth='
+
+# Outcomes of a profiled call; 'absent' is a negative check (e.g. is_element_visible) that found nothing
+CALL_OK = 'ok'
+CALL_TIMEOUT = 'timeout'
+CALL_ABSENT = 'absent'
+
+
+@dataclass
+class LocatorStats:
+    selector: str = ''
+    builds: int = 0
+    build_time: float = 0.0
+    calls: int = 0
+    call_times: List[float] = field(default_factory=list)
+    timeouts: int = 0
+    absent: int = 0
+    retries: int = 0
+    max_matches: int = 0
+
+    @property
+    def nth_disambiguated(self) -> bool:
+        return NTH_SEPARATOR in self.selector
+
+    def percentile(self, percent: float) -> float:
+        if not self.call_times:
+            return 0.0
+        ordered = sorted(self.call_times)
+        return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+    def merge(self, other: 'LocatorStats'):
+        self.selector = self.selector or other.selector
+        self.builds += other.builds
+        self.build_time += other.build_time
+        self.calls += other.calls
+        self.call_times.extend(other.call_times)
+        self.timeouts += other.timeouts
+        self.absent += other.absent
+        self.retries += other.retries
+        self.max_matches = max(self.max_matches, other.max_matches)
+
+
+class LocatorProfiler:
+    """
+    Collects per-locator Playwright call time, match count, timeouts, absent results and retries.
+
+    Call time is the wait or actionability time of the Playwright call. Build time only covers
+    creating the Locator object from a string selector. A retry is a call on a locator whose
+    previous call in the same scenario timed out or found nothing (step retries, polling loops).
+    Every pytest process dumps its stats to ``<output_dir>/locator_profile.<worker>.json``; the
+    controller merges the dumps and prints a report sorted by p95 call time at session end.
+    """
+
+    def __init__(self, output_dir: str, slow_threshold: float):
+        self.output_dir = output_dir
+        self.slow_threshold = slow_threshold
+        self.stats: Dict[str, LocatorStats] = {}
+        self._failed: Set[str] = set()
+
+    def _get(self, key: str, selector: str) -> LocatorStats:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = LocatorStats(selector=selector)
+        return stats
+
+    def start_scenario(self):
+        # A failed call in an earlier scenario does not make the next call a retry
+        self._failed.clear()
+
+    def record_build(self, key: str, selector: str, seconds: float):
+        stats = self._get(key, selector)
+        stats.builds += 1
+        stats.build_time += seconds
+
+    def record_call(self, key: str, selector: str, seconds: float, matches: int = 0, outcome: str = CALL_OK):
+        stats = self._get(key, selector)
+        stats.calls += 1
+        stats.max_matches = max(stats.max_matches, matches)
+        if key in self._failed:
+            stats.retries += 1
+        if outcome == CALL_ABSENT:
+            # Expected negative checks wait out their timeout, so they stay out of the call time percentiles
+            stats.absent += 1
+        else:
+            stats.call_times.append(round(seconds, 4))
+            stats.timeouts += outcome == CALL_TIMEOUT
+        if outcome == CALL_OK:
+            self._failed.discard(key)
+        else:
+            self._failed.add(key)
+
+    def flags(self, stats: LocatorStats) -> List[str]:
+        flags = []
+        if stats.max_matches > 1:
+            flags.append('NTH' if stats.nth_disambiguated else 'AMBIGUOUS')
+        if stats.percentile(95) > self.slow_threshold:
+            flags.append('SLOW')
+        if stats.timeouts:
+            flags.append('TIMEOUT')
+        if stats.retries:
+            flags.append('RETRIED')
+        return flags
+
+    def dump(self, worker_id: str):
+        if not self.stats:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"locator_profile.{worker_id}.json")
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({key: asdict(stats) for key, stats in self.stats.items()}, file)
+
+    def merge_dumps(self):
+        merged: Dict[str, LocatorStats] = {}
+        for path in glob.glob(os.path.join(glob.escape(self.output_dir), 'locator_profile.*.json')):
+            with open(path, encoding='utf-8') as file:
+                for key, raw in json.load(file).items():
+                    merged.setdefault(key, LocatorStats()).merge(LocatorStats(**raw))
+            os.remove(path)
+        self.stats = merged
+
+    def format_report(self) -> str:
+        rows = sorted(self.stats.items(), key=lambda item: item[1].percentile(95), reverse=True)
+        lines = [
+            f"{'Locator':<60} {'Calls':>6} {'Build ms':>8} {'p50 s':>7} {'p95 s':>7} "
+            f"{'Max s':>7} {'Matches':>7} {'Timeouts':>8} {'Absent':>6} {'Retries':>7}  Flags"
+        ]
+        for key, stats in rows:
+            build_ms = stats.build_time / stats.builds * 1000 if stats.builds else 0.0
+            max_call = max(stats.call_times, default=0.0)
+            lines.append(
+                f"{key[:60]:<60} {stats.calls:>6} {build_ms:>8.3f} {stats.percentile(50):>7.3f} "
+                f"{stats.percentile(95):>7.3f} {max_call:>7.3f} {stats.max_matches:>7} {stats.timeouts:>8} "
+                f"{stats.absent:>6} {stats.retries:>7}  {', '.join(self.flags(stats))}"
+            )
+        return '\n'.join(lines)
+
+
+_profiler: Optional[LocatorProfiler] = None
+
+
+def get_locator_profiler(config) -> Optional[LocatorProfiler]:
+    """Return the process-wide locator profiler, or None when profiling is disabled."""
+    global _profiler
+    if not config.LOCATOR_PROFILE:
+        return None
+    if _profiler is None:
+        _profiler = LocatorProfiler(config.LOCATOR_PROFILE_PATH, config.LOCATOR_PROFILE_SLOW_THRESHOLD)
+    return _profiler
+
+
+def base_selector(selector: str) -> str:
+    # '.first'/'.nth()' append ' >> nth=N'; strip it to count what the selector itself matches
+    head, separator, _ = selector.rpartition(NTH_SEPARATOR)
+    return head if separator else selector
@@ -0,0 +1,105 @@
+import glob
+import json
+import math
+import os
+from typing import Dict, List, Optional
+
+
+class LocatorTimingStore:
+    """
+    Per-locator wait history used to derive adaptive timeouts.
+
+    Samples are kept per locator key (e.g. ``OrderPageLocators.RESTAURANT_HEADING``) in a JSON
+    file shared across runs. Each pytest process only appends to its own shard file, and the
+    controller process merges the shards into the history file at session end, so xdist workers
+    never write the same file concurrently.
+    """
+
+    MAX_SAMPLES = 200
+
+    def __init__(self, path: str, percentile: float = 95.0, margin: float = 2.0, min_samples: int = 5):
+        self.path = path
+        self.percentile = percentile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.history: Dict[str, List[float]] = self._read(path)
+        self.pending: Dict[str, List[float]] = {}
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, List[float]]:
+        try:
+            with open(path, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write(path: str, data: Dict[str, List[float]]):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def record(self, key: str, seconds: float):
+        self.pending.setdefault(key, []).append(round(seconds, 3))
+
+    def timeout_for(self, key: str, default: float) -> float:
+        """
+        Derive a timeout (seconds) from the recorded history of a locator.
+
+        Returns the configured percentile of the observed wait times plus the safety margin,
+        capped at ``default``. Locators with fewer than ``min_samples`` observations fall back
+        to ``default``.
+        """
+        samples = self.history.get(key, [])
+        if len(samples) < self.min_samples:
+            return default
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return min(default, ordered[max(index, 0)] + self.margin)
+
+    def _shard_path(self, worker_id: str) -> str:
+        return f"{self.path}.{worker_id}.shard"
+
+    def save_shard(self, worker_id: str):
+        if self.pending:
+            self._write(self._shard_path(worker_id), self.pending)
+            self.pending = {}
+
+    def merge_shards(self):
+        merged = self._read(self.path)
+        shard_paths = glob.glob(glob.escape(self.path) + '.*.shard')
+        if not shard_paths:
+            return
+        for shard_path in shard_paths:
+            for key, samples in self._read(shard_path).items():
+                merged[key] = (merged.get(key, []) + samples)[-self.MAX_SAMPLES:]
+        self._write(self.path, merged)
+        for shard_path in shard_paths:
+            os.remove(shard_path)
+        self.history = merged
+
+
+_store: Optional[LocatorTimingStore] = None
+
+
+def get_timing_store(config) -> Optional[LocatorTimingStore]:
+    """Return the process-wide timing store, or None when adaptive timeouts are disabled."""
+    global _store
+    if not config.ADAPTIVE_TIMEOUTS:
+        return None
+    if _store is None:
+        _store = LocatorTimingStore(
+            config.TIMING_HISTORY_PATH,
+            percentile=config.ADAPTIVE_TIMEOUT_PERCENTILE,
+            margin=config.ADAPTIVE_TIMEOUT_MARGIN,
+            min_samples=config.ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+        )
+    return _store
+
+
+def selector_key(locator) -> str:
+    # Playwright keeps the selector on the implementation object; repr() also embeds the frame URL
+    impl = getattr(locator, '_impl_obj', None)
+    return getattr(impl, '_selector', None) or str(locator)
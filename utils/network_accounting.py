@@ -0,0 +1,156 @@
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from playwright.sync_api import Error as PlaywrightError, Page, Request
+
+SLOWEST_REQUESTS = 5
+
+
+@dataclass
+class NetworkTally:
+    requests: int = 0
+    failed: int = 0
+    bytes: int = 0
+    third_party_domains: List[str] = field(default_factory=list)
+    slowest: List[List] = field(default_factory=list)  # [duration_ms, url]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def format(self, regressions: List[str]) -> str:
+        lines = [
+            f"requests: {self.requests} (failed {self.failed}), transferred: {self.bytes / 1024:.1f} KiB",
+            f"third-party domains: {', '.join(self.third_party_domains) or '-'}",
+            "slowest requests:",
+        ]
+        lines += [f"    {duration:>8.1f} ms  {url}" for duration, url in self.slowest]
+        lines += [f"REGRESSION: {regression}" for regression in regressions]
+        return '\n'.join(lines)
+
+
+class NetworkAccountant:
+    """
+    Tallies the requests a page makes during one scenario.
+
+    Requests are only collected in the event handlers; transferred sizes need a protocol round
+    trip each, so they are fetched once in ``finish()`` while the page is still open.
+    """
+
+    def __init__(self, page: Page, first_party_domain: str):
+        self.page = page
+        # staging.inline.app -> inline.app, so sibling subdomains count as first party
+        self.first_party_suffix = '.'.join(first_party_domain.split('.')[-2:])
+        self._finished: List[Request] = []
+        self._failed: List[Request] = []
+
+    def start(self) -> 'NetworkAccountant':
+        self.page.on('requestfinished', self._on_request_finished)
+        self.page.on('requestfailed', self._on_request_failed)
+        return self
+
+    def _on_request_finished(self, request: Request):
+        self._finished.append(request)
+
+    def _on_request_failed(self, request: Request):
+        self._failed.append(request)
+
+    def _is_third_party(self, host: str) -> bool:
+        return not (host == self.first_party_suffix or host.endswith('.' + self.first_party_suffix))
+
+    def finish(self) -> NetworkTally:
+        self.page.remove_listener('requestfinished', self._on_request_finished)
+        self.page.remove_listener('requestfailed', self._on_request_failed)
+        tally = NetworkTally(requests=len(self._finished) + len(self._failed), failed=len(self._failed))
+        third_party = set()
+        timings = []
+        for request in self._finished + self._failed:
+            host = urlparse(request.url).hostname or ''
+            if host and self._is_third_party(host):
+                third_party.add(host)
+            response_end = (request.timing or {}).get('responseEnd', -1)
+            if response_end >= 0:
+                timings.append([round(response_end, 1), request.url])
+        for request in self._finished:
+            try:
+                sizes = request.sizes()
+                tally.bytes += sizes['responseHeadersSize'] + sizes['responseBodySize']
+            except PlaywrightError:
+                pass
+        tally.third_party_domains = sorted(third_party)
+        tally.slowest = sorted(timings, reverse=True)[:SLOWEST_REQUESTS]
+        return tally
+
+
+class NetworkBaseline:
+    """Stored per-scenario request count and bytes, compared with configurable relative tolerances."""
+
+    def __init__(self, path: str, request_tolerance: float, bytes_tolerance: float):
+        self.path = path
+        self.request_tolerance = request_tolerance
+        self.bytes_tolerance = bytes_tolerance
+        try:
+            with open(path, encoding='utf-8') as file:
+                self.entries: Dict[str, Dict[str, int]] = json.load(file)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def compare(self, key: str, tally: NetworkTally) -> List[str]:
+        baseline = self.entries.get(key)
+        if not baseline:
+            return []
+        regressions = []
+        checks = (
+            ('requests', tally.requests, self.request_tolerance),
+            ('bytes', tally.bytes, self.bytes_tolerance),
+        )
+        for metric, value, tolerance in checks:
+            allowed = baseline[metric] * (1 + tolerance)
+            if value > allowed:
+                regressions.append(
+                    f"{metric} {value} exceeds baseline {baseline[metric]} (+{tolerance:.0%} allowed)"
+                )
+        return regressions
+
+    def update(self, totals: Dict[str, Dict[str, int]]):
+        self.entries.update(totals)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class NetworkSummary:
+    """Collects forwarded per-scenario network totals and regressions on the controller."""
+
+    def __init__(self):
+        self.totals: Dict[str, Dict[str, int]] = {}
+        self.regressions: Dict[str, List[str]] = {}
+
+    def add(self, nodeid: str, tally: dict, regressions: List[str]):
+        self.totals[nodeid] = {'requests': tally['requests'], 'bytes': tally['bytes']}
+        if regressions:
+            self.regressions[nodeid] = regressions
+
+    def format_report(self) -> str:
+        lines = [f"{'Requests':>8} {'KiB':>9}  Scenario"]
+        for nodeid, totals in sorted(self.totals.items()):
+            flag = '  REGRESSED' if nodeid in self.regressions else ''
+            lines.append(f"{totals['requests']:>8} {totals['bytes'] / 1024:>9.1f}  {nodeid}{flag}")
+            lines += [f"    {regression}" for regression in self.regressions.get(nodeid, [])]
+        return '\n'.join(lines)
+
+
+_baseline: Optional[NetworkBaseline] = None
+network_summary = NetworkSummary()
+
+
+def get_network_baseline(config) -> NetworkBaseline:
+    global _baseline
+    if _baseline is None:
+        _baseline = NetworkBaseline(
+            config.NETWORK_BASELINE_PATH, config.NETWORK_TOLERANCE_REQUESTS, config.NETWORK_TOLERANCE_BYTES
+        )
+    return _baseline
@@ -0,0 +1,187 @@
+import json
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Type
+from urllib.parse import urlparse
+
+from playwright.sync_api import APIRequestContext, BrowserContext, Playwright
+
+
+@dataclass
+class SeededState:
+    """Session state created by a seed backend, ready to be injected into a browser context."""
+    cookies: List[Dict[str, Any]] = field(default_factory=list)
+    local_storage: Dict[str, str] = field(default_factory=dict)
+    data: Dict[str, Any] = field(default_factory=dict)
+    start_url: Optional[str] = None
+
+    def merge(self, other: 'SeededState') -> 'SeededState':
+        return SeededState(
+            cookies=self.cookies + other.cookies,
+            local_storage={**self.local_storage, **other.local_storage},
+            data={**self.data, **other.data},
+            start_url=other.start_url or self.start_url,
+        )
+
+
+class SeedBackend(ABC):
+    """Creates preconditions (cart, scheduled delivery, completed order) without going through the UI."""
+
+    @abstractmethod
+    def create_cart(self, items: List[Dict[str, Any]]) -> SeededState:
+        ...
+
+    @abstractmethod
+    def schedule_delivery(self, state: SeededState, address: str, scheduled_at: str) -> SeededState:
+        ...
+
+    @abstractmethod
+    def complete_order(self, state: SeededState, payment: Dict[str, str]) -> SeededState:
+        ...
+
+    def close(self):
+        pass
+
+
+class HttpSeedBackend(SeedBackend):
+    """
+    Seeds state through the seeding API at ``SEED_API_URL``.
+
+    Each endpoint receives a JSON body and answers with JSON containing ``data`` (ids for later
+    steps: ``cart_id`` from the cart endpoint, ``order_id`` from the order endpoint) and
+    ``cookies``, ``local_storage`` and optionally ``start_url`` to put in the browser.
+    """
+
+    CART_PATH = '/carts'
+    DELIVERY_PATH = '/carts/{cart_id}/delivery'
+    ORDER_PATH = '/carts/{cart_id}/orders'
+
+    def __init__(self, playwright: Playwright, base_url: str, token: str = ''):
+        headers = {'Authorization': f"Bearer {token}"} if token else {}
+        self.request: APIRequestContext = playwright.request.new_context(base_url=base_url, extra_http_headers=headers)
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> SeededState:
+        response = self.request.post(path, data=json.dumps(payload), headers={'Content-Type': 'application/json'})
+        if not response.ok:
+            raise RuntimeError(f"Seeding request {path} failed with HTTP {response.status}: {response.text()[:200]}")
+        body = response.json()
+        return SeededState(
+            cookies=body.get('cookies', []),
+            local_storage=body.get('local_storage', {}),
+            data=body.get('data', {}),
+            start_url=body.get('start_url'),
+        )
+
+    def create_cart(self, items):
+        return self._post(self.CART_PATH, {'items': items})
+
+    def schedule_delivery(self, state, address, scheduled_at):
+        path = self.DELIVERY_PATH.format(cart_id=state.data['cart_id'])
+        return state.merge(self._post(path, {'address': address, 'scheduled_at': scheduled_at}))
+
+    def complete_order(self, state, payment):
+        path = self.ORDER_PATH.format(cart_id=state.data['cart_id'])
+        return state.merge(self._post(path, {'payment': payment, 'three_d_secure': 'COMPLETE'}))
+
+    def close(self):
+        self.request.dispose()
+
+
+class LocalSeedBackend(SeedBackend):
+    """
+    Offline backend for runs without a seeding API: builds the session in the test process.
+
+    The cart, delivery and order are written as cookies on the site's origin and as ``seed.*``
+    localStorage entries, so the injection into the browser context is real. The site's server
+    does not know these records, so scenarios that need server-side state still need the http backend.
+    """
+
+    def __init__(self, base_url: str):
+        parsed = urlparse(base_url)
+        self.origin = f"{parsed.scheme}://{parsed.netloc}"
+
+    def _cookie(self, name: str, value: str) -> Dict[str, Any]:
+        return {'name': name, 'value': value, 'url': self.origin}
+
+    def create_cart(self, items):
+        cart_id = f"cart-{uuid.uuid4().hex[:10]}"
+        return SeededState(
+            cookies=[self._cookie('seed_cart_id', cart_id)],
+            local_storage={'seed.cart': json.dumps({'id': cart_id, 'items': items})},
+            data={'cart_id': cart_id, 'items': items},
+        )
+
+    def schedule_delivery(self, state, address, scheduled_at):
+        delivery = {'cart_id': state.data['cart_id'], 'address': address, 'scheduled_at': scheduled_at}
+        return state.merge(SeededState(
+            local_storage={'seed.delivery': json.dumps(delivery)},
+            data={'delivery_address': address, 'scheduled_at': scheduled_at},
+        ))
+
+    def complete_order(self, state, payment):
+        order_id = f"order-{uuid.uuid4().hex[:10]}"
+        # Only the payment method is kept, card details never leave the step
+        order = {'id': order_id, 'cart_id': state.data['cart_id'], 'status': 'submitted',
+                 'payment_method': payment.get('method'), 'three_d_secure': 'COMPLETE'}
+        return state.merge(SeededState(
+            cookies=[self._cookie('seed_order_id', order_id)],
+            local_storage={'seed.order': json.dumps(order)},
+            data={'order_id': order_id, 'order_status': 'submitted'},
+        ))
+
+
+SEED_BACKENDS: Dict[str, Type[SeedBackend]] = {
+    'http': HttpSeedBackend,
+    'local': LocalSeedBackend,
+}
+
+
+def register_seed_backend(name: str, backend_class: Type[SeedBackend]):
+    SEED_BACKENDS[name.lower()] = backend_class
+
+
+def create_seed_backend(config, playwright: Playwright) -> SeedBackend:
+    """Backend selected by ``SEED_BACKEND``; callers check that one is configured (see ``precondition_seeder``)."""
+    backend_name = config.SEED_BACKEND.lower()
+    backend_class = SEED_BACKENDS.get(backend_name)
+    if backend_class is None:
+        raise ValueError(f"Unsupported seed backend: {config.SEED_BACKEND}. Expected one of {', '.join(SEED_BACKENDS)}")
+    if backend_class is HttpSeedBackend:
+        if not config.SEED_API_URL:
+            raise ValueError("SEED_API_URL must be set to use the http seed backend")
+        return HttpSeedBackend(playwright, config.SEED_API_URL, config.SEED_API_TOKEN)
+    if backend_class is LocalSeedBackend:
+        return LocalSeedBackend(config.BASE_URL)
+    return backend_class()
+
+
+class PreconditionSeeder:
+    """Runs seed backend calls and injects the resulting session into a browser context."""
+
+    def __init__(self, context: BrowserContext, backend: SeedBackend):
+        self.context = context
+        self.backend = backend
+
+    def inject(self, state: SeededState) -> SeededState:
+        if state.cookies:
+            self.context.add_cookies(state.cookies)
+        if state.local_storage:
+            # Applied before any page script runs, on every page of the context
+            self.context.add_init_script(
+                f"for (const [key, value] of Object.entries({json.dumps(state.local_storage)})) "
+                f"{{ window.localStorage.setItem(key, value); }}"
+            )
+        return state
+
+    def seed_cart(self, items: List[Dict[str, Any]]) -> SeededState:
+        return self.inject(self.backend.create_cart(items))
+
+    def seed_scheduled_delivery(self, items, address: str, scheduled_at: str) -> SeededState:
+        state = self.backend.create_cart(items)
+        return self.inject(self.backend.schedule_delivery(state, address, scheduled_at))
+
+    def seed_completed_order(self, items, address: str, scheduled_at: str, payment: Dict[str, str]) -> SeededState:
+        state = self.backend.create_cart(items)
+        state = self.backend.schedule_delivery(state, address, scheduled_at)
+        return self.inject(self.backend.complete_order(state, payment))
@@ -0,0 +1,233 @@
+"""
+Local SQLite history of scenario results with flakiness and duration queries.
+
+Usage:
+    python -m utils.run_history [--db PATH] flaky [--runs N]
+    python -m utils.run_history [--db PATH] slowest [--runs N] [--limit N]
+    python -m utils.run_history [--db PATH] trend SCENARIO [--runs N]
+    python -m utils.run_history [--db PATH] regressions [--runs N] [--threshold RATIO]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import uuid
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    feature TEXT,
+    scenario TEXT,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    attempt INTEGER NOT NULL DEFAULT 1,
+    browser TEXT,
+    device TEXT,
+    env TEXT,
+    tags TEXT,
+    worker TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+CREATE INDEX IF NOT EXISTS idx_results_nodeid ON results (nodeid, run_id);
+"""
+
+# 'error' is a failed setup (e.g. the browser failed to launch), recorded without a call phase
+FAILED_OUTCOMES = ('failed', 'error')
+
+COLUMNS = ('run_id', 'nodeid', 'feature', 'scenario', 'outcome', 'duration', 'attempt',
+           'browser', 'device', 'env', 'tags', 'worker', 'recorded_at')
+
+# One row per scenario and run: the final attempt's outcome plus the number of attempts
+FINAL_RESULTS = """
+WITH recent_runs AS (
+    SELECT run_id, MIN(recorded_at) AS started_at FROM results
+    GROUP BY run_id ORDER BY started_at DESC LIMIT :runs
+)
+SELECT r.run_id, rr.started_at, r.nodeid, r.scenario, r.outcome, r.duration, r.attempt
+FROM results r
+JOIN recent_runs rr ON rr.run_id = r.run_id
+WHERE r.attempt = (
+    SELECT MAX(attempt) FROM results last WHERE last.run_id = r.run_id AND last.nodeid = r.nodeid
+)
+"""
+
+
+def new_run_id() -> str:
+    # Timestamp for readability, plus pid and a random suffix so concurrent runs never share an id
+    return f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def connect(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    # WAL lets xdist workers append while others read; busy_timeout serializes concurrent writers
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA busy_timeout=30000')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class RunHistory:
+    """
+    Buffered writer for scenario results.
+
+    Rows are kept in memory and written in one transaction every ``batch_size`` results and at
+    session end, so recording costs one list append per test.
+    """
+
+    def __init__(self, path: str, run_id: str, worker: str, batch_size: int = 50):
+        self.path = path
+        self.run_id = run_id
+        self.worker = worker
+        self.batch_size = batch_size
+        self.rows: List[Tuple] = []
+
+    def record(self, nodeid: str, outcome: str, duration: float, attempt: int = 1, feature: str = '',
+               scenario: str = '', browser: str = '', device: str = '', env: str = '', tags: Sequence[str] = ()):
+        self.rows.append((
+            self.run_id, nodeid, feature, scenario, outcome, round(duration, 3), attempt,
+            browser, device, env, ','.join(tags), self.worker, datetime.now().isoformat(timespec='seconds'),
+        ))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        connection = connect(self.path)
+        try:
+            with connection:
+                connection.executemany(
+                    f"INSERT INTO results ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    self.rows,
+                )
+        finally:
+            connection.close()
+        self.rows = []
+
+
+_history: Optional[RunHistory] = None
+
+
+def get_run_history(config) -> Optional[RunHistory]:
+    """Return the process-wide history writer, or None when no history database is configured."""
+    global _history
+    if not config.RUN_HISTORY_DB:
+        return None
+    if _history is None:
+        worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+        run_id = os.environ.get('RUN_HISTORY_ID') or new_run_id()
+        _history = RunHistory(config.RUN_HISTORY_DB, run_id, worker)
+    return _history
+
+
+def _final_results(connection: sqlite3.Connection, runs: int) -> List[sqlite3.Row]:
+    connection.row_factory = sqlite3.Row
+    return connection.execute(FINAL_RESULTS, {'runs': runs}).fetchall()
+
+
+def query_flaky(connection: sqlite3.Connection, runs: int) -> List[Tuple]:
+    stats = {}
+    for row in _final_results(connection, runs):
+        entry = stats.setdefault(row['nodeid'], {'runs': 0, 'flaky': 0, 'failed': 0, 'errors': 0})
+        entry['runs'] += 1
+        if row['outcome'] in FAILED_OUTCOMES:
+            entry['failed'] += 1
+            entry['errors'] += row['outcome'] == 'error'
+        elif row['attempt'] > 1:
+            entry['flaky'] += 1
+    ranked = []
+    for nodeid, entry in stats.items():
+        # A scenario that both passes and fails across runs is flaky even without reruns
+        mixed = entry['failed'] if 0 < entry['failed'] < entry['runs'] else 0
+        rate = (entry['flaky'] + mixed) / entry['runs']
+        if rate:
+            ranked.append((nodeid, entry['runs'], entry['flaky'], entry['failed'], entry['errors'], rate))
+    return sorted(ranked, key=lambda row: row[5], reverse=True)
+
+
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def query_slowest(connection: sqlite3.Connection, runs: int, limit: int) -> List[Tuple]:
+    durations = {}
+    for row in _final_results(connection, runs):
+        # Setup errors only time the setup, not the scenario
+        if row['outcome'] != 'error':
+            durations.setdefault(row['nodeid'], []).append(row['duration'])
+    ranked = [(nodeid, len(values), _median(values), max(values)) for nodeid, values in durations.items()]
+    return sorted(ranked, key=lambda row: row[2], reverse=True)[:limit]
+
+
+def query_trend(connection: sqlite3.Connection, scenario: str, runs: int) -> List[Tuple]:
+    rows = [row for row in _final_results(connection, runs) if scenario in row['nodeid']]
+    return sorted(((row['started_at'], row['nodeid'], row['outcome'], row['duration']) for row in rows))
+
+
+def query_regressions(connection: sqlite3.Connection, runs: int, threshold: float) -> List[Tuple]:
+    """Compare each scenario's median duration in the latest ``runs`` runs with the ``runs`` before."""
+    recent, previous = {}, {}
+    latest = {row['run_id'] for row in _final_results(connection, runs)}
+    for row in _final_results(connection, runs * 2):
+        target = recent if row['run_id'] in latest else previous
+        if row['outcome'] == 'passed':
+            target.setdefault(row['nodeid'], []).append(row['duration'])
+    regressions = []
+    for nodeid, values in recent.items():
+        if nodeid in previous:
+            before, after = _median(previous[nodeid]), _median(values)
+            if before and after / before >= threshold:
+                regressions.append((nodeid, before, after, after / before))
+    return sorted(regressions, key=lambda row: row[3], reverse=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Query the local run history database')
+    parser.add_argument('--db', default=os.getenv('RUN_HISTORY_DB') or '.run_history/history.db')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    flaky = subcommands.add_parser('flaky', help='Rank scenarios by flaky rate')
+    flaky.add_argument('--runs', type=int, default=30)
+    slowest = subcommands.add_parser('slowest', help='Slowest scenarios by median duration')
+    slowest.add_argument('--runs', type=int, default=10)
+    slowest.add_argument('--limit', type=int, default=20)
+    trend = subcommands.add_parser('trend', help='Duration per run for scenarios matching a substring')
+    trend.add_argument('scenario')
+    trend.add_argument('--runs', type=int, default=30)
+    regressions = subcommands.add_parser('regressions', help='Scenarios whose median duration regressed')
+    regressions.add_argument('--runs', type=int, default=5)
+    regressions.add_argument('--threshold', type=float, default=1.25, help='Slowdown ratio to report')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No history database at {args.db}")
+        return 1
+    connection = connect(args.db)
+    if args.command == 'flaky':
+        print(f"{'Flaky rate':>10} {'Runs':>5} {'Rerun-pass':>10} {'Failed':>6} {'Setup err':>9}  Scenario")
+        for nodeid, runs, flaky_runs, failed, errors, rate in query_flaky(connection, args.runs):
+            print(f"{rate:>10.0%} {runs:>5} {flaky_runs:>10} {failed:>6} {errors:>9}  {nodeid}")
+    elif args.command == 'slowest':
+        print(f"{'Median s':>9} {'Max s':>7} {'Runs':>5}  Scenario")
+        for nodeid, runs, median, maximum in query_slowest(connection, args.runs, args.limit):
+            print(f"{median:>9.2f} {maximum:>7.2f} {runs:>5}  {nodeid}")
+    elif args.command == 'trend':
+        for started_at, nodeid, outcome, duration in query_trend(connection, args.scenario, args.runs):
+            print(f"{started_at}  {duration:>7.2f}s  {outcome:<7}  {nodeid}")
+    else:
+        print(f"{'Before s':>9} {'After s':>8} {'Ratio':>6}  Scenario")
+        for nodeid, before, after, ratio in query_regressions(connection, args.runs, args.threshold):
+            print(f"{before:>9.2f} {after:>8.2f} {ratio:>6.2f}  {nodeid}")
+    connection.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from playwright.sync_api import Page
+from pytest_bdd.scenario import _execute_step_function, get_step_function
+
+# CDP Performance.getMetrics names sampled after each iteration
+SOAK_METRICS = ('JSHeapUsedSize', 'Nodes', 'JSEventListeners')
+# A growth trend needs at least two samples after the warm-up iterations
+MIN_TREND_SAMPLES = 2
+
+
+def least_squares_slope(values: List[float]) -> float:
+    """Slope of the least-squares line through ``values`` against their index (growth per iteration)."""
+    count = len(values)
+    if count < 2:
+        return 0.0
+    mean_x = (count - 1) / 2
+    mean_y = sum(values) / count
+    numerator = sum((index - mean_x) * (value - mean_y) for index, value in enumerate(values))
+    denominator = sum((index - mean_x) ** 2 for index in range(count))
+    return numerator / denominator
+
+
+def check_soak_iterations(iterations: int, warmup: int):
+    """Reject soak runs too short to fit a trend, which would always pass with a slope of 0."""
+    if iterations < warmup + MIN_TREND_SAMPLES:
+        raise ValueError(
+            f"Soak needs at least {warmup + MIN_TREND_SAMPLES} iterations with {warmup} warm-up iterations "
+            f"(SOAK_WARMUP_ITERATIONS), got {iterations}"
+        )
+
+
+class MetricsSampler:
+    """Samples in-page memory metrics over a Chromium CDP session, after forcing a garbage collection."""
+
+    def __init__(self, page: Page):
+        self.session = page.context.new_cdp_session(page)
+        self.session.send('Performance.enable')
+
+    def sample(self) -> Dict[str, float]:
+        # Without a GC the heap size mostly measures garbage not yet collected
+        self.session.send('HeapProfiler.collectGarbage')
+        metrics = self.session.send('Performance.getMetrics')['metrics']
+        values = {metric['name']: metric['value'] for metric in metrics}
+        return {name: values.get(name, 0.0) for name in SOAK_METRICS}
+
+    def close(self):
+        self.session.detach()
+
+
+@dataclass
+class SoakResult:
+    iterations: int
+    warmup: int
+    samples: List[Dict[str, float]] = field(default_factory=list)
+    slopes: Dict[str, float] = field(default_factory=dict)
+    breaches: List[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        lines = [f"{self.iterations} iterations, first {self.warmup} excluded from the trend"]
+        for name in SOAK_METRICS:
+            series = [sample[name] for sample in self.samples]
+            lines.append(
+                f"  {name:<17} start {series[0]:>12,.0f}  end {series[-1]:>12,.0f}  "
+                f"slope {self.slopes.get(name, 0.0):>+10,.1f}/iteration"
+            )
+        lines.extend(f"  EXCEEDED: {breach}" for breach in self.breaches)
+        return "\n".join(lines)
+
+
+def soak_steps(scenario):
+    # Given steps only build the starting state; When/Then (and their And/But) are what a session repeats
+    return [step for step in scenario.steps if step.type != 'given']
+
+
+def run_soak(request, scenario, page: Page, iterations: int, warmup: int,
+             thresholds: Dict[str, float]) -> Optional[SoakResult]:
+    """
+    Repeat the scenario's When/Then steps ``iterations`` times in the same page and fit memory growth.
+
+    Steps run through pytest-bdd's own step lookup and execution, so hooks, fixtures and argument
+    parsing behave as in the scenario. Returns None when the browser has no CDP (Firefox, WebKit).
+
+    Args:
+        request: Pytest request of the scenario
+        scenario: pytest-bdd Scenario that just passed
+        page: Page the scenario ran in
+        iterations: Number of repetitions
+        warmup: Leading samples left out of the fit (caches, lazy-loaded chunks)
+        thresholds: Maximum slope per metric name, per iteration
+    """
+    check_soak_iterations(iterations, warmup)
+    if page.context.browser.browser_type.name != 'chromium':
+        return None
+    sampler = MetricsSampler(page)
+    result = SoakResult(iterations, warmup)
+    try:
+        result.samples.append(sampler.sample())
+        for _ in range(iterations):
+            for step in soak_steps(scenario):
+                _execute_step_function(request, scenario, step, get_step_function(request=request, step=step))
+            result.samples.append(sampler.sample())
+    finally:
+        sampler.close()
+
+    trend = result.samples[1 + warmup:]
+    for name in SOAK_METRICS:
+        slope = least_squares_slope([sample[name] for sample in trend])
+        result.slopes[name] = slope
+        if name in thresholds and slope > thresholds[name]:
+            result.breaches.append(f"{name} grows {slope:,.1f}/iteration (limit {thresholds[name]:,.1f})")
+    return result
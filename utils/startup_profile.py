@@ -0,0 +1,89 @@
+import glob
+import json
+import os
+import time
+from typing import Dict, Optional
+
+# Phases reported in order: (label, start mark, end mark)
+PHASES = (
+    ("Interpreter, pytest and plugin startup", "process_start", "conftest_import_start"),
+    ("conftest.py imports", "conftest_import_start", "conftest_import_end"),
+    ("Plugin registration and pytest_configure", "conftest_import_end", "session_start"),
+    ("Collection", "session_start", "collection_finish"),
+    ("Collection finished to first test", "collection_finish", "first_test"),
+)
+SLOWEST_COLLECTORS = 10
+
+
+class StartupProfiler:
+    """Wall-clock marks of one pytest process's startup, from process creation to the first test."""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.marks: Dict[str, float] = {}
+        self.collectors: Dict[str, float] = {}
+        self._collector_starts: Dict[str, float] = {}
+        self.workers: Dict[str, dict] = {}
+        try:
+            import psutil
+            self.marks["process_start"] = psutil.Process().create_time()
+        except ImportError:
+            pass
+
+    def mark(self, name: str, timestamp: float = None):
+        # Only the first occurrence counts, e.g. the first test of the session
+        self.marks.setdefault(name, time.time() if timestamp is None else timestamp)
+
+    def start_collector(self, nodeid: str):
+        self._collector_starts[nodeid] = time.time()
+
+    def end_collector(self, nodeid: str):
+        start = self._collector_starts.pop(nodeid, None)
+        if start is not None:
+            self.collectors[nodeid] = time.time() - start
+
+    def dump(self, worker_id: str):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"startup_profile.{worker_id}.json")
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'marks': self.marks, 'collectors': self.collectors}, file)
+
+    def merge_dumps(self):
+        self.workers = {}
+        for path in sorted(glob.glob(os.path.join(glob.escape(self.output_dir), 'startup_profile.*.json'))):
+            worker_id = os.path.basename(path)[len('startup_profile.'):-len('.json')]
+            with open(path, encoding='utf-8') as file:
+                self.workers[worker_id] = json.load(file)
+            os.remove(path)
+
+    def format_report(self) -> str:
+        lines = []
+        for worker_id, data in self.workers.items():
+            marks = data['marks']
+            lines.append(f"{worker_id}:")
+            for label, start, end in PHASES:
+                if start in marks and end in marks:
+                    lines.append(f"  {label:<45} {marks[end] - marks[start]:>7.3f}s")
+            first = marks.get('first_test', marks.get('collection_finish'))
+            origin = marks.get('process_start', marks.get('conftest_import_start'))
+            if first is not None and origin is not None:
+                lines.append(f"  {'Total':<45} {first - origin:>7.3f}s")
+            collectors = sorted(data['collectors'].items(), key=lambda item: item[1], reverse=True)
+            if collectors:
+                lines.append("  Slowest collectors (module import and step discovery):")
+                for nodeid, seconds in collectors[:SLOWEST_COLLECTORS]:
+                    lines.append(f"    {seconds:>7.3f}s  {nodeid}")
+        return "\n".join(lines)
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler(config) -> Optional[StartupProfiler]:
+    """Return the process-wide startup profiler, or None when startup profiling is disabled."""
+    global _profiler
+    if not config.STARTUP_PROFILE:
+        return None
+    if _profiler is None:
+        _profiler = StartupProfiler(config.STARTUP_PROFILE_PATH)
+    return _profiler
@@ -0,0 +1,135 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+BUDGET_TAG = re.compile(r'^max_duration_(\d+(?:\.\d+)?)(ms|s|m)$')
+TAG_UNITS = {'ms': 0.001, 's': 1, 'm': 60}
+
+
+class StepBudgetExceededError(AssertionError):
+    pass
+
+
+@dataclass
+class BudgetBreach:
+    scope: str
+    step: str
+    budget: float
+    elapsed: float
+
+    def describe(self) -> str:
+        return f"{self.scope} budget {self.budget:.1f}s exceeded ({self.elapsed:.1f}s) at step: {self.step}"
+
+
+def parse_budget_tag(tags: Iterable[str]) -> Optional[float]:
+    for tag in tags:
+        match = BUDGET_TAG.match(tag)
+        if match:
+            return float(match.group(1)) * TAG_UNITS[match.group(2)]
+    return None
+
+
+class StepBudgetWatchdog:
+    """
+    Enforces step and scenario duration budgets.
+
+    Budgets come from ``@max_duration_<n>s`` scenario tags and the ``STEP_BUDGETS`` table. A timer
+    thread reports a breach the moment it happens. In ``fail`` mode, ``cap()`` also shortens
+    BaseAction wait timeouts to the remaining budget, so a stuck step fails at the deadline
+    instead of running out the full element timeout. In ``warn`` mode, ``split()`` lets a
+    BaseAction wait stop at the deadline, call ``capture`` (the breach screenshot) and then
+    wait out the rest of its timeout, so the screenshot shows the page at the breach.
+    """
+
+    def __init__(self):
+        self.mode = 'warn'
+        self.step_budgets: Dict[str, float] = {}
+        self.scenario_budget: Optional[float] = None
+        self.scenario_start = 0.0
+        self.step_name = ''
+        self.step_budget: Optional[float] = None
+        self.step_start = 0.0
+        self._deadline: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self.capture: Optional[Callable[[], None]] = None
+        self.captured = False
+
+    def configure(self, mode: str, step_budgets: Dict[str, float]):
+        if mode not in ('warn', 'fail'):
+            raise ValueError(f"Unsupported step budget mode: {mode}. Expected 'warn' or 'fail'.")
+        self.mode = mode
+        self.step_budgets = step_budgets
+
+    def start_scenario(self, tags: Iterable[str]):
+        self.scenario_budget = parse_budget_tag(tags)
+        self.scenario_start = time.perf_counter()
+
+    @property
+    def active(self) -> bool:
+        return self._deadline is not None
+
+    def start_step(self, step_name: str, capture: Optional[Callable[[], None]] = None):
+        self.step_name = step_name
+        self.capture = capture
+        self.captured = False
+        self.step_budget = self.step_budgets.get(step_name)
+        self.step_start = time.perf_counter()
+        deadlines = []
+        if self.step_budget is not None:
+            deadlines.append(self.step_start + self.step_budget)
+        if self.scenario_budget is not None:
+            deadlines.append(self.scenario_start + self.scenario_budget)
+        self._deadline = min(deadlines) if deadlines else None
+        if self._deadline is not None:
+            self._timer = threading.Timer(max(self._deadline - self.step_start, 0), self._on_breach)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_breach(self):
+        print(f"\n\033[31m⏱ Duration budget exceeded during step: {self.step_name}\033[0m")
+
+    def remaining(self) -> Optional[float]:
+        if self._deadline is None:
+            return None
+        return max(self._deadline - time.perf_counter(), 0.001)
+
+    def cap(self, timeout: float) -> float:
+        """Shorten ``timeout`` (seconds) to the remaining budget in fail mode."""
+        if self.mode != 'fail' or self._deadline is None:
+            return timeout
+        return min(timeout, self.remaining())
+
+    def split(self, timeout: float) -> Optional[float]:
+        """In warn mode, the part of ``timeout`` (seconds) before the deadline, or None when it ends earlier."""
+        if self.mode != 'warn' or self._deadline is None or self.captured:
+            return None
+        remaining = self._deadline - time.perf_counter()
+        return remaining if 0 < remaining < timeout else None
+
+    def capture_breach(self):
+        # Playwright's sync API is bound to the test thread, so the timer thread cannot take the screenshot
+        if self.captured or self.capture is None:
+            return
+        self.captured = True
+        self.capture()
+
+    def end_step(self) -> List[BudgetBreach]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.perf_counter()
+        breaches = []
+        if self.step_budget is not None and now - self.step_start > self.step_budget:
+            breaches.append(BudgetBreach('step', self.step_name, self.step_budget, now - self.step_start))
+        if self.scenario_budget is not None and now - self.scenario_start > self.scenario_budget:
+            breaches.append(BudgetBreach('scenario', self.step_name, self.scenario_budget, now - self.scenario_start))
+            # Report the scenario breach once, not again for every following step
+            self.scenario_budget = None
+        self._deadline = None
+        self.capture = None
+        return breaches
+
+
+step_budget_watchdog = StepBudgetWatchdog()
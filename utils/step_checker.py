@@ -0,0 +1,289 @@
+"""
+Validate BDD step bindings without running pytest or starting a browser.
+
+Parses every feature file and the step definition modules (via ``ast``, so nothing is imported,
+including Playwright) and reports unbound, ambiguous and unused steps.
+
+Usage:
+    python -m utils.step_checker [--root PATH]
+"""
+import argparse
+import ast
+import glob
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern
+
+STEP_TYPES = ('given', 'when', 'then')
+STEP_KEYWORDS = {'given': 'given', 'when': 'when', 'then': 'then', 'and': None, 'but': None, '*': None}
+SCENARIO_KEYWORDS = ('Scenario Outline:', 'Scenario Template:', 'Scenario:', 'Example:', 'Background:')
+
+# parse/cfparse format types mapped to regexes; unknown types fall back to a lazy match
+PARSE_TYPE_PATTERNS = {
+    'd': r'[-+]?\d+',
+    'n': r'[-+]?[\d,]+',
+    'f': r'[-+]?\d*\.\d+',
+    'w': r'\w+',
+    'l': r'[A-Za-z]+',
+}
+PARSE_FIELD = re.compile(r'\{\{|\}\}|\{([^{}]*)\}')
+
+
+@dataclass
+class FeatureStep:
+    feature: str
+    scenario: str
+    line: int
+    type: str
+    text: str
+
+
+@dataclass
+class StepDefinition:
+    module: str
+    function: str
+    line: int
+    type: str
+    pattern: str
+    regex: Pattern[str]
+    matched: int = 0
+
+
+@dataclass
+class StepModule:
+    path: str
+    features: List[str] = field(default_factory=list)
+    definitions: List[StepDefinition] = field(default_factory=list)
+
+
+def parse_format_to_regex(pattern: str) -> Pattern[str]:
+    parts = []
+    position = 0
+    for match in PARSE_FIELD.finditer(pattern):
+        parts.append(re.escape(pattern[position:match.start()]))
+        token = match.group(0)
+        if token in ('{{', '}}'):
+            parts.append(re.escape(token[0]))
+        else:
+            spec = (match.group(1) or '').partition(':')[2].rstrip('+*?')
+            parts.append(f"({PARSE_TYPE_PATTERNS.get(spec[-1:] if spec else '', '.+?')})")
+        position = match.end()
+    parts.append(re.escape(pattern[position:]))
+    # parse.compile() is case-insensitive by default, so pytest-bdd parse steps are too
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def parse_features(path: str) -> List[FeatureStep]:
+    steps: List[FeatureStep] = []
+    scenario_name = ''
+    outline_steps: List[FeatureStep] = []
+    in_examples = in_docstring = is_outline = False
+    example_header: Optional[List[str]] = None
+    previous_type = 'given'
+
+    with open(path, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+
+    for number, raw_line in enumerate(lines, start=1):
+        line = raw_line.strip()
+        if line.startswith('"""') or line.startswith('```'):
+            in_docstring = not in_docstring
+            continue
+        if in_docstring or not line or line.startswith('#') or line.startswith('@'):
+            continue
+        if line.startswith(SCENARIO_KEYWORDS):
+            keyword, _, name = line.partition(':')
+            scenario_name = name.strip() or keyword
+            is_outline = keyword in ('Scenario Outline', 'Scenario Template')
+            outline_steps, in_examples, example_header = [], False, None
+            previous_type = 'given'
+            continue
+        if line.startswith(('Examples:', 'Scenarios:')):
+            in_examples, example_header = True, None
+            continue
+        if line.startswith('|'):
+            cells = [cell.strip() for cell in line.strip('|').split('|')]
+            if in_examples and example_header is None:
+                example_header = cells
+            elif in_examples:
+                values = dict(zip(example_header, cells))
+                for step in outline_steps:
+                    text = re.sub(r'<([^<>]+)>', lambda m: values.get(m.group(1), m.group(0)), step.text)
+                    steps.append(FeatureStep(step.feature, step.scenario, step.line, step.type, text))
+            continue
+        keyword, _, text = line.partition(' ')
+        if keyword.lower() not in STEP_KEYWORDS:
+            continue
+        step_type = STEP_KEYWORDS[keyword.lower()] or previous_type
+        previous_type = step_type
+        step = FeatureStep(path, scenario_name, number, step_type, text.strip())
+        if is_outline:
+            outline_steps.append(step)
+        else:
+            steps.append(step)
+    return steps
+
+
+def _decorator_name(node: ast.expr) -> str:
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ''
+
+
+def _build_definition(path: str, function: ast.FunctionDef, decorator: ast.Call) -> Optional[StepDefinition]:
+    step_type = _decorator_name(decorator.func)
+    if step_type not in STEP_TYPES or not decorator.args:
+        return None
+    argument = decorator.args[0]
+    if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+        pattern, regex = argument.value, re.compile(re.escape(argument.value))
+    elif (isinstance(argument, ast.Call) and argument.args and isinstance(argument.args[0], ast.Constant)
+          and isinstance(argument.args[0].value, str)):
+        pattern = argument.args[0].value
+        parser_name = _decorator_name(argument.func)
+        if parser_name == 're':
+            regex = re.compile(pattern)
+        elif parser_name in ('parse', 'cfparse'):
+            regex = parse_format_to_regex(pattern)
+        else:
+            regex = re.compile(re.escape(pattern))
+    else:
+        return None
+    return StepDefinition(path, function.name, function.lineno, step_type, pattern, regex)
+
+
+def parse_step_module(path: str) -> StepModule:
+    with open(path, encoding='utf-8') as file:
+        tree = ast.parse(file.read(), filename=path)
+    module = StepModule(path)
+    base_dir = os.path.dirname(path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            for decorator in node.decorator_list:
+                if isinstance(decorator, ast.Call):
+                    definition = _build_definition(path, node, decorator)
+                    if definition:
+                        module.definitions.append(definition)
+        elif isinstance(node, ast.Call) and _decorator_name(node.func) in ('scenarios', 'scenario'):
+            for argument in node.args[:1] if _decorator_name(node.func) == 'scenario' else node.args:
+                if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+                    module.features.extend(_expand_feature_path(os.path.join(base_dir, argument.value)))
+    return module
+
+
+def _expand_feature_path(path: str) -> List[str]:
+    path = os.path.normpath(path)
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '**', '*.feature'), recursive=True))
+    return [path]
+
+
+def _conftest_chain(module_path: str, root: str, conftests: Dict[str, StepModule]) -> List[StepModule]:
+    chain = []
+    directory = os.path.dirname(module_path)
+    while True:
+        conftest = conftests.get(os.path.join(directory, 'conftest.py'))
+        if conftest and conftest.path != module_path:
+            chain.append(conftest)
+        if os.path.normpath(directory) == os.path.normpath(root) or directory == os.path.dirname(directory):
+            return chain
+        directory = os.path.dirname(directory)
+
+
+def _match(step: FeatureStep, definitions: List[StepDefinition]) -> List[StepDefinition]:
+    return [d for d in definitions if d.type == step.type and d.regex.fullmatch(step.text)]
+
+
+def check_steps(root: str) -> Dict[str, list]:
+    root = os.path.abspath(root)
+    skip = {'.git', '.venv', 'venv', 'node_modules', '__pycache__'}
+    python_files, feature_files = [], []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = [d for d in subdirectories if d not in skip]
+        for name in files:
+            if name.endswith('.feature'):
+                feature_files.append(os.path.join(directory, name))
+            elif name == 'conftest.py' or (name.startswith('test_') and name.endswith('.py')):
+                python_files.append(os.path.join(directory, name))
+
+    modules = [parse_step_module(path) for path in sorted(python_files)]
+    conftests = {m.path: m for m in modules if os.path.basename(m.path) == 'conftest.py'}
+    all_definitions = [d for m in modules for d in m.definitions]
+    bound_features = set()
+    result: Dict[str, list] = {'unbound': [], 'ambiguous': [], 'unbound_features': []}
+
+    for module in modules:
+        scopes = [module.definitions] + [c.definitions for c in _conftest_chain(module.path, root, conftests)]
+        for feature in module.features:
+            bound_features.add(feature)
+            for step in parse_features(feature):
+                # The closest scope wins, as with pytest fixture overriding
+                for definitions in scopes:
+                    matches = _match(step, definitions)
+                    if matches:
+                        break
+                for definition in matches:
+                    definition.matched += 1
+                if not matches:
+                    result['unbound'].append(step)
+                elif len(matches) > 1:
+                    result['ambiguous'].append((step, matches))
+
+    for feature in sorted(set(map(os.path.normpath, feature_files)) - bound_features):
+        steps = parse_features(feature)
+        missing = [step for step in steps if not _match(step, all_definitions)]
+        result['unbound_features'].append((feature, len(steps), missing))
+
+    result['unused'] = [d for d in all_definitions if not d.matched]
+    return result
+
+
+def format_result(result: Dict[str, list], root: str) -> str:
+    def rel(path):
+        return os.path.relpath(path, root)
+
+    lines = []
+    if result['unbound']:
+        lines.append('Unbound steps:')
+        lines += [f"  {rel(s.feature)}:{s.line} [{s.scenario}] {s.type.upper()} {s.text}" for s in result['unbound']]
+    if result['ambiguous']:
+        lines.append('Ambiguous steps:')
+        for step, matches in result['ambiguous']:
+            lines.append(f"  {rel(step.feature)}:{step.line} {step.type.upper()} {step.text}")
+            lines += [f"      -> {rel(d.module)}:{d.line} {d.function}" for d in matches]
+    if result['unused']:
+        lines.append('Unused step definitions:')
+        lines += [f"  {rel(d.module)}:{d.line} {d.function} @{d.type}({d.pattern!r})" for d in result['unused']]
+    if result['unbound_features']:
+        lines.append('Feature files not bound by scenarios():')
+        for feature, total, missing in result['unbound_features']:
+            lines.append(f"  {rel(feature)}: {len(missing)}/{total} steps have no definition")
+            lines += [f"      {rel(s.feature)}:{s.line} {s.type.upper()} {s.text}" for s in missing]
+    return '\n'.join(lines) if lines else 'All steps are bound.'
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--root', default=os.getcwd(), help='Project root to scan (default: current directory)')
+    parser.add_argument('--strict', action='store_true',
+                        help='Also fail on unused definitions and feature files without step modules')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = check_steps(args.root)
+    print(format_result(result, os.path.abspath(args.root)))
+    print(f"\nChecked in {time.perf_counter() - start:.3f}s")
+
+    failed = result['unbound'] or result['ambiguous']
+    if args.strict:
+        failed = failed or result['unused'] or result['unbound_features']
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import functools
+import time
+from typing import Dict, List, Optional
+
+from playwright.sync_api import Error as PlaywrightError, Page, TimeoutError as PlaywrightTimeoutError
+
+from config.config import Config
+from utils.step_budget import step_budget_watchdog
+
+# Scenario tag that disables in-place step retries for every step of the scenario
+NO_STEP_RETRY_TAG = "no_step_retry"
+
+# Lower-cased Playwright error fragments considered transient, mapped to the reported cause
+TRANSIENT_ERROR_CAUSES = {
+    "element is not attached": "detached element",
+    "element was detached": "detached element",
+    "frame was detached": "detached element",
+    "execution context was destroyed": "navigation race",
+    "navigation interrupted": "navigation race",
+    "interrupted by another navigation": "navigation race",
+}
+
+_retry_events: List[Dict[str, object]] = []
+_retries_disabled = False
+# Timeout (seconds) of each retry attempt while a retried step runs
+_attempt_timeout: Optional[float] = None
+
+
+def classify_transient_error(exc: BaseException) -> Optional[str]:
+    if isinstance(exc, PlaywrightTimeoutError):
+        return "timeout"
+    if isinstance(exc, PlaywrightError):
+        message = str(exc).lower()
+        for fragment, cause in TRANSIENT_ERROR_CAUSES.items():
+            if fragment in message:
+                return cause
+    return None
+
+
+def set_scenario_tags(tags):
+    global _retries_disabled
+    _retries_disabled = NO_STEP_RETRY_TAG in tags
+
+
+def pop_retry_events() -> List[Dict[str, object]]:
+    events = list(_retry_events)
+    _retry_events.clear()
+    return events
+
+
+def cap_attempt_timeout(timeout: float) -> float:
+    """Shorten ``timeout`` (seconds) to the per-attempt timeout while a step is being retried."""
+    if _attempt_timeout is None:
+        return timeout
+    return min(timeout, _attempt_timeout)
+
+
+def non_idempotent(func):
+    """
+    Mark a step as unsafe to repeat (e.g. order submission).
+
+    Raises:
+        ValueError: If ``func`` is already wrapped by ``retry_step`` (decorators in either order)
+    """
+    if getattr(func, "retry_step", False):
+        raise ValueError(f"Step '{func.__name__}' is non-idempotent and must not be retried")
+    func.non_idempotent = True
+    return func
+
+
+def _set_page_timeout(pages, seconds: float):
+    for page in pages:
+        page.set_default_timeout(seconds * 1000)
+
+
+def retry_step(attempts: Optional[int] = None, delay: Optional[float] = None):
+    """
+    Retry an idempotent step in place when it fails with a transient Playwright error.
+
+    Only timeouts, detached elements and navigation races are retried; assertion failures and
+    any other error are raised immediately. Place the decorator below the pytest-bdd step
+    decorator. Retries are skipped for scenarios tagged ``@no_step_retry``.
+
+    The first attempt runs with the usual timeouts. Each retry gets an equal share of
+    ``DEFAULT_TIMEOUT`` (BaseAction waits and the step's ``page`` default timeout), so all retries
+    together add less than one ``DEFAULT_TIMEOUT`` to the worst-case step time.
+
+    Args:
+        attempts: Total attempts including the first one (default: ``Config.RETRY_TIMES``)
+        delay: Seconds to wait between attempts (default: ``Config.RETRY_DELAY``)
+
+    Raises:
+        ValueError: If the step is marked with ``non_idempotent``
+    """
+    def decorator(func):
+        if getattr(func, "non_idempotent", False):
+            raise ValueError(f"Step '{func.__name__}' is non-idempotent and must not be retried")
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global _attempt_timeout
+            config = Config.snapshot()
+            max_attempts = 1 if _retries_disabled else attempts or config.RETRY_TIMES
+            retry_delay = config.RETRY_DELAY if delay is None else delay
+            pages = [value for value in kwargs.values() if isinstance(value, Page)]
+            previous_timeout = _attempt_timeout
+            retry_timeout = cap_attempt_timeout(config.DEFAULT_TIMEOUT / max_attempts)
+            attempt = 1
+            try:
+                while True:
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as exc:
+                        cause = classify_transient_error(exc)
+                        if cause is None or attempt >= max_attempts:
+                            raise
+                        _retry_events.append({
+                            "step": func.__name__,
+                            "attempt": attempt,
+                            "cause": cause,
+                            "error": str(exc).splitlines()[0] if str(exc) else type(exc).__name__,
+                        })
+                        print(f"\033[33m↻ Retrying step {func.__name__} ({cause}), "
+                              f"attempt {attempt + 1}/{max_attempts}\033[0m")
+                        attempt += 1
+                        time.sleep(retry_delay)
+                        _attempt_timeout = retry_timeout
+                        _set_page_timeout(pages, step_budget_watchdog.cap(retry_timeout))
+            finally:
+                if attempt > 1:
+                    _attempt_timeout = previous_timeout
+                    _set_page_timeout(pages, step_budget_watchdog.cap(cap_attempt_timeout(config.DEFAULT_TIMEOUT)))
+
+        wrapper.retry_step = True
+        return wrapper
+    return decorator
@@ -0,0 +1,144 @@
+import glob
+import html
+import json
+import os
+from typing import Optional
+
+SHARD_DIR = 'shards'
+MAX_ERROR_CHARS = 4000
+
+PAGE_HEADER = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Test report</title>
+<style>
+  body { font-family: system-ui, sans-serif; margin: 0; padding: 16px; display: flex; flex-direction: column; }
+  #summary { order: -1; font-size: 18px; margin-bottom: 12px; }
+  details { border: 1px solid #ddd; border-radius: 6px; margin: 4px 0; padding: 6px 10px; }
+  details.passed summary b { color: #2e7d32; }
+  details.failed summary b, details.error summary b { color: #c62828; }
+  details.skipped summary b { color: #f9a825; }
+  summary { cursor: pointer; }
+  .meta { color: #666; font-size: 13px; }
+  table { border-collapse: collapse; margin: 6px 0; font-size: 13px; }
+  td { padding: 2px 10px 2px 0; }
+  pre { background: #f6f6f6; padding: 8px; overflow-x: auto; font-size: 12px; }
+  img { max-width: 480px; border: 1px solid #ccc; }
+</style></head><body>
+"""
+
+
+class StreamReportWriter:
+    """
+    Appends one JSON line per test result to this worker's shard as results arrive.
+
+    Each entry is written and flushed immediately, so nothing accumulates in memory and a
+    crashed run still leaves every finished result on disk.
+    """
+
+    def __init__(self, output_dir: str, worker_id: str):
+        self.output_dir = output_dir
+        os.makedirs(os.path.join(output_dir, SHARD_DIR), exist_ok=True)
+        self.shard = open(os.path.join(output_dir, SHARD_DIR, f"{worker_id}.jsonl"), 'a', encoding='utf-8')
+
+    def artifact_link(self, path: str) -> str:
+        # Links are relative to the report, so the report directory and artifacts can be archived together
+        return os.path.relpath(os.path.abspath(path), os.path.abspath(self.output_dir))
+
+    def append(self, entry: dict):
+        entry['artifacts'] = [self.artifact_link(path) for path in entry.get('artifacts', []) if path]
+        if entry.get('error'):
+            entry['error'] = entry['error'][-MAX_ERROR_CHARS:]
+        self.shard.write(json.dumps(entry, default=str) + "\n")
+        self.shard.flush()
+
+    def close(self):
+        self.shard.close()
+
+
+def clear_shards(output_dir: str):
+    """Remove shards of a previous run; called on the controller before workers start."""
+    for path in glob.glob(os.path.join(glob.escape(output_dir), SHARD_DIR, '*.jsonl')):
+        os.remove(path)
+
+
+def _render_entry(entry: dict) -> str:
+    escape = html.escape
+    outcome = entry['outcome']
+    attempt = f" (attempt {entry['attempt']})" if entry.get('attempt', 1) > 1 else ''
+    parts = [
+        f'<details class="{escape(outcome)}"><summary><b>{escape(outcome.upper())}</b> '
+        f"{escape(entry['scenario'])}{attempt} "
+        f'<span class="meta">{escape(entry["feature"])} · {escape(entry["browser"])} · {escape(entry["device"])} · '
+        f"{entry['duration']:.2f}s · {escape(entry.get('worker', ''))}</span></summary>",
+        f'<div class="meta">{escape(entry["nodeid"])}</div>',
+    ]
+    if entry.get('tags'):
+        parts.append(f'<div class="meta">Tags: {escape(", ".join(entry["tags"]))}</div>')
+    if entry.get('steps'):
+        rows = "".join(
+            f"<tr><td>{escape(step['status'])}</td><td>{step['duration']:.2f}s</td><td>{escape(step['name'])}</td></tr>"
+            for step in entry['steps']
+        )
+        parts.append(f"<table>{rows}</table>")
+    if entry.get('error'):
+        parts.append(f"<pre>{escape(entry['error'])}</pre>")
+    for link in entry.get('artifacts', []):
+        url = escape(link.replace(os.sep, '/'))
+        if link.lower().endswith('.png'):
+            parts.append(f'<a href="{url}"><img loading="lazy" src="{url}" alt="{url}"></a>')
+        else:
+            parts.append(f'<a href="{url}">{url}</a>')
+    parts.append("</details>\n")
+    return "".join(parts)
+
+
+def merge_report(output_dir: str) -> Optional[str]:
+    """
+    Stream all worker shards into ``results.jsonl`` and a static ``index.html``.
+
+    Entries are read and written one at a time, so the merge is linear in the number of results
+    and its memory use does not depend on suite size. Returns the HTML path, or None without shards.
+    """
+    shards = sorted(glob.glob(os.path.join(glob.escape(output_dir), SHARD_DIR, '*.jsonl')))
+    if not shards:
+        return None
+    counts = {}
+    total_duration = 0.0
+    html_path = os.path.join(output_dir, 'index.html')
+    with open(html_path, 'w', encoding='utf-8') as page, \
+            open(os.path.join(output_dir, 'results.jsonl'), 'w', encoding='utf-8') as index:
+        page.write(PAGE_HEADER)
+        for shard in shards:
+            with open(shard, encoding='utf-8') as lines:
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    index.write(line)
+                    entry = json.loads(line)
+                    counts[entry['outcome']] = counts.get(entry['outcome'], 0) + 1
+                    total_duration += entry['duration']
+                    page.write(_render_entry(entry))
+        summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+        # Written last but shown first (flex order), so the page never has to be held in memory
+        page.write(f'<div id="summary"><b>{sum(counts.values())} results</b>: {html.escape(summary)} '
+                   f'· {total_duration:.1f}s total test time</div>\n</body></html>\n')
+    return html_path
+
+
+_writer: Optional[StreamReportWriter] = None
+
+
+def get_stream_report(config) -> Optional[StreamReportWriter]:
+    """Return this process's shard writer, or None when the streaming report is disabled."""
+    global _writer
+    if not config.STREAM_REPORT_DIR:
+        return None
+    if _writer is None:
+        _writer = StreamReportWriter(config.STREAM_REPORT_DIR, os.environ.get("PYTEST_XDIST_WORKER", "main"))
+    return _writer
+
+
+def close_stream_report():
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
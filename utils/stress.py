@@ -0,0 +1,58 @@
+import re
+import statistics
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+STRESS_PARAM = "stress_iteration"
+STRESS_ID = re.compile(r'\[stress-\d+\]|stress-\d+-|-stress-\d+')
+
+
+def stress_key(nodeid: str) -> str:
+    """Node id of the scenario without its stress iteration, used to group the iterations."""
+    return STRESS_ID.sub('', nodeid)
+
+
+@dataclass
+class StressResult:
+    durations: List[float] = field(default_factory=list)
+    passed: int = 0
+    failed_steps: Counter = field(default_factory=Counter)
+
+    @property
+    def runs(self) -> int:
+        return self.passed + sum(self.failed_steps.values())
+
+
+class StressSummary:
+    """Aggregates stress iterations per scenario from (possibly xdist-forwarded) test reports."""
+
+    def __init__(self):
+        self.results: Dict[str, StressResult] = {}
+
+    def add(self, nodeid: str, passed: bool, duration: float, failed_step: str = ''):
+        result = self.results.setdefault(stress_key(nodeid), StressResult())
+        result.durations.append(duration)
+        if passed:
+            result.passed += 1
+        else:
+            result.failed_steps[failed_step or 'unknown step'] += 1
+
+    def format_report(self) -> str:
+        lines = []
+        for key, result in sorted(self.results.items()):
+            durations = sorted(result.durations)
+            p95 = durations[max(0, -(-95 * len(durations) // 100) - 1)]
+            spread = statistics.pstdev(durations) if len(durations) > 1 else 0.0
+            lines.append(f"{key}")
+            lines.append(
+                f"    pass rate {result.passed}/{result.runs} ({result.passed / result.runs:.0%})  "
+                f"duration min {durations[0]:.2f}s / median {statistics.median(durations):.2f}s / "
+                f"p95 {p95:.2f}s / max {durations[-1]:.2f}s  (stdev {spread:.2f}s)"
+            )
+            for step, count in result.failed_steps.most_common():
+                lines.append(f"    {count} failure(s) at: {step}")
+        return '\n'.join(lines)
+
+
+stress_summary = StressSummary()
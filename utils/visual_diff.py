@@ -0,0 +1,130 @@
+import io
+import os
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+# (x, y, width, height) in snapshot pixels
+Region = Tuple[int, int, int, int]
+
+# Largest possible YIQ distance between two RGB colours (black vs white), see pixelmatch
+MAX_YIQ_DELTA = 35215.0
+# Rows compared per chunk; bounds float32 scratch memory to roughly chunk_rows * width * 40 bytes
+DEFAULT_CHUNK_ROWS = 256
+
+
+@dataclass
+class VisualDiffResult:
+    width: int
+    height: int
+    diff_pixels: int
+    compared_pixels: int
+    size_mismatch: bool = False
+    diff_image: Optional[Image.Image] = None
+
+    @property
+    def diff_ratio(self) -> float:
+        if self.size_mismatch:
+            return 1.0
+        return self.diff_pixels / self.compared_pixels if self.compared_pixels else 0.0
+
+
+def load_rgb(source) -> np.ndarray:
+    """Load a PNG path or PNG bytes into an (H, W, 3) uint8 array, compositing alpha over white."""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+            background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, image.convert('RGBA'))
+        return np.asarray(image.convert('RGB'), dtype=np.uint8)
+
+
+def yiq_delta(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Perceptual squared colour distance per pixel in YIQ space (luma weighted over chroma)."""
+    diff = expected.astype(np.float32) - actual.astype(np.float32)
+    r, g, b = diff[..., 0], diff[..., 1], diff[..., 2]
+    y = r * 0.29889531 + g * 0.58662247 + b * 0.11448223
+    i = r * 0.59597799 - g * 0.27417610 - b * 0.32180189
+    q = r * 0.21147017 - g * 0.52261711 + b * 0.31114694
+    return 0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q
+
+
+def build_mask(height: int, width: int, regions: Sequence[Region]) -> Optional[np.ndarray]:
+    if not regions:
+        return None
+    mask = np.zeros((height, width), dtype=bool)
+    for x, y, w, h in regions:
+        x0, y0 = max(int(x), 0), max(int(y), 0)
+        x1, y1 = min(int(x + w), width), min(int(y + h), height)
+        if x1 > x0 and y1 > y0:
+            mask[y0:y1, x0:x1] = True
+    return mask
+
+
+def faded_baseline(expected: np.ndarray, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> np.ndarray:
+    """Faded greyscale copy of the baseline as (H, W, 3) uint8, built chunk by chunk so the red differences stand out."""
+    canvas = np.empty(expected.shape, dtype=np.uint8)
+    for start in range(0, expected.shape[0], chunk_rows):
+        grey = expected[start:start + chunk_rows].mean(axis=2, dtype=np.float32)
+        canvas[start:start + chunk_rows] = (255 - (255 - grey) * 0.3).astype(np.uint8)[..., None]
+    return canvas
+
+
+def compare_images(expected: np.ndarray, actual: np.ndarray, threshold: float = 0.1,
+                   masks: Sequence[Region] = (), chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   render_diff: bool = True) -> VisualDiffResult:
+    """
+    Compare two RGB snapshots pixel by pixel.
+
+    A pixel counts as different when its YIQ distance exceeds ``threshold`` (0-1, share of the
+    maximum distance, so 0.1 tolerates anti-aliasing and subpixel noise). Pixels inside ``masks``
+    are ignored. Rows are processed in chunks so memory use does not grow with snapshot height,
+    and the diff image is only allocated once a chunk actually has differing pixels.
+
+    Args:
+        expected: Baseline image as (H, W, 3) uint8
+        actual: New snapshot as (H, W, 3) uint8
+        threshold: Perceptual tolerance per pixel
+        masks: Regions to ignore, as (x, y, width, height)
+        chunk_rows: Rows compared per chunk
+        render_diff: Build a diff image (differing pixels in red over a faded copy of the baseline)
+
+    Returns:
+        VisualDiffResult with the number of differing pixels
+    """
+    height, width = expected.shape[:2]
+    if expected.shape != actual.shape:
+        return VisualDiffResult(width, height, height * width, height * width, size_mismatch=True)
+
+    max_delta = MAX_YIQ_DELTA * threshold * threshold
+    mask = build_mask(height, width, masks)
+    diff_canvas = None
+    diff_pixels = 0
+    for start in range(0, height, chunk_rows):
+        stop = min(start + chunk_rows, height)
+        expected_rows, actual_rows = expected[start:stop], actual[start:stop]
+        # Identical rows are the common case; skip the float conversion for them
+        if np.array_equal(expected_rows, actual_rows):
+            continue
+        different = yiq_delta(expected_rows, actual_rows) > max_delta
+        if mask is not None:
+            different &= ~mask[start:stop]
+        chunk_diff_pixels = int(np.count_nonzero(different))
+        if not chunk_diff_pixels:
+            continue
+        diff_pixels += chunk_diff_pixels
+        if render_diff:
+            if diff_canvas is None:
+                diff_canvas = faded_baseline(expected, chunk_rows)
+            diff_canvas[start:stop][different] = (255, 0, 0)
+
+    compared_pixels = height * width - (int(np.count_nonzero(mask)) if mask is not None else 0)
+    diff_image = Image.fromarray(diff_canvas) if diff_canvas is not None else None
+    return VisualDiffResult(width, height, diff_pixels, compared_pixels, diff_image=diff_image)
+
+
+def baseline_path(baseline_dir: str, device: str, browser: str, name: str) -> str:
+    return os.path.join(baseline_dir, device.lower(), browser.lower(), f"{name}.png")
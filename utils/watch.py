@@ -0,0 +1,135 @@
+"""
+Watch mode: keep Playwright and the browser alive and rerun affected scenarios on file change.
+
+Usage:
+    python -m utils.watch [pytest args...]
+"""
+import os
+import sys
+import time
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import pytest
+from playwright.sync_api import Browser, Playwright, sync_playwright
+
+from utils.impact import affects_everything, build_dependency_map
+
+WATCHED_SUFFIXES = ('.py', '.feature', '.ini')
+# Modules that hold the watch state itself and must survive reloads
+PERSISTENT_MODULES = ('__main__', 'utils', 'utils.watch', 'utils.impact', 'utils.step_checker')
+POLL_INTERVAL = 0.5
+
+
+class WatchSession:
+    def __init__(self):
+        self._manager = None
+        self.playwright: Optional[Playwright] = None
+        self.browsers: Dict[Tuple[str, bool], Browser] = {}
+
+    def start(self):
+        self._manager = sync_playwright()
+        self.playwright = self._manager.start()
+
+    def get_browser(self, browser_type: str, headless: bool, launch: Callable[[], Browser]) -> Browser:
+        key = (browser_type.lower(), headless)
+        browser = self.browsers.get(key)
+        if browser is None or not browser.is_connected():
+            browser = self.browsers[key] = launch()
+        return browser
+
+    def stop(self):
+        for browser in self.browsers.values():
+            if browser.is_connected():
+                browser.close()
+        self.browsers.clear()
+        if self._manager is not None:
+            self._manager.__exit__(None, None, None)
+            self._manager = self.playwright = None
+
+
+_session: Optional[WatchSession] = None
+
+
+def active_session() -> Optional[WatchSession]:
+    """The running watch session, used by the conftest fixtures to reuse Playwright and browsers."""
+    return _session
+
+
+def snapshot(root: str) -> Dict[str, float]:
+    mtimes = {}
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = [d for d in subdirectories if not d.startswith('.') and d not in ('venv', '__pycache__')]
+        for name in files:
+            if name.endswith(WATCHED_SUFFIXES):
+                path = os.path.join(directory, name)
+                try:
+                    mtimes[path] = os.stat(path).st_mtime
+                except OSError:
+                    pass
+    return mtimes
+
+
+def purge_project_modules(root: str):
+    """Drop project modules from sys.modules so the next pytest run imports the edited code."""
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None) or ''
+        if name in PERSISTENT_MODULES or not os.path.abspath(module_file).startswith(root + os.sep):
+            continue
+        del sys.modules[name]
+
+
+def affected_targets(root: str, changed: Set[str]) -> Optional[list]:
+    """Test modules to rerun for ``changed`` files, or None when everything must run."""
+    dependency_map, shared = build_dependency_map(root)
+    if affects_everything(root, changed, shared):
+        return None
+    return sorted(path for path, dependencies in dependency_map.items() if changed & dependencies)
+
+
+def run_pytest(args: list) -> int:
+    try:
+        return int(pytest.main(args))
+    except SystemExit as exc:
+        # conftest.py ends the session with sys.exit(); keep watching regardless
+        return int(exc.code or 0)
+
+
+def main(argv=None) -> int:
+    global _session
+    pytest_args = list(sys.argv[1:] if argv is None else argv)
+    root = os.path.abspath(os.getcwd())
+    _session = WatchSession()
+    _session.start()
+    try:
+        mtimes = snapshot(root)
+        run_pytest(pytest_args)
+        print("\n\033[36mWatching for changes (Ctrl+C to stop)...\033[0m")
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = snapshot(root)
+            changed = {path for path, mtime in current.items() if mtimes.get(path) != mtime}
+            changed |= set(mtimes) - set(current)
+            if not changed:
+                continue
+            mtimes = current
+            targets = affected_targets(root, changed)
+            print(f"\n\033[36mChanged:\033[0m {', '.join(os.path.relpath(path, root) for path in sorted(changed))}")
+            if targets == []:
+                print("No scenarios affected.")
+                continue
+            purge_project_modules(root)
+            start = time.perf_counter()
+            run_pytest(pytest_args + (targets or []))
+            print(f"\n\033[36mRerun finished in {time.perf_counter() - start:.1f}s; watching...\033[0m")
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        _session.stop()
+        _session = None
+
+
+if __name__ == '__main__':
+    # `python -m utils.watch` runs this file as __main__; run the imported utils.watch instead, so the
+    # session is set on the module conftest.py reads through active_session()
+    from utils.watch import main as watch_main
+    sys.exit(watch_main())